@@ -5,7 +5,11 @@ Handles middleware registration and plugin loading.
 """
 
 import logging
+from typing import Optional
+
 from aiogram import Bot, Dispatcher, Router
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.types import BotCommand
 
@@ -25,16 +29,24 @@ async def setup_bot_commands(bot: Bot) -> None:
 
 
 
-def create_bot(token: str) -> Bot:
+def create_bot(token: str, api_server: Optional[str] = None) -> Bot:
     """Create and return bot instance.
     
     Args:
         token: Telegram bot token
+        api_server: Local Bot API server URL (running with --local); files
+            are then read from its disk instead of downloaded over HTTP
         
     Returns:
         Bot: Initialized bot instance
     """
-    bot = Bot(token=token)
+    if api_server:
+        session = AiohttpSession(
+            api=TelegramAPIServer.from_base(api_server, is_local=True),
+        )
+        bot = Bot(token=token, session=session)
+    else:
+        bot = Bot(token=token)
     logger.info("Bot instance created")
     return bot
 
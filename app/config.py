@@ -28,6 +28,8 @@ class Settings(BaseSettings):
         REPLICATE_MODEL: Replicate model to use (text)
         REPLICATE_VISION_MODEL: Replicate vision model for image/OCR tasks
         OCR_SPACE_API_KEY: OCR.space API key (free tier: 25k requests/month)
+        RAG_PRELOAD: Load RAG models at startup (False defers it to first /rag)
+        TELEGRAM_API_SERVER: Local Bot API server URL (empty = api.telegram.org)
         
     Example:
         >>> config = get_settings()
@@ -47,6 +49,8 @@ class Settings(BaseSettings):
     REPLICATE_MODEL: str = "meta/llama-2-70b-chat"  # Replicate model (text)
     REPLICATE_VISION_MODEL: str = "yorickvp/llava-13b"  # LLaVA vision model
     OCR_SPACE_API_KEY: str = "K84178285088957"  # User's OCR.space API key
+    RAG_PRELOAD: bool = True  # Warm up RAG manager on startup
+    TELEGRAM_API_SERVER: str = ""  # e.g. http://localhost:8081 (--local mode)
     
     class Config:
         """Pydantic config."""
@@ -176,8 +176,12 @@ async def handle_document(
         )
         
         try:
+            # Parsing is blocking (pypdf, XML, LibreOffice): keep it off the
+            # event loop so other chats are served during a burst of uploads
             converter = FileConverter()
-            extracted_text = converter.extract_text(temp_file_path, temp_user_dir)
+            extracted_text = await asyncio.to_thread(
+                converter.extract_text, temp_file_path, temp_user_dir
+            )
         except ValueError as e:
             logger.error(f"Ошибка формата: {e}")
             await message.answer(
@@ -314,13 +314,13 @@ async def _extract_text_from_document(message: Message, user_id: int) -> str:
     try:
         if message.document.mime_type == "application/pdf":
             pdf_parser = PDFParser()
-            content = pdf_parser.extract_text(file_path)
+            content = await asyncio.to_thread(pdf_parser.extract_text, file_path)
         elif message.document.mime_type in [
             "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
             "application/msword"
         ]:
             docx_parser = DOCXParser()
-            content = docx_parser.extract_text(file_path)
+            content = await asyncio.to_thread(docx_parser.extract_text, file_path)
         elif message.document.mime_type == "text/plain":
             with open(file_path, "r", encoding="utf-8") as f:
                 content = f.read()
@@ -14,14 +14,21 @@ Architecture:
 - MenuManager: unified UI
 """
 
+import importlib.util
 import logging
+import os
+import shutil
 import uuid
 import asyncio
+import threading
+from contextlib import suppress
 from pathlib import Path
-from typing import Dict, List, Optional
+from string import Template
+from typing import TYPE_CHECKING, Dict, List, Optional
 from datetime import datetime
 
-from aiogram import Router, F
+from aiogram import Bot, Router, F
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.filters import Command, StateFilter
 from aiogram.types import Message, Document, CallbackQuery
 from aiogram.fsm.context import FSMContext
@@ -29,17 +36,15 @@ from aiogram.fsm.context import FSMContext
 from app.config import get_settings
 from app.states.rag import RAGStates
 from app.utils.menu import MenuManager, create_keyboard
-from app.utils.cleanup import CleanupManager
+from app.utils.cleanup import TempDirPool
 from app.services.llm.llm_factory import LLMFactory
 
-# Import RAG Manager
-try:
+# The RAG stack (torch, sentence-transformers, chromadb) is imported on first
+# use in get_rag_manager(), so bots that never open /rag don't load it
+RAG_AVAILABLE = importlib.util.find_spec("rag_knowledge_base.rag_module") is not None
+
+if TYPE_CHECKING:
     from rag_knowledge_base.rag_module.services.manager import RAGManager
-    from rag_knowledge_base.rag_module.config import get_config as get_rag_config
-    RAG_AVAILABLE = True
-except ImportError:
-    RAG_AVAILABLE = False
-    RAGManager = None  # type: ignore
 
 logger = logging.getLogger(__name__)
 router = Router()
@@ -54,8 +59,110 @@ llm_factory = LLMFactory(
     replicate_model=config.REPLICATE_MODEL,
 )
 
+# Reusable temp directories for uploads (emptied in place after each upload)
+rag_temp_pool = TempDirPool(Path(config.TEMP_DIR) / "rag_pool", size=32)
+
+# Queries shorter than this are rejected before any embedding work
+MIN_QUERY_LENGTH = 3
+
+# Search hits below this similarity are never shown to the user
+MIN_RELEVANCE = 0.3
+
+# Read size for streaming uploads from Telegram straight into the temp file
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Min seconds between progressive menu edits while the LLM answer streams
+STREAM_EDIT_INTERVAL = 1.2
+
+# Caps concurrent CPU-heavy RAG work (extract/chunk/embed/search) in worker
+# threads so one large upload cannot starve every other chat
+RAG_CPU_SEMAPHORE = asyncio.Semaphore(os.cpu_count() or 4)
+
+# Static keyboards are built once; InlineKeyboardMarkup is safe to share
+MAIN_MENU_KEYBOARD = create_keyboard([
+    ("📤 Загрузить", "rag_upload"),
+    ("🔍 Поиск + AI", "rag_search"),
+    ("📊 Статистика", "rag_stats"),
+    ("🗑️ Очистить", "rag_clear"),
+    ("« Назад", "rag_cancel"),
+], rows_per_row=2)
+BACK_KEYBOARD = create_keyboard([
+    ("« Назад", "rag_back_to_menu"),
+], rows_per_row=1)
+UPLOAD_DONE_KEYBOARD = create_keyboard([
+    ("📤 Загрузить ещё", "rag_upload"),
+    ("🔍 Поиск", "rag_search"),
+    ("« Назад", "rag_back_to_menu"),
+], rows_per_row=2)
+EMPTY_BASE_KEYBOARD = create_keyboard([
+    ("📤 Загрузить", "rag_upload"),
+    ("« Назад", "rag_back_to_menu"),
+], rows_per_row=2)
+NEW_SEARCH_KEYBOARD = create_keyboard([
+    ("🔍 Новый поиск", "rag_search"),
+    ("« Назад", "rag_back_to_menu"),
+], rows_per_row=2)
+SEARCH_DONE_KEYBOARD = create_keyboard([
+    ("🔍 Новый поиск", "rag_search"),
+    ("📤 Загрузить документ", "rag_upload"),
+    ("« Назад", "rag_back_to_menu"),
+], rows_per_row=2)
+CONFIRM_CLEAR_KEYBOARD = create_keyboard([
+    ("✅ Да, удалить всё", "rag_confirm_clear"),
+    ("❌ Отмена", "rag_back_to_menu"),
+], rows_per_row=2)
+
+# Static screen texts (Markdown); only the main menu has placeholders
+RAG_MAIN_MENU_TEMPLATE = Template(
+    "🧠 *RAG Knowledge Base*\n\n"
+    "Умная система поиска по документам с интеграцией AI.\n\n"
+    "📊 *Статус:*\n"
+    "• Документов: $doc_count\n"
+    "• Фрагментов: $chunk_count\n"
+    "• Модель: GPT-4o-mini\n\n"
+    "📤 *Загрузка документов:*\n"
+    "Поддерживает: PDF, DOCX, TXT, Excel, ZIP\n\n"
+    "🔍 *Поиск:*\n"
+    "Семантический поиск с анализом AI\n\n"
+    "👇 Выберите действие:"
+)
+RAG_UPLOAD_TEXT = (
+    "📤 *Загрузка документа*\n\n"
+    "Отправьте документ для добавления в базу знаний.\n\n"
+    "📄 *Поддерживаемые форматы:*\n"
+    "• PDF\n"
+    "• DOCX, DOC\n"
+    "• TXT\n"
+    "• Excel (.xlsx, .xls)\n"
+    "• ZIP архивы\n\n"
+    "⚡ Документ будет автоматически обработан и проиндексирован.\n\n"
+    "📁 Отправьте файл:"
+)
+RAG_EMPTY_BASE_TEXT = (
+    "📚 *База знаний пуста*\n\n"
+    "Сначала загрузите документы через 'Загрузить'.\n\n"
+    "👇 Выберите действие:"
+)
+RAG_SEARCH_PROMPT_TEXT = (
+    "🔍 *Поиск с AI анализом*\n\n"
+    "Задайте вопрос на естественном языке.\n"
+    "AI найдет релевантные документы и даст подробный ответ.\n\n"
+    "*Примеры:*\n"
+    "• Какие условия оплаты?\n"
+    "• На какую сумму застрахована?\n"
+    "• Сроки поставки товара?\n\n"
+    "💬 Напишите ваш вопрос:"
+)
+RAG_CLEAR_CONFIRM_TEXT = (
+    "🗑️ *Очистить базу знаний?*\n\n"
+    "⚠️ Это действие удалит ВСЕ документы и фрагменты!\n\n"
+    "Подтвердите удаление:"
+)
+
 # Initialize RAG Manager (persistent storage with ChromaDB)
 rag_manager: Optional['RAGManager'] = None
+# Serializes the first (slow) build; warmup runs it from a worker thread
+_rag_manager_lock = threading.Lock()
 
 
 def get_rag_manager() -> 'RAGManager':
@@ -66,22 +173,42 @@ def get_rag_manager() -> 'RAGManager':
         
     Raises:
         RuntimeError: If RAG module is not available
+        ImportError: If RAG dependencies are not installed
     """
     global rag_manager
     if not RAG_AVAILABLE:
         raise RuntimeError("RAG module not available")
     
     if rag_manager is None:
-        try:
-            rag_manager = RAGManager()  # type: ignore
-            logger.info("RAG Manager initialized with persistent storage")
-        except Exception as e:
-            logger.error(f"Failed to initialize RAG Manager: {e}")
-            raise
+        with _rag_manager_lock:
+            if rag_manager is None:
+                try:
+                    from rag_knowledge_base.rag_module.services.manager import RAGManager
+                    rag_manager = RAGManager()
+                    logger.info("RAG Manager initialized with persistent storage")
+                except Exception as e:
+                    logger.error("Failed to initialize RAG Manager: %s", e)
+                    raise
     
     return rag_manager
 
 
+async def warmup_rag_manager() -> None:
+    """Build RAG Manager at startup so the first user request is not slow.
+    
+    Model loading runs in a worker thread. Failures are logged only:
+    handlers will retry lazily via get_rag_manager(). Skipped when
+    RAG_PRELOAD is off, leaving the RAG stack unloaded until first /rag.
+    """
+    if not RAG_AVAILABLE or not config.RAG_PRELOAD:
+        return
+    
+    try:
+        await asyncio.to_thread(get_rag_manager)
+    except Exception as e:
+        logger.warning("RAG Manager warmup failed: %s", e)
+
+
 # ============================================================================
 # COMMAND HANDLERS
 # ============================================================================
@@ -99,14 +226,22 @@ async def cmd_rag(message: Message, state: FSMContext) -> None:
         return
     
     try:
-        get_rag_manager()
-        logger.info(f"User {message.from_user.id} activated /rag")
+        await asyncio.to_thread(get_rag_manager)
+        logger.info("User %s activated /rag", message.from_user.id)
         await show_rag_main_menu(message=message, state=state)
+    except ImportError as e:
+        logger.error("RAG dependencies missing: %s", e)
+        await message.answer(
+            "❌ RAG модуль недоступен\n\n"
+            "Установите зависимости:\n"
+            "`pip install -r rag_knowledge_base/requirements.txt`",
+            parse_mode="Markdown",
+        )
     except Exception as e:
-        logger.error(f"Error activating RAG: {e}")
+        logger.error("Error activating RAG: %s", e)
         await message.answer(
             f"❌ Ошибка инициализации RAG модуля:\n\n{str(e)[:100]}",
-            parse_mode="Markdown",
+            parse_mode=None,
         )
 
 
@@ -124,32 +259,17 @@ async def show_rag_main_menu(
     
     try:
         manager = get_rag_manager()
-        stats = manager.get_stats()
+        counts = manager.get_counts()
         
-        doc_count = stats["total_documents"]
-        chunk_count = stats["total_chunks"]
+        doc_count = counts["total_documents"]
+        chunk_count = counts["total_chunks"]
         
-        text = (
-            "🧠 *RAG Knowledge Base*\n\n"
-            "Умная система поиска по документам с интеграцией AI.\n\n"
-            f"📊 *Статус:*\n"
-            f"• Документов: {doc_count}\n"
-            f"• Фрагментов: {chunk_count}\n"
-            f"• Модель: GPT-4o-mini\n\n"
-            "📤 *Загрузка документов:*\n"
-            "Поддерживает: PDF, DOCX, TXT, Excel, ZIP\n\n"
-            "🔍 *Поиск:*\n"
-            "Семантический поиск с анализом AI\n\n"
-            "👇 Выберите действие:"
+        text = RAG_MAIN_MENU_TEMPLATE.substitute(
+            doc_count=doc_count,
+            chunk_count=chunk_count,
         )
         
-        keyboard = create_keyboard([
-            ("📤 Загрузить", "rag_upload"),
-            ("🔍 Поиск + AI", "rag_search"),
-            ("📊 Статистика", "rag_stats"),
-            ("🗑️ Очистить", "rag_clear"),
-            ("« Назад", "rag_cancel"),
-        ], rows_per_row=2)
+        keyboard = MAIN_MENU_KEYBOARD
         
         await state.set_state(RAGStates.main_menu)
         
@@ -162,10 +282,10 @@ async def show_rag_main_menu(
             screen_code="rag_main_menu",
         )
     except Exception as e:
-        logger.error(f"Error showing RAG menu: {e}")
+        logger.error("Error showing RAG menu: %s", e)
         await message.answer(
             f"❌ Ошибка: {str(e)[:100]}",
-            parse_mode="Markdown",
+            parse_mode=None,
         )
 
 
@@ -173,25 +293,35 @@ async def show_rag_main_menu(
 # UPLOAD DOCUMENT
 # ============================================================================
 
+async def _download_document(bot: Bot, file_path: str, destination: Path) -> None:
+    """Save a Telegram file to destination without buffering it in memory.
+    
+    With a local Bot API server the file is already on this machine, so it
+    is hard-linked (or copied) into place; otherwise it is streamed to disk
+    in DOWNLOAD_CHUNK_SIZE pieces.
+    """
+    api = bot.session.api
+    if not api.is_local:
+        await bot.download_file(file_path, destination, chunk_size=DOWNLOAD_CHUNK_SIZE)
+        return
+    
+    source = Path(api.wrap_local_file.to_local(file_path))
+    
+    def _link_or_copy() -> None:
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copyfile(source, destination)
+    
+    await asyncio.to_thread(_link_or_copy)
+
+
 @router.callback_query(F.data == "rag_upload")
 async def cb_rag_upload(query: CallbackQuery, state: FSMContext) -> None:
     """Start document upload flow."""
-    text = (
-        "📤 *Загрузка документа*\n\n"
-        "Отправьте документ для добавления в базу знаний.\n\n"
-        "📄 *Поддерживаемые форматы:*\n"
-        "• PDF\n"
-        "• DOCX, DOC\n"
-        "• TXT\n"
-        "• Excel (.xlsx, .xls)\n"
-        "• ZIP архивы\n\n"
-        "⚡ Документ будет автоматически обработан и проиндексирован.\n\n"
-        "📁 Отправьте файл:"
-    )
+    text = RAG_UPLOAD_TEXT
     
-    keyboard = create_keyboard([
-        ("« Назад", "rag_back_to_menu"),
-    ], rows_per_row=1)
+    keyboard = BACK_KEYBOARD
     
     await state.set_state(RAGStates.uploading)
     
@@ -217,7 +347,7 @@ async def handle_rag_document_upload(message: Message, state: FSMContext) -> Non
     file_size = document.file_size or 0
     user_id = message.from_user.id
     
-    logger.info(f"RAG: User {user_id} uploading {document.file_name} ({file_size} bytes)")
+    logger.info("RAG: User %s uploading %s (%d bytes)", user_id, document.file_name, file_size)
     
     # Validate file size
     if file_size > config.MAX_FILE_SIZE:
@@ -233,33 +363,26 @@ async def handle_rag_document_upload(message: Message, state: FSMContext) -> Non
     menu_message_id = data.get("menu_message_id")
     
     # Delete user message
-    try:
+    with suppress(TelegramBadRequest):
         await message.delete()
-    except:
-        pass
     
-    file_uuid = str(uuid.uuid4())
+    file_uuid = uuid.uuid4().hex
     temp_user_dir = None
     doc_id = f"user_{user_id}_doc_{file_uuid}"
     
     try:
         # Update status: downloading
         if menu_message_id:
-            try:
+            with suppress(TelegramBadRequest):
                 await message.bot.edit_message_text(
                     chat_id=message.chat.id,
                     message_id=menu_message_id,
                     text="📥 Скачиваю файл...",
                     parse_mode="Markdown",
                 )
-            except:
-                pass
         
-        # Create temp directory
-        temp_base = Path(config.TEMP_DIR)
-        temp_base.mkdir(exist_ok=True)
-        unique_temp_name = f"{user_id}_{file_uuid}"
-        temp_user_dir = CleanupManager.create_temp_directory(temp_base, unique_temp_name)
+        # Take a reusable temp slot directory
+        temp_user_dir = await rag_temp_pool.acquire()
         
         # Download file
         file = await message.bot.get_file(document.file_id)
@@ -268,45 +391,44 @@ async def handle_rag_document_upload(message: Message, state: FSMContext) -> Non
         
         file_ext = Path(document.file_name or "document").suffix or ".bin"
         temp_file_path = temp_user_dir / f"{file_uuid}{file_ext}"
-        await message.bot.download_file(file.file_path, temp_file_path)
+        await _download_document(message.bot, file.file_path, temp_file_path)
         
         # Update status: processing
         if menu_message_id:
-            try:
+            with suppress(TelegramBadRequest):
                 await message.bot.edit_message_text(
                     chat_id=message.chat.id,
                     message_id=menu_message_id,
                     text="⚙️ Обрабатываю документ...\n✂️ Разбиваю на фрагменты...\n🧠 Генерирую embeddings...",
                     parse_mode="Markdown",
                 )
-            except:
-                pass
         
         # Process document with RAG Manager (async)
         manager = get_rag_manager()
         
         # Run in thread pool to not block event loop
-        document_obj = await asyncio.to_thread(
-            manager.add_document,
-            temp_file_path,
-            doc_id,
-            {
-                "user_id": user_id,
-                "original_filename": document.file_name,
-                "uploaded_at": datetime.now().isoformat(),
-                "file_size": file_size,
-            }
-        )
+        async with RAG_CPU_SEMAPHORE:
+            document_obj = await asyncio.to_thread(
+                manager.add_document,
+                temp_file_path,
+                doc_id,
+                {
+                    "user_id": user_id,
+                    "original_filename": document.file_name,
+                    "uploaded_at": datetime.now().isoformat(),
+                    "file_size": file_size,
+                }
+            )
         
         logger.info(
-            f"RAG: User {user_id} uploaded {document.file_name} "
-            f"({document_obj.chunk_count} chunks, persisted to ChromaDB)"
+            "RAG: User %s uploaded %s (%d chunks, persisted to ChromaDB)",
+            user_id, document.file_name, document_obj.chunk_count,
         )
         
-        # Get updated stats
-        stats = manager.get_stats()
-        doc_count = stats["total_documents"]
-        chunk_count = stats["total_chunks"]
+        # Get updated counts
+        counts = manager.get_counts()
+        doc_count = counts["total_documents"]
+        chunk_count = counts["total_chunks"]
         
         text = (
             f"✅ *Документ загружен и сохранен!*\n\n"
@@ -320,11 +442,7 @@ async def handle_rag_document_upload(message: Message, state: FSMContext) -> Non
             f"👇 Выберите действие:"
         )
         
-        keyboard = create_keyboard([
-            ("📤 Загрузить ещё", "rag_upload"),
-            ("🔍 Поиск", "rag_search"),
-            ("« Назад", "rag_back_to_menu"),
-        ], rows_per_row=2)
+        keyboard = UPLOAD_DONE_KEYBOARD
         
         await MenuManager.show_menu(
             message=message,
@@ -335,17 +453,15 @@ async def handle_rag_document_upload(message: Message, state: FSMContext) -> Non
         )
     
     except Exception as e:
-        logger.error(f"RAG upload error: {e}")
+        logger.error("RAG upload error: %s", e)
         
         text = (
-            f"❌ *Ошибка загрузки*\n\n"
-            f"```\n{str(e)[:150]}\n```\n\n"
+            f"❌ Ошибка загрузки\n\n"
+            f"{str(e)[:150]}\n\n"
             f"Попробуйте другой файл или обратитесь в поддержку."
         )
         
-        keyboard = create_keyboard([
-            ("« Назад", "rag_back_to_menu"),
-        ], rows_per_row=1)
+        keyboard = BACK_KEYBOARD
         
         await MenuManager.show_menu(
             message=message,
@@ -353,12 +469,13 @@ async def handle_rag_document_upload(message: Message, state: FSMContext) -> Non
             text=text,
             keyboard=keyboard,
             screen_code="rag_upload_error",
+            parse_mode=None,
         )
     
     finally:
         # Cleanup temp files
-        if temp_user_dir and temp_user_dir.exists():
-            await CleanupManager.cleanup_directory_async(temp_user_dir)
+        if temp_user_dir:
+            await rag_temp_pool.release(temp_user_dir)
 
 
 # ============================================================================
@@ -372,20 +489,11 @@ async def cb_rag_search(query: CallbackQuery, state: FSMContext) -> None:
     
     try:
         manager = get_rag_manager()
-        stats = manager.get_stats()
-        
         # Check if documents exist
-        if stats["total_documents"] == 0:
-            text = (
-                "📚 *База знаний пуста*\n\n"
-                "Сначала загрузите документы через 'Загрузить'.\n\n"
-                "👇 Выберите действие:"
-            )
+        if manager.get_counts()["total_documents"] == 0:
+            text = RAG_EMPTY_BASE_TEXT
             
-            keyboard = create_keyboard([
-                ("📤 Загрузить", "rag_upload"),
-                ("« Назад", "rag_back_to_menu"),
-            ], rows_per_row=2)
+            keyboard = EMPTY_BASE_KEYBOARD
             
             await MenuManager.navigate(
                 callback=query,
@@ -398,20 +506,9 @@ async def cb_rag_search(query: CallbackQuery, state: FSMContext) -> None:
             )
             return
         
-        text = (
-            "🔍 *Поиск с AI анализом*\n\n"
-            "Задайте вопрос на естественном языке.\n"
-            "AI найдет релевантные документы и даст подробный ответ.\n\n"
-            "*Примеры:*\n"
-            "• Какие условия оплаты?\n"
-            "• На какую сумму застрахована?\n"
-            "• Сроки поставки товара?\n\n"
-            "💬 Напишите ваш вопрос:"
-        )
+        text = RAG_SEARCH_PROMPT_TEXT
         
-        keyboard = create_keyboard([
-            ("« Назад", "rag_back_to_menu"),
-        ], rows_per_row=1)
+        keyboard = BACK_KEYBOARD
         
         await state.set_state(RAGStates.searching)
         
@@ -425,10 +522,10 @@ async def cb_rag_search(query: CallbackQuery, state: FSMContext) -> None:
             preserve_data=True,
         )
     except Exception as e:
-        logger.error(f"Error starting search: {e}")
+        logger.error("Error starting search: %s", e)
         await query.message.edit_text(
             f"❌ Ошибка: {str(e)[:100]}",
-            parse_mode="Markdown",
+            parse_mode=None,
         )
 
 
@@ -441,42 +538,69 @@ async def handle_rag_search_query(message: Message, state: FSMContext) -> None:
     if not query_text or not query_text.strip():
         return
     
-    logger.info(f"RAG: User {user_id} searching '{query_text}'")
+    query_text = query_text.strip()
+    logger.info("RAG: User %s searching '%s'", user_id, query_text)
     
     # Get menu_message_id
     data = await state.get_data()
     menu_message_id = data.get("menu_message_id")
     
     # Delete user message
-    try:
+    with suppress(TelegramBadRequest):
         await message.delete()
-    except:
-        pass
     
-    # Update menu with processing status
-    if menu_message_id:
-        try:
-            await message.bot.edit_message_text(
-                chat_id=message.chat.id,
-                message_id=menu_message_id,
-                text=f"🔍 Ищу в документах: `{query_text[:40]}...`",
-                parse_mode="Markdown",
-            )
-        except:
-            pass
+    # Too short to embed meaningfully - don't spend an embedding + vector query
+    if len(query_text) < MIN_QUERY_LENGTH:
+        text = (
+            f"✏️ *Слишком короткий запрос*\n\n"
+            f"Введите минимум {MIN_QUERY_LENGTH} символа.\n\n"
+            f"💬 Напишите ваш вопрос:"
+        )
+        
+        keyboard = BACK_KEYBOARD
+        
+        await MenuManager.show_menu(
+            message=message,
+            state=state,
+            text=text,
+            keyboard=keyboard,
+            screen_code="rag_search_too_short",
+        )
+        return
     
     try:
         manager = get_rag_manager()
         
-        # Semantic search (async)
-        search_results = await asyncio.to_thread(
-            manager.search,
-            query_text,
-            top_k=5
-        )
+        # Empty knowledge base - skip embedding and vector search entirely
+        if manager.get_counts()["total_documents"] == 0:
+            text = RAG_EMPTY_BASE_TEXT
+            
+            keyboard = EMPTY_BASE_KEYBOARD
+            
+            await MenuManager.show_menu(
+                message=message,
+                state=state,
+                text=text,
+                keyboard=keyboard,
+                screen_code="rag_search_empty",
+            )
+            return
         
-        # Filter by relevance
-        relevant_results = [r for r in search_results if r.similarity_score >= 0.3]
+        # Update menu with processing status
+        if menu_message_id:
+            with suppress(TelegramBadRequest):
+                await message.bot.edit_message_text(
+                    chat_id=message.chat.id,
+                    message_id=menu_message_id,
+                    text=f"🔍 Ищу в документах: `{query_text[:40]}...`",
+                    parse_mode="Markdown",
+                )
+        
+        # Semantic search (query embedding is batched with concurrent searches)
+        async with RAG_CPU_SEMAPHORE:
+            relevant_results = await manager.search_async(
+                query_text, top_k=5, min_similarity=MIN_RELEVANCE
+            )
         
         if not relevant_results:
             text = (
@@ -489,10 +613,7 @@ async def handle_rag_search_query(message: Message, state: FSMContext) -> None:
                 f"👇 Выберите действие:"
             )
             
-            keyboard = create_keyboard([
-                ("🔍 Новый поиск", "rag_search"),
-                ("« Назад", "rag_back_to_menu"),
-            ], rows_per_row=2)
+            keyboard = NEW_SEARCH_KEYBOARD
             
             await MenuManager.show_menu(
                 message=message,
@@ -505,31 +626,39 @@ async def handle_rag_search_query(message: Message, state: FSMContext) -> None:
         
         # Update status: analyzing with AI
         if menu_message_id:
-            try:
+            with suppress(TelegramBadRequest):
                 await message.bot.edit_message_text(
                     chat_id=message.chat.id,
                     message_id=menu_message_id,
                     text=f"🤖 Анализирую найденные документы с AI...",
                     parse_mode="Markdown",
                 )
-            except:
-                pass
         
-        # Prepare context for LLM
-        context_parts = []
-        for i, result in enumerate(relevant_results[:3], 1):
+        # Prepare LLM context and user-facing list in a single pass
+        top_results = relevant_results[:3]
+        context_parts: List[Optional[str]] = [None] * len(top_results)
+        display_parts: List[Optional[str]] = [None] * len(top_results)
+
+        for i, result in enumerate(top_results):
             chunk = result.chunk
+            meta = chunk.metadata
+            source = meta.get("source_file", "unknown")
+            page = meta.get("page")
             relevance_pct = int(result.similarity_score * 100)
-            source = chunk.metadata.get("source_file", "unknown")
-            page = chunk.metadata.get("page")
-            
             page_info = f" (стр. {page})" if page else ""
-            context_parts.append(
-                f"[Документ {i}{page_info}, {relevance_pct}% релевантности]\n"
+            emoji = "🎯" if relevance_pct > 80 else "📌" if relevance_pct > 60 else "📄"
+
+            context_parts[i] = (
+                f"[Документ {i + 1}{page_info}, {relevance_pct}% релевантности]\n"
                 f"Источник: {source}\n"
                 f"Текст: {chunk.text[:300]}...\n"
             )
-        
+            display_parts[i] = (
+                f"\n{emoji} *Док. {i + 1}* ({relevance_pct}%){page_info}\n"
+                f"📄 `{source}`\n"
+                f"__{chunk.text[:150]}...__\n"
+            )
+
         context = "\n".join(context_parts)
         
         # Create prompt for LLM
@@ -546,47 +675,40 @@ async def handle_rag_search_query(message: Message, state: FSMContext) -> None:
             f"ОТВЕТ:"
         )
         
-        # Call LLM for analysis
-        logger.info(f"RAG: Calling LLM for analysis (query: {query_text[:50]}) for user {user_id}")
+        # Result list tail is ready before the LLM call, so the final
+        # screen is rendered as soon as the last token arrives
+        results_tail = (
+            "*📄 Найденные документы:*\n"
+            + "".join(display_parts)
+            + "\n👇 Выберите действие:"
+        )
+        
+        # Call LLM for analysis (streamed, with progressive status updates)
+        logger.info(
+            "RAG: Calling LLM for analysis (query: %.50s) for user %s",
+            query_text, user_id,
+        )
         
-        llm_response = await llm_factory.analyze_document(
+        llm_response = await _stream_llm_analysis(
+            message,
+            menu_message_id,
             context,
             llm_user_prompt,
-            system_prompt=llm_system_prompt,
-            use_streaming=False,
-            user_id=user_id,
+            llm_system_prompt,
+            user_id,
         )
         
         if not llm_response:
             llm_response = "❌ Не удалось получить ответ от AI"
         
         # Build response
-        text = f"🎯 *Результаты поиска для:* `{query_text}`\n\n"
-        text += f"💡 *AI Анализ:*\n{llm_response}\n\n"
-        text += "*📄 Найденные документы:*\n"
-        
-        for i, result in enumerate(relevant_results[:3], 1):
-            chunk = result.chunk
-            relevance_pct = int(result.similarity_score * 100)
-            source = chunk.metadata.get("source_file", "unknown")
-            page = chunk.metadata.get("page")
-            
-            page_info = f" (стр. {page})" if page else ""
-            emoji = "🎯" if relevance_pct > 80 else "📌" if relevance_pct > 60 else "📄"
-            
-            text += (
-                f"\n{emoji} *Док. {i}* ({relevance_pct}%){page_info}\n"
-                f"📄 `{source}`\n"
-                f"__{chunk.text[:150]}...__\n"
-            )
+        text = "".join((
+            f"🎯 *Результаты поиска для:* `{query_text}`\n\n",
+            f"💡 *AI Анализ:*\n{llm_response}\n\n",
+            results_tail,
+        ))
         
-        text += "\n👇 Выберите действие:"
-        
-        keyboard = create_keyboard([
-            ("🔍 Новый поиск", "rag_search"),
-            ("📤 Загрузить документ", "rag_upload"),
-            ("« Назад", "rag_back_to_menu"),
-        ], rows_per_row=2)
+        keyboard = SEARCH_DONE_KEYBOARD
         
         await MenuManager.show_menu(
             message=message,
@@ -596,20 +718,21 @@ async def handle_rag_search_query(message: Message, state: FSMContext) -> None:
             screen_code="rag_search_results",
         )
         
-        logger.info(f"RAG: User {user_id} search complete - found {len(relevant_results)} results")
+        logger.info(
+            "RAG: User %s search complete - found %d results",
+            user_id, len(relevant_results),
+        )
     
     except Exception as e:
-        logger.error(f"RAG search error: {e}")
+        logger.error("RAG search error: %s", e)
         
         text = (
-            f"❌ *Ошибка поиска*\n\n"
-            f"```\n{str(e)[:150]}\n```\n\n"
+            f"❌ Ошибка поиска\n\n"
+            f"{str(e)[:150]}\n\n"
             f"Попробуйте ещё раз или обратитесь в поддержку."
         )
         
-        keyboard = create_keyboard([
-            ("« Назад", "rag_back_to_menu"),
-        ], rows_per_row=1)
+        keyboard = BACK_KEYBOARD
         
         await MenuManager.show_menu(
             message=message,
@@ -617,9 +740,70 @@ async def handle_rag_search_query(message: Message, state: FSMContext) -> None:
             text=text,
             keyboard=keyboard,
             screen_code="rag_search_error",
+            parse_mode=None,
         )
 
 
+async def _stream_llm_analysis(
+    message: Message,
+    menu_message_id: Optional[int],
+    context: str,
+    user_prompt: str,
+    system_prompt: str,
+    user_id: int,
+) -> str:
+    """Run LLM analysis with streaming and show partial answer in the menu.
+    
+    Edits of the menu message are throttled to STREAM_EDIT_INTERVAL
+    (Telegram flood limits). Providers without streaming return a plain
+    string, which is passed through. If the stream fails before the first
+    token, falls back to a regular (non-streaming) call with retries.
+    
+    Returns:
+        Full LLM answer
+    """
+    response = await llm_factory.analyze_document(
+        context,
+        user_prompt,
+        system_prompt=system_prompt,
+        use_streaming=True,
+        user_id=user_id,
+    )
+    if isinstance(response, str):
+        return response
+    
+    loop = asyncio.get_running_loop()
+    parts: List[str] = []
+    last_edit = loop.time()
+    
+    try:
+        async for token in response:
+            parts.append(token)
+            now = loop.time()
+            if menu_message_id and now - last_edit >= STREAM_EDIT_INTERVAL:
+                last_edit = now
+                # Partial output may contain unbalanced Markdown -> plain text
+                with suppress(TelegramBadRequest):
+                    await message.bot.edit_message_text(
+                        chat_id=message.chat.id,
+                        message_id=menu_message_id,
+                        text=f"🤖 AI Анализ:\n{''.join(parts)} ▌",
+                    )
+    except Exception as e:
+        if parts:
+            raise
+        logger.warning("RAG: LLM stream failed (%s), retrying without streaming", e)
+        return await llm_factory.analyze_document(
+            context,
+            user_prompt,
+            system_prompt=system_prompt,
+            use_streaming=False,
+            user_id=user_id,
+        )
+    
+    return "".join(parts)
+
+
 # ============================================================================
 # STATISTICS
 # ============================================================================
@@ -627,36 +811,38 @@ async def handle_rag_search_query(message: Message, state: FSMContext) -> None:
 @router.callback_query(F.data == "rag_stats")
 async def cb_rag_stats(query: CallbackQuery, state: FSMContext) -> None:
     """Show RAG statistics."""
+    parse_mode = "Markdown"
     try:
         manager = get_rag_manager()
         stats = manager.get_stats()
         
-        text = (
-            f"📊 *Статистика RAG базы знаний*\n\n"
-            f"📚 Документов: {stats['total_documents']}\n"
-            f"📄 Фрагментов: {stats['total_chunks']}\n"
-            f"🧠 Embedding модель: paraphrase-multilingual-MiniLM-L12-v2\n"
-            f"📐 Размер вектора: {stats['embedding_dimension']}D\n"
-            f"🎯 Порог релевантности: {int(stats['similarity_threshold'] * 100)}%\n\n"
-        )
+        lines = [
+            "📊 *Статистика RAG базы знаний*\n",
+            f"📚 Документов: {stats['total_documents']}",
+            f"📄 Фрагментов: {stats['total_chunks']}",
+            "🧠 Embedding модель: paraphrase-multilingual-MiniLM-L12-v2",
+            f"📐 Размер вектора: {stats['embedding_dimension']}D",
+            f"🎯 Порог релевантности: {int(stats['similarity_threshold'] * 100)}%\n",
+        ]
         
         if stats["total_documents"] > 0:
-            text += "*Загруженные документы:*\n"
-            for doc in stats["documents"]:
-                size_kb = doc["size"] / 1024
-                text += f"  • `{doc['filename']}`: {doc['chunks']} чанков ({size_kb:.1f} KB)\n"
+            lines.append("*Загруженные документы:*")
+            lines.extend(
+                f"  • `{doc['filename']}`: {doc['chunks']} чанков ({doc['size'] / 1024:.1f} KB)"
+                for doc in stats["documents"]
+            )
         else:
-            text += "📭 База знаний пуста\n"
+            lines.append("📭 База знаний пуста")
         
-        text += "\n👇 Выберите действие:"
+        lines.append("\n👇 Выберите действие:")
+        text = "\n".join(lines)
     
     except Exception as e:
-        logger.error(f"Error getting stats: {e}")
+        logger.error("Error getting stats: %s", e)
         text = f"❌ Ошибка: {str(e)[:100]}"
+        parse_mode = None
     
-    keyboard = create_keyboard([
-        ("« Назад", "rag_back_to_menu"),
-    ], rows_per_row=1)
+    keyboard = BACK_KEYBOARD
     
     await MenuManager.navigate(
         callback=query,
@@ -666,6 +852,7 @@ async def cb_rag_stats(query: CallbackQuery, state: FSMContext) -> None:
         new_state=RAGStates.main_menu,
         screen_code="rag_stats",
         preserve_data=True,
+        parse_mode=parse_mode,
     )
 
 
@@ -676,16 +863,9 @@ async def cb_rag_stats(query: CallbackQuery, state: FSMContext) -> None:
 @router.callback_query(F.data == "rag_clear")
 async def cb_rag_clear(query: CallbackQuery, state: FSMContext) -> None:
     """Clear RAG storage (confirmation)."""
-    text = (
-        "🗑️ *Очистить базу знаний?*\n\n"
-        "⚠️ Это действие удалит ВСЕ документы и фрагменты!\n\n"
-        "Подтвердите удаление:"
-    )
+    text = RAG_CLEAR_CONFIRM_TEXT
     
-    keyboard = create_keyboard([
-        ("✅ Да, удалить всё", "rag_confirm_clear"),
-        ("❌ Отмена", "rag_back_to_menu"),
-    ], rows_per_row=2)
+    keyboard = CONFIRM_CLEAR_KEYBOARD
     
     await MenuManager.navigate(
         callback=query,
@@ -701,9 +881,10 @@ async def cb_rag_clear(query: CallbackQuery, state: FSMContext) -> None:
 @router.callback_query(F.data == "rag_confirm_clear")
 async def cb_rag_confirm_clear(query: CallbackQuery, state: FSMContext) -> None:
     """Confirm clear RAG storage."""
+    parse_mode = "Markdown"
     try:
         manager = get_rag_manager()
-        manager.clear_all()
+        await asyncio.to_thread(manager.clear_all)
         
         text = (
             "🗑️ *База знаний очищена*\n\n"
@@ -712,15 +893,14 @@ async def cb_rag_confirm_clear(query: CallbackQuery, state: FSMContext) -> None:
             "✅ ChromaDB очищена\n\n"
             "👇 Выберите действие:"
         )
-        logger.info(f"User {query.from_user.id} cleared RAG database")
+        logger.info("User %s cleared RAG database", query.from_user.id)
     
     except Exception as e:
-        logger.error(f"Error clearing database: {e}")
+        logger.error("Error clearing database: %s", e)
         text = f"❌ Ошибка при очистке: {str(e)[:100]}\n\n👇 Выберите действие:"
+        parse_mode = None
     
-    keyboard = create_keyboard([
-        ("« Назад", "rag_back_to_menu"),
-    ], rows_per_row=1)
+    keyboard = BACK_KEYBOARD
     
     await MenuManager.navigate(
         callback=query,
@@ -730,6 +910,7 @@ async def cb_rag_confirm_clear(query: CallbackQuery, state: FSMContext) -> None:
         new_state=RAGStates.main_menu,
         screen_code="rag_clear_done",
         preserve_data=True,
+        parse_mode=parse_mode,
     )
 
 
@@ -752,4 +933,4 @@ async def cb_rag_cancel(query: CallbackQuery, state: FSMContext) -> None:
     
     await query.message.edit_text(text, parse_mode="Markdown")
     await query.answer()
-    logger.info(f"User {query.from_user.id} exited RAG mode")
+    logger.info("User %s exited RAG mode", query.from_user.id)
@@ -1,12 +1,27 @@
 """File processing services package.
 
 Provides file conversion, parsing, and handling for various document formats.
+
+Parsers are re-exported lazily so that importing the package (or
+FileConverter) does not pull in pypdf/python-docx until they are needed.
 """
 
+from importlib import import_module
+
 from app.services.file_processing.converter import FileConverter
-from app.services.file_processing.pdf_parser import PDFParser
-from app.services.file_processing.docx_parser import DOCXParser
-from app.services.file_processing.zip_handler import ZIPHandler
+
+_LAZY_EXPORTS = {
+    "PDFParser": "app.services.file_processing.pdf_parser",
+    "DOCXParser": "app.services.file_processing.docx_parser",
+    "ZIPHandler": "app.services.file_processing.zip_handler",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        return getattr(import_module(_LAZY_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "FileConverter",
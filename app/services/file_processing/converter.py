@@ -23,19 +23,119 @@ Fixes 2025-12-20 22:10:
 - Логирование ошибок формата улучшено
 """
 
+import hashlib
+import io
 import logging
-import shutil
+import os
+import tempfile
+import threading
+import zipfile
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from app.services.file_processing.pdf_parser import PDFParser
-from app.services.file_processing.docx_parser import DOCXParser
-from app.services.file_processing.excel_parser import ExcelParser
-from app.services.file_processing.zip_handler import ZIPHandler
+from app.services.file_processing.text_cleaner import TextCleaner
+
+if TYPE_CHECKING:
+    from app.services.file_processing.pdf_parser import PDFParser
+    from app.services.file_processing.docx_parser import DOCXParser
+    from app.services.file_processing.excel_parser import ExcelParser
+    from app.services.file_processing.zip_handler import ZIPHandler
 
 logger = logging.getLogger(__name__)
 
-SUPPORTED_FORMATS = {".pdf", ".docx", ".txt", ".zip", ".doc", ".xlsx", ".xls"}
+SUPPORTED_FORMATS = frozenset({".pdf", ".docx", ".txt", ".zip", ".doc", ".xlsx", ".xls"})
+
+# Threads for parsing ZIP members in parallel (parsers are I/O + C-heavy)
+MAX_ZIP_WORKERS = min(8, os.cpu_count() or 1)
+
+# Extracted texts remembered by content hash (re-uploads of the same file)
+TEXT_CACHE_SIZE = 32
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class _TextCache:
+    """In-memory LRU of extracted text keyed on (suffix, size, content hash).
+    
+    Uploads land under fresh temp paths, so only the content identifies a
+    repeated document. File size is checked first: a file whose size is not
+    in the cache is never hashed. Kept in memory on purpose - extracted user
+    documents are not persisted to disk.
+    """
+    
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[tuple, str]" = OrderedDict()
+        self._sizes: Counter = Counter()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def file_digest(file_path: Path) -> bytes:
+        """BLAKE2b digest of the file, read in chunks."""
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, "rb") as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.digest()
+    
+    def has_size(self, size: int) -> bool:
+        return self._sizes[size] > 0
+    
+    def get(self, key: tuple) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+            return text
+    
+    def put(self, key: tuple, text: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = text
+            self._sizes[key[1]] += 1
+            while len(self._entries) > self.maxsize:
+                old_key, _ = self._entries.popitem(last=False)
+                self._sizes[old_key[1]] -= 1
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+
+
+_text_cache = _TextCache(TEXT_CACHE_SIZE)
+
+
+# Parsers are stateless: one shared instance per process, created (and its
+# heavy dependency imported) on first use of the format
+
+
+@lru_cache(maxsize=None)
+def _shared_pdf_parser() -> "PDFParser":
+    from app.services.file_processing.pdf_parser import PDFParser
+    return PDFParser()
+
+
+@lru_cache(maxsize=None)
+def _shared_docx_parser() -> "DOCXParser":
+    from app.services.file_processing.docx_parser import DOCXParser
+    return DOCXParser()
+
+
+@lru_cache(maxsize=None)
+def _shared_excel_parser() -> "ExcelParser":
+    from app.services.file_processing.excel_parser import ExcelParser
+    return ExcelParser()
+
+
+@lru_cache(maxsize=None)
+def _shared_zip_handler() -> "ZIPHandler":
+    from app.services.file_processing.zip_handler import ZIPHandler
+    return ZIPHandler()
 
 
 class FileConverter:
@@ -48,11 +148,38 @@ class FileConverter:
     """
     
     def __init__(self) -> None:
-        """Initialize converter with parsers."""
-        self.pdf_parser = PDFParser()
-        self.docx_parser = DOCXParser()
-        self.excel_parser = ExcelParser()
-        self.zip_handler = ZIPHandler()
+        """Initialize converter (parsers are created lazily on first use)."""
+        # Suffix -> handler(file_path, temp_dir), built once per converter
+        self._handlers = {
+            ".doc": self._extract_doc,
+            ".pdf": self._extract_pdf,
+            ".docx": self._extract_docx,
+            ".xlsx": self._extract_excel,
+            ".xls": self._extract_excel,
+            ".txt": self._extract_txt,
+            ".zip": self._extract_zip_archive,
+        }
+    
+    @cached_property
+    def pdf_parser(self) -> "PDFParser":
+        return _shared_pdf_parser()
+    
+    @cached_property
+    def docx_parser(self) -> "DOCXParser":
+        return _shared_docx_parser()
+    
+    @cached_property
+    def excel_parser(self) -> "ExcelParser":
+        return _shared_excel_parser()
+    
+    @cached_property
+    def zip_handler(self) -> "ZIPHandler":
+        return _shared_zip_handler()
+    
+    @staticmethod
+    def _get_suffix(file_path: Path) -> str:
+        """Get lowercase file suffix (computed once per extract_text call)."""
+        return file_path.suffix.lower()
     
     def is_supported(self, file_path: Path) -> bool:
         """Check if file format is supported.
@@ -63,7 +190,7 @@ class FileConverter:
         Returns:
             bool: True if format is supported
         """
-        return file_path.suffix.lower() in SUPPORTED_FORMATS
+        return self._get_suffix(file_path) in SUPPORTED_FORMATS
     
     def extract_text(
         self,
@@ -79,7 +206,7 @@ class FileConverter:
         
         Args:
             file_path: Path to file
-            temp_dir: Directory for temporary files (required for ZIP and .doc)
+            temp_dir: Directory for temporary files (required for ZIP)
             
         Returns:
             str: Extracted text
@@ -93,60 +220,86 @@ class FileConverter:
             >>> text = converter.extract_text(Path("document.pdf"))
             >>> print(f"Extracted {len(text)} characters")
         """
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        # One stat() for the existence check and the text cache size key
+        try:
+            file_size = file_path.stat().st_size
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
         
-        if not self.is_supported(file_path):
+        file_suffix = self._get_suffix(file_path)
+        handler = self._handlers.get(file_suffix)
+        if handler is None:
             supported_str = ", ".join(sorted(SUPPORTED_FORMATS))
             raise ValueError(
                 f"Unsupported format: {file_path.suffix}. "
                 f"Supported: {supported_str}"
             )
         
-        file_suffix = file_path.suffix.lower()
+        # Same bytes as an earlier upload: return the remembered text
+        key = None
+        if _text_cache.has_size(file_size):
+            key = (file_suffix, file_size, _text_cache.file_digest(file_path))
+            cached = _text_cache.get(key)
+            if cached is not None:
+                logger.info(f"Using cached text for {file_path.name} ({len(cached)} chars)")
+                return cached
         
         try:
-            # Handle .doc files (can be ZIP-like or binary)
-            # CRITICAL: Old .doc is BINARY, not ZIP!
-            if file_suffix == ".doc":
-                logger.info(f"Processing .doc file: {file_path.name}")
-                if not temp_dir:
-                    raise ValueError("temp_dir required for .doc processing")
-                
-                # Try to process directly with DOCX parser
-                # (it has ZIP try + binary fallback)
-                logger.info(f"Attempting to extract from .doc as {file_path.name}")
-                return self.docx_parser.extract_text(file_path)
-            
-            # Regular format routing
-            if file_suffix == ".pdf":
-                logger.info(f"Processing PDF: {file_path.name}")
-                return self.pdf_parser.extract_text(file_path)
-            
-            elif file_suffix == ".docx":
-                logger.info(f"Processing DOCX: {file_path.name}")
-                return self.docx_parser.extract_text(file_path)
-            
-            elif file_suffix in {".xlsx", ".xls"}:
-                logger.info(f"Processing Excel: {file_path.name}")
-                return self.excel_parser.extract_text(file_path)
-            
-            elif file_suffix == ".txt":
-                logger.info(f"Processing TXT: {file_path.name}")
-                return self._extract_text_file(file_path)
-            
-            elif file_suffix == ".zip":
-                if not temp_dir:
-                    raise ValueError("temp_dir required for ZIP processing")
-                logger.info(f"Processing ZIP: {file_path.name}")
-                return self._extract_zip(file_path, temp_dir)
-            
-            else:
-                raise ValueError(f"Unsupported format: {file_suffix}")
-        
+            text = handler(file_path, temp_dir)
         except Exception as e:
             logger.error(f"Error extracting text from {file_path.name}: {e}")
             raise
+        
+        if text:
+            if key is None:
+                key = (file_suffix, file_size, _text_cache.file_digest(file_path))
+            _text_cache.put(key, text)
+        return text
+    
+    def _extract_doc(self, file_path: Path, temp_dir: Optional[Path]) -> str:
+        """Handle .doc files (can be ZIP-like or binary).
+        
+        CRITICAL: Old .doc is BINARY, not ZIP!
+        """
+        logger.info(f"Processing .doc file: {file_path.name}")
+        
+        # Some ".doc" files are really .docx (ZIP with XML inside): parse the
+        # file in place, no .docx copy/link in temp_dir
+        if zipfile.is_zipfile(file_path):
+            logger.info(f"{file_path.name} is ZIP-based, parsing as .docx")
+            with open(file_path, "rb") as f:
+                return self.docx_parser.extract_text_from_stream(f, file_path.name)
+        
+        # Binary .doc: DOCX parser delegates to DOCParser
+        logger.info(f"Attempting to extract from .doc as {file_path.name}")
+        return self.docx_parser.extract_text(file_path)
+    
+    def _extract_pdf(self, file_path: Path, temp_dir: Optional[Path]) -> str:
+        """Handle PDF files."""
+        logger.info(f"Processing PDF: {file_path.name}")
+        return self.pdf_parser.extract_text(file_path)
+    
+    def _extract_docx(self, file_path: Path, temp_dir: Optional[Path]) -> str:
+        """Handle DOCX files."""
+        logger.info(f"Processing DOCX: {file_path.name}")
+        return self.docx_parser.extract_text(file_path)
+    
+    def _extract_excel(self, file_path: Path, temp_dir: Optional[Path]) -> str:
+        """Handle Excel files (.xlsx, .xls)."""
+        logger.info(f"Processing Excel: {file_path.name}")
+        return self.excel_parser.extract_text(file_path)
+    
+    def _extract_txt(self, file_path: Path, temp_dir: Optional[Path]) -> str:
+        """Handle plain text files."""
+        logger.info(f"Processing TXT: {file_path.name}")
+        return self._extract_text_file(file_path)
+    
+    def _extract_zip_archive(self, file_path: Path, temp_dir: Optional[Path]) -> str:
+        """Handle ZIP archives."""
+        if not temp_dir:
+            raise ValueError("temp_dir required for ZIP processing")
+        logger.info(f"Processing ZIP: {file_path.name}")
+        return self._extract_zip(file_path, temp_dir)
     
     def _extract_text_file(self, file_path: Path) -> str:
         """Extract text from plain text file.
@@ -157,42 +310,126 @@ class FileConverter:
         Returns:
             str: File content
         """
+        return self._decode_text(file_path.read_bytes(), file_path.name)
+    
+    @staticmethod
+    def _decode_text(data: bytes, name: str) -> str:
+        """Decode plain text bytes.
+        
+        A BOM decides directly; otherwise UTF-8 first (no detection needed on
+        the common path), then the detected encoding (e.g. cp1251), then
+        latin-1 as a lossless last resort.
+        """
+        bom_encoding = TextCleaner.detect_bom(data)
+        if bom_encoding:
+            return data.decode(bom_encoding, errors="replace")
+        
         try:
-            return file_path.read_text(encoding="utf-8")
+            return data.decode("utf-8")
         except UnicodeDecodeError:
-            logger.warning(f"UTF-8 decode failed for {file_path.name}, trying latin-1")
-            return file_path.read_text(encoding="latin-1")
+            pass
+        
+        # Canonical name: skip encodings that already failed (UTF-8 is a
+        # superset of ASCII) or that equal the latin-1 fallback below
+        encoding = TextCleaner.detect_encoding(data)
+        if encoding not in (None, "utf-8", "ascii", "iso8859-1"):
+            try:
+                logger.warning(f"UTF-8 decode failed for {name}, using detected {encoding}")
+                return data.decode(encoding)
+            except UnicodeDecodeError:
+                pass
+        
+        logger.warning(f"Cannot decode {name} reliably, falling back to latin-1")
+        return data.decode("latin-1")
     
     def _extract_zip(self, file_path: Path, temp_dir: Path) -> str:
         """Extract and process ZIP archive.
         
+        Members are streamed from the archive and parsed in memory; only
+        .doc members (parsers need a real file) are written to temp_dir.
+        Members are parsed in a thread pool while the archive is still
+        being read; output keeps archive order. At most
+        MAX_ZIP_WORKERS * 2 members are in flight, so decompressed data
+        of the whole archive is never held in memory at once.
+        
         Args:
             file_path: Path to ZIP file
             temp_dir: Directory for temporary files
             
         Returns:
-            str: Combined text from all extracted files
+            str: Combined text from all supported files
         """
-        extracted_files = self.zip_handler.extract_supported_files(
-            file_path,
-            temp_dir,
-        )
+        # Written piece by piece: no per-member "header + text" copy
+        combined_text = io.StringIO()
+        pending = deque()
+        member_count = 0
+        
+        def write_next() -> None:
+            name, future = pending.popleft()
+            text = future.result()
+            if text:
+                combined_text.write("\n\n=== File: ")
+                combined_text.write(name)
+                combined_text.write(" ===\n")
+                combined_text.write(text)
+        
+        # ZIPHandler never yields nested .zip, so workers do not recurse
+        with ThreadPoolExecutor(max_workers=MAX_ZIP_WORKERS) as executor:
+            for name, data in self.zip_handler.iter_supported_files(file_path):
+                # Window of in-flight members: wait for the oldest before
+                # decompressing more
+                if len(pending) >= MAX_ZIP_WORKERS * 2:
+                    write_next()
+                pending.append((name, executor.submit(self._safe_extract, name, data, temp_dir)))
+                member_count += 1
+            
+            while pending:
+                write_next()
         
-        if not extracted_files:
+        if not member_count:
             logger.warning(f"No supported files found in {file_path.name}")
-            return ""
         
-        combined_text: list[str] = []
+        return combined_text.getvalue()
+    
+    def _safe_extract(self, name: str, data: bytes, temp_dir: Path) -> Optional[str]:
+        """Extract text from a ZIP member, logging errors instead of raising.
         
-        for file_path_extracted in extracted_files:
-            try:
-                text = self.extract_text(file_path_extracted, temp_dir)
-                if text:
-                    combined_text.append(
-                        f"\n\n=== File: {file_path_extracted.name} ===\n{text}"
-                    )
-            except Exception as e:
-                logger.warning(f"Error processing {file_path_extracted.name}: {e}")
-                continue
-        
-        return "".join(combined_text)
+        Args:
+            name: Member file name (used for format routing)
+            data: Member content
+            temp_dir: Directory for temporary files
+            
+        Returns:
+            Optional[str]: Extracted text, or None if the member failed
+        """
+        try:
+            return self._extract_bytes(name, data, temp_dir)
+        except Exception as e:
+            logger.warning(f"Error processing {name}: {e}")
+            return None
+    
+    def _extract_bytes(self, name: str, data: bytes, temp_dir: Path) -> str:
+        """Extract text from in-memory file content (ZIP archive member).
+        
+        Args:
+            name: File name (used for format routing)
+            data: File content
+            temp_dir: Directory for temporary files
+            
+        Returns:
+            str: Extracted text
+        """
+        suffix = os.path.splitext(name)[1].lower()
+        
+        if suffix == ".pdf":
+            return self.pdf_parser.extract_text_from_stream(io.BytesIO(data), name)
+        if suffix == ".docx":
+            return self.docx_parser.extract_text_from_stream(io.BytesIO(data), name)
+        if suffix == ".txt":
+            return self._decode_text(data, name)
+        
+        # Parsers without in-memory API (.doc): spill to a private temp dir
+        with tempfile.TemporaryDirectory(dir=temp_dir) as spill_dir:
+            spill_path = Path(spill_dir) / name
+            spill_path.write_bytes(data)
+            return self.extract_text(spill_path, Path(spill_dir))
@@ -2,11 +2,27 @@
 
 Uses Aspose.Words for robust .doc parsing without external dependencies (LibreOffice/Antiword).
 This is a pure Python solution (via pip) that works in the cloud.
+
+When aspose-words is missing or fails on a file, falls back to scanning the
+raw binary for text runs (UTF-16 LE text, 8-bit text blocks in cp1251 or
+latin-1, ASCII strings).
+With olefile installed, the document text is read exactly through the
+piece table of the WordDocument stream; if that fails, only the
+WordDocument stream is scanned, which skips the OLE container and images.
+Scanning is done with precompiled byte regexes, so the per-byte work runs in
+the C regex engine instead of a Python loop.
 """
 
 import logging
+import mmap
+import re
+import struct
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Union
+
+from app.services.file_processing.text_cleaner import TextCleaner
 
 # Try to import aspose.words, handle if missing
 try:
@@ -14,53 +30,211 @@ try:
 except ImportError:
     aw = None
 
+# Optional: read the WordDocument stream out of the OLE2 container
+try:
+    import olefile
+except ImportError:
+    olefile = None
+
 logger = logging.getLogger(__name__)
 
+# Minimum length of a plain ASCII string (like strings(1))
+ASCII_MIN_LENGTH = 4
+
+# Minimum length of a UTF-16 text run worth keeping
+UNICODE_MIN_LENGTH = 8
+
+# UTF-16 is decoded in windows of this many bytes (even, keeps alignment)
+UNICODE_WINDOW = 1 << 20
+
+# UTF-16 LE density check: UTF16_SAMPLE_COUNT slices of UTF16_SAMPLE_SIZE
+# bytes, and the share of odd bytes that must look like UTF-16 high bytes
+UTF16_SAMPLE_COUNT = 16
+UTF16_SAMPLE_SIZE = 256
+UTF16_MIN_HIGH_BYTE_RATIO = 0.1
+
+# A scan result is "good enough" to skip the remaining strategies when it has
+# this many characters and this share of letters in its first 2000 chars
+GOOD_ENOUGH_MIN_LENGTH = 500
+GOOD_ENOUGH_ALPHA_RATIO = 0.3
+
+# Files larger than this are scanned only at the head and tail (Word keeps
+# the text stream near the start; the end often holds the rest of it)
+MAX_SCAN_SIZE = 16 * 1024 * 1024
+SCAN_EDGE_SIZE = MAX_SCAN_SIZE // 2
+
+# Word-based strategies stop after this many kept words
+MAX_WORDS = 50_000
+
+# Bytes inspected to detect the real format of a ".doc" file
+SNIFF_SIZE = 4096
+
+# Magic numbers of formats that turn up with a .doc extension
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+ZIP_MAGIC = b"PK\x03\x04"
+PDF_MAGIC = b"%PDF-"
+
+# Word 97+ File Information Block (start of the WordDocument stream)
+FIB_FLAGS_OFFSET = 0x0A      # fEncrypted = 0x0100, fWhichTblStm = 0x0200
+FIB_CCP_TEXT_OFFSET = 0x4C   # characters in the main document
+FIB_CLX_OFFSET = 0x01A2      # fcClx, lcbClx: piece table in the table stream
+FIB_MIN_SIZE = 0x01AA
+FIB_ENCRYPTED = 0x0100
+FIB_TABLE_1 = 0x0200
+PIECE_COMPRESSED = 0x40000000  # piece stored as 8-bit cp1252, not UTF-16
+
+# Bytes of the file sampled to choose the 8-bit text encoding
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# Raw .doc content: bytes or a read-only mmap of the file
+Buffer = Union[bytes, mmap.mmap]
+
+# 8-bit text between null/control bytes: printable ASCII + upper half (cp125x)
+_PRINTABLE_RUN = re.compile(rb"[\x20-\x7e\x80-\xff]{3,}")
+
+# Plain printable ASCII runs
+_ASCII_RUN = re.compile(rb"[\x20-\x7e]{%d,}" % ASCII_MIN_LENGTH)
+
+# Readable UTF-16 text: Latin, Latin-1, Cyrillic, typographic punctuation, "№", Word
+# paragraph/line marks
+_UNICODE_RUN = re.compile(
+    r"[\x20-\x7e\xa0-\xff\u0400-\u04ff\u2010-\u2026\u2116\t\r\n\x0b]{%d,}" % UNICODE_MIN_LENGTH
+)
+
+# bytes.translate deletion sets: everything except cp1251 letters (0xC0-0xFF)
+# / everything except ASCII letters
+_NOT_HIGH_LETTER = bytes(range(0xC0))
+_NOT_ASCII_LETTER = bytes(b for b in range(256) if not (0x41 <= b <= 0x5A or 0x61 <= b <= 0x7A))
+
+# A letter in any script (word characters minus digits and underscore)
+_LETTER = re.compile(r"[^\W\d_]")
+
+# Word filter fused into one pattern: 2-100 chars, at least one letter,
+# not a single repeated character ("aaaa")
+_LIKELY_WORD = re.compile(r"(?=.{2,100}\Z)(?=.*?[^\W\d_])(?!(.)\1*\Z)", re.DOTALL)
+
+# str.translate table for UTF-16 runs: Word paragraph mark (\r) -> newline,
+# other control characters -> space
+_CTRL_TABLE = {code: " " for code in (*range(0x20), *range(0x7f, 0xa0))}
+_CTRL_TABLE[0x0a] = "\n"
+_CTRL_TABLE[0x0d] = "\n"
+
+# Word field: \x13 instruction [\x14 result] \x15; the instruction is dropped
+_FIELD_CODE = re.compile("\x13[^\x13\x14\x15]*[\x14\x15]")
+
+# Piece table text: Word line/page breaks -> newline, non-breaking hyphen ->
+# "-", optional hyphen and field end removed, other controls -> space
+_PIECE_TABLE = {**_CTRL_TABLE, 0x0b: "\n", 0x0c: "\n", 0x1e: "-", 0x1f: None, 0x15: None}
+
+
+@lru_cache(maxsize=65536)
+def _is_likely_word(text: str) -> bool:
+    """Check that an extracted run looks like text, not binary noise.
+
+    Args:
+        text: Candidate run
+
+    Returns:
+        bool: True if the run should be kept
+    """
+    return _LIKELY_WORD.match(text) is not None
+
 
 class DOCParser:
     """Specialized parser for old binary .doc format using Aspose.Words.
-    
+
     This solution:
     1. Does NOT require LibreOffice or Antiword
     2. Installs via pip (aspose-words)
     3. Works on Windows/Linux/macOS automatically
     4. Handles encodings (Russian CP1251) correctly
+
+    Without aspose-words, a built-in binary scanner is used instead.
     """
-    
+
     def __init__(self) -> None:
+        self.text_cleaner = TextCleaner()
         if aw is None:
-            logger.warning("⚠ aspose-words not installed. DOC parsing will fail.")
+            logger.warning("⚠ aspose-words not installed. Using built-in binary .doc scanner.")
             logger.warning("pip install aspose-words")
-    
+
     def extract_text(self, file_path: Path) -> str:
         """Extract text from .doc file using Aspose.Words.
-        
+
+        Falls back to the binary scanner if Aspose is unavailable or fails.
+
         Args:
             file_path: Path to .doc file
-            
+
         Returns:
             str: Extracted text
-            
+
         Raises:
             FileNotFoundError: If file doesn't exist
             ValueError: If extraction fails
         """
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-        
-        if aw is None:
-            raise ValueError("aspose-words library is missing. Run: pip install aspose-words")
-        
+        # One stat() for both the existence check and the empty-file check
+        try:
+            file_size = file_path.stat().st_size
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
+
+        if aw is not None:
+            try:
+                return self._extract_with_aspose(file_path)
+            except ValueError as e:
+                logger.warning(f"Aspose failed for {file_path.name}, using binary scanner: {e}")
+
+        logger.info(f"Extracting text from {file_path.name} using binary scanner...")
+        if not file_size:
+            raise ValueError(f"Empty .doc file: {file_path.name}")
+
+        # mmap instead of read(): the page cache backs the scan, so memory
+        # does not grow with file size
+        with open(file_path, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            kind = self._sniff(content[:SNIFF_SIZE])
+            if kind in ("zip", "pdf"):
+                raise ValueError(
+                    f"{file_path.name} is a {kind.upper()} file, not a binary .doc"
+                )
+            if kind == "text":
+                # Plain text saved as .doc: decode once, no binary strategies
+                text = self.text_cleaner.clean_extracted_text(
+                    str(self._bounded(content), "utf-8", "replace")
+                )
+            else:
+                text = self._extract_word_stream(file_path) if kind == "ole" else ""
+                if not text:
+                    text = self._extract_binary_text(content)
+        if not text:
+            raise ValueError(f"No text found in .doc file: {file_path.name}")
+
+        logger.info(f"✓ Binary extraction successful: {len(text)} chars")
+        return text
+
+    def _extract_with_aspose(self, file_path: Path) -> str:
+        """Extract text with Aspose.Words.
+
+        Args:
+            file_path: Path to .doc file
+
+        Returns:
+            str: Extracted text
+
+        Raises:
+            ValueError: If extraction fails
+        """
         logger.info(f"Extracting text from {file_path.name} using Aspose.Words...")
-        
+
         try:
             # Load document
             # Aspose automatically detects format and encoding
             doc = aw.Document(str(file_path))
-            
+
             # Extract text
             text = doc.get_text()
-            
+
             # Clean up evaluation watermark if present
             # Aspose adds: "Evaluation Only. Created with Aspose.Words..."
             if "Evaluation Only. Created with Aspose.Words." in text:
@@ -69,18 +243,363 @@ class DOCParser:
                 # Remove common header/footer evaluation artifacts
                 lines = text.splitlines()
                 cleaned_lines = [
-                    line for line in lines 
-                    if "Created with Aspose.Words" not in line 
+                    line for line in lines
+                    if "Created with Aspose.Words" not in line
                     and "Evaluation Only" not in line
                 ]
                 text = "\n".join(cleaned_lines)
-            
+
             if text and text.strip():
                 logger.info(f"✓ Aspose extraction successful: {len(text)} chars")
                 return text.strip()
             else:
                 raise ValueError("Extracted text is empty")
-                
+
         except Exception as e:
             logger.error(f"Aspose extraction error: {e}")
             raise ValueError(f"Failed to extract text from .doc: {e}")
+
+    @staticmethod
+    def _sniff(head: bytes) -> str:
+        """Detect the real format of a ".doc" file from its first bytes.
+
+        Args:
+            head: First SNIFF_SIZE bytes of the file
+
+        Returns:
+            str: "ole", "zip", "pdf", "text" or "unknown"
+        """
+        if head.startswith(OLE_MAGIC):
+            return "ole"
+        if head.startswith(ZIP_MAGIC):
+            return "zip"
+        if head.startswith(PDF_MAGIC):
+            return "pdf"
+        if b"\x00" not in head:
+            try:
+                # A multibyte char may be cut at the end of the sample
+                head.decode("utf-8")
+                return "text"
+            except UnicodeDecodeError as e:
+                if e.reason == "unexpected end of data":
+                    return "text"
+        return "unknown"
+
+    def _extract_word_stream(self, file_path: Path) -> str:
+        """Scan only the WordDocument stream of an OLE2 .doc file.
+
+        Args:
+            file_path: Path to .doc file
+
+        Returns:
+            str: Extracted text (empty if olefile is missing or the stream
+            cannot be read)
+        """
+        if olefile is None or not olefile.isOleFile(str(file_path)):
+            return ""
+        try:
+            with olefile.OleFileIO(str(file_path)) as ole:
+                if not ole.exists("WordDocument"):
+                    return ""
+                # olefile materializes the whole stream in memory: leave huge
+                # streams to the bounded mmap scan instead
+                if ole.get_size("WordDocument") > MAX_SCAN_SIZE:
+                    logger.warning(f"WordDocument stream of {file_path.name} too large, scanning file")
+                    return ""
+                content = ole.openstream("WordDocument").read()
+                text = self._read_piece_table(ole, content)
+        except Exception as e:
+            logger.warning(f"Cannot read WordDocument stream of {file_path.name}: {e}")
+            return ""
+        if text.strip():
+            logger.debug(f"Piece table: {len(text)} chars from {file_path.name}")
+            return self.text_cleaner.clean_extracted_text(text)
+        return self._extract_binary_text(content)
+
+    @staticmethod
+    def _read_piece_table(ole: "olefile.OleFileIO", word_stream: bytes) -> str:
+        """Read the main document text through the FIB piece table.
+
+        Word 97+ keeps text in pieces listed in the Clx of the table stream
+        ("0Table" or "1Table"); each piece is 8-bit cp1252 or UTF-16 LE.
+        This gives the exact text, without the scanners' guesswork.
+
+        Args:
+            ole: Open OLE container of the .doc
+            word_stream: Content of the WordDocument stream
+
+        Returns:
+            str: Document text with Word control marks converted ("" if the
+            file is encrypted, pre-97 or its piece table cannot be read)
+        """
+        if len(word_stream) < FIB_MIN_SIZE:
+            return ""
+        (flags,) = struct.unpack_from("<H", word_stream, FIB_FLAGS_OFFSET)
+        if flags & FIB_ENCRYPTED:
+            return ""
+        table_name = "1Table" if flags & FIB_TABLE_1 else "0Table"
+        if not ole.exists(table_name):
+            return ""
+        (ccp_text,) = struct.unpack_from("<i", word_stream, FIB_CCP_TEXT_OFFSET)
+        fc_clx, lcb_clx = struct.unpack_from("<II", word_stream, FIB_CLX_OFFSET)
+        clx = ole.openstream(table_name).read()[fc_clx:fc_clx + lcb_clx]
+        return DOCParser._decode_pieces(clx, word_stream, ccp_text)
+
+    @staticmethod
+    def _decode_pieces(clx: bytes, word_stream: bytes, ccp_text: int) -> str:
+        """Decode the first ccp_text characters described by a Clx.
+
+        Args:
+            clx: Clx structure (Prc entries, then the Pcdt piece table)
+            word_stream: Content of the WordDocument stream
+            ccp_text: Number of characters in the main document
+
+        Returns:
+            str: Document text with Word control marks converted
+        """
+        pos = 0
+        while pos < len(clx) and clx[pos] == 0x01:
+            # Prc (formatting modifiers): skip
+            (cb_grpprl,) = struct.unpack_from("<h", clx, pos + 1)
+            if cb_grpprl < 0:
+                # Malformed (the size is never negative): would loop or rewind
+                return ""
+            pos += 3 + cb_grpprl
+        if pos >= len(clx) or clx[pos] != 0x02:
+            return ""
+        (lcb,) = struct.unpack_from("<I", clx, pos + 1)
+        plc = clx[pos + 5:pos + 5 + lcb]
+        # PlcPcd: n + 1 character positions, then n 8-byte piece descriptors
+        count = (len(plc) - 4) // 12
+        cps = struct.unpack_from(f"<{count + 1}I", plc)
+        pcd_start = 4 * (count + 1)
+
+        parts = []
+        remaining = ccp_text
+        for i in range(count):
+            if remaining <= 0:
+                break
+            length = min(cps[i + 1] - cps[i], remaining)
+            if length <= 0:
+                # Character positions must increase: skip a broken piece
+                continue
+            (fc,) = struct.unpack_from("<I", plc, pcd_start + 8 * i + 2)
+            if fc & PIECE_COMPRESSED:
+                start = (fc & ~PIECE_COMPRESSED) // 2
+                parts.append(str(word_stream[start:start + length], "cp1252", "replace"))
+            else:
+                parts.append(str(word_stream[fc:fc + 2 * length], "utf-16-le", "replace"))
+            remaining -= length
+
+        text = "".join(parts)
+        # Innermost fields first: nested fields need several passes
+        n = 1
+        while n:
+            text, n = _FIELD_CODE.subn("", text)
+        # Cells end with \x07, a row with one more \x07; paragraphs with \r
+        text = text.replace("\x07\x07", "\n").replace("\x07", " | ")
+        return text.translate(_PIECE_TABLE)
+
+    def _extract_binary_text(self, content: Buffer, force_all: bool = False) -> str:
+        """Extract text from raw .doc bytes.
+
+        Runs the scanning strategies cheapest first (UTF-16, 8-bit blocks,
+        ASCII) and stops at the first result that is good enough; otherwise
+        keeps the longest result.
+
+        Args:
+            content: Raw file content
+            force_all: Run every strategy and keep the longest (debugging)
+
+        Returns:
+            str: Best extracted text (empty if nothing readable)
+        """
+        content = self._bounded(content)
+        strategies = (
+            self._extract_unicode_strings,
+            self._extract_null_blocks,
+            self._extract_ascii_strings,
+        )
+        if not force_all and not self._looks_like_utf16_le(content):
+            # No UTF-16 text anywhere in the samples: skip the full decode pass
+            logger.debug("Binary scan: no UTF-16 LE density, skipping unicode pass")
+            strategies = strategies[1:]
+        best = ""
+        for strategy in strategies:
+            text = strategy(content)
+            if len(text) > len(best):
+                best = text
+            if not force_all and self._is_good_enough(text):
+                logger.debug(f"Binary scan: {strategy.__name__} is good enough")
+                best = text
+                break
+        if not best:
+            return ""
+        return self.text_cleaner.clean_extracted_text(best)
+
+    @staticmethod
+    def _looks_like_utf16_le(content: Buffer) -> bool:
+        """Cheaply check whether content may hold UTF-16 LE text.
+
+        In UTF-16 LE, the high byte of Latin/punctuation is 0x00 and of
+        Cyrillic 0x04. Samples spread over the file (text need not start at
+        the beginning) are checked for those values at odd offsets.
+
+        Args:
+            content: Raw file content
+
+        Returns:
+            bool: False only if the samples show no UTF-16 LE high bytes
+        """
+        step = max(len(content) // UTF16_SAMPLE_COUNT, UTF16_SAMPLE_SIZE) & ~1
+        odd = b"".join(
+            content[offset + 1:offset + UTF16_SAMPLE_SIZE:2]
+            for offset in range(0, len(content), step)
+        )
+        if not odd:
+            return False
+        high_bytes = len(odd) - len(odd.translate(None, b"\x00\x04"))
+        return high_bytes / len(odd) >= UTF16_MIN_HIGH_BYTE_RATIO
+
+    @staticmethod
+    def _bounded(content: Buffer) -> Buffer:
+        """Limit huge content to its head and tail (MAX_SCAN_SIZE in total).
+
+        Args:
+            content: Raw file content
+
+        Returns:
+            Buffer: content itself, or head + tail joined by two null bytes
+            (keeps UTF-16 alignment and cannot glue two runs together)
+        """
+        if len(content) <= MAX_SCAN_SIZE:
+            return content
+        logger.warning(
+            f"Binary scan limited to first and last {SCAN_EDGE_SIZE // (1024 * 1024)} MB "
+            f"of {len(content) // (1024 * 1024)} MB"
+        )
+        return content[:SCAN_EDGE_SIZE] + b"\x00\x00" + content[-SCAN_EDGE_SIZE:]
+
+    @staticmethod
+    def _extract_unicode_strings(content: Buffer) -> str:
+        """Extract UTF-16 LE text (Word 97+ stores non-ANSI text this way).
+
+        Decodes UNICODE_WINDOW bytes at a time (zero-copy views); a run
+        touching the end of a window is carried over so it is not split in two.
+
+        Args:
+            content: Raw file content
+
+        Returns:
+            str: Readable UTF-16 runs, one per line
+        """
+        runs = []
+        tail = ""
+        # Windows are memoryview slices decoded straight from the mmap (no
+        # bytes copy); views are released on exit so the mmap can be closed
+        with memoryview(content) as view:
+            for offset in range(0, len(content), UNICODE_WINDOW):
+                with view[offset:offset + UNICODE_WINDOW] as window:
+                    decoded = tail + str(window, "utf-16-le", "ignore")
+                is_last = offset + UNICODE_WINDOW >= len(content)
+                last_end = 0
+                tail = ""
+                for match in _UNICODE_RUN.finditer(decoded):
+                    if match.end() == len(decoded) and not is_last:
+                        tail = match.group()
+                        break
+                    runs.append(match.group())
+                    last_end = match.end()
+                else:
+                    # Short readable fragment at the edge may start the next run
+                    tail = decoded[max(last_end, len(decoded) - UNICODE_MIN_LENGTH + 1):]
+        if not runs:
+            return ""
+        # One C-level translate pass, then split/join collapses space runs
+        text = "\n".join(runs).translate(_CTRL_TABLE)
+        return "\n".join(" ".join(line.split()) for line in text.split("\n")).strip()
+
+    def _extract_null_blocks(self, content: Buffer) -> str:
+        """Extract 8-bit text stored between null/control bytes.
+
+        Args:
+            content: Raw file content
+
+        Returns:
+            str: Unique likely words joined by spaces (at most MAX_WORDS)
+        """
+        encoding = self._guess_8bit_encoding(content)
+        words = self._unique_words(_PRINTABLE_RUN.finditer(content), encoding)
+        return " ".join(islice(words, MAX_WORDS))
+
+    def _extract_ascii_strings(self, content: Buffer) -> str:
+        """Extract plain ASCII strings (strings(1)-like pass).
+
+        Args:
+            content: Raw file content
+
+        Returns:
+            str: Unique likely strings, one per line (at most MAX_WORDS)
+        """
+        strings = self._unique_words(_ASCII_RUN.finditer(content), "ascii")
+        return "\n".join(islice(strings, MAX_WORDS))
+
+    @staticmethod
+    def _guess_8bit_encoding(content: Buffer) -> str:
+        """Pick cp1251 or latin-1 for 8-bit text runs without a detector.
+
+        Russian text in cp1251 is mostly bytes 0xC0-0xFF (А-я); Western
+        text is mostly ASCII letters with occasional accented ones.
+
+        Args:
+            content: Raw file content
+
+        Returns:
+            str: "cp1251" or "latin-1"
+        """
+        sample = b"".join(_PRINTABLE_RUN.findall(content[:ENCODING_SAMPLE_SIZE]))
+        # Deleting every other byte value counts the rest in C
+        high_letters = len(sample.translate(None, _NOT_HIGH_LETTER))
+        ascii_letters = len(sample.translate(None, _NOT_ASCII_LETTER))
+        return "cp1251" if high_letters > ascii_letters else "latin-1"
+
+    @staticmethod
+    def _unique_words(runs: Iterator[re.Match], encoding: str) -> Iterator[str]:
+        """Yield likely words from regex runs, first occurrence only.
+
+        OLE files repeat headers, footers and style names many times; only
+        the first copy is kept, in document order.
+
+        Args:
+            runs: Byte regex matches
+            encoding: Encoding of the matched bytes
+
+        Yields:
+            str: Likely words not seen before
+        """
+        seen = set()
+        for run in runs:
+            word = run.group().decode(encoding, "replace").strip()
+            if word in seen or not _is_likely_word(word):
+                continue
+            seen.add(word)
+            yield word
+
+    @staticmethod
+    def _is_good_enough(text: str) -> bool:
+        """Check if a scan result is good enough to skip the other strategies.
+
+        Args:
+            text: Scan result
+
+        Returns:
+            bool: True if the text is long and mostly letters
+        """
+        if len(text.strip()) <= GOOD_ENOUGH_MIN_LENGTH:
+            return False
+        sample = text[:2000]
+        letters = len(_LETTER.findall(sample))
+        return letters / len(sample) > GOOD_ENOUGH_ALPHA_RATIO
+
+    # Module-level and cached: junk fragments recur across strategies
+    _is_likely_word = staticmethod(_is_likely_word)
@@ -2,21 +2,78 @@
 
 Handles extraction of text from Microsoft Word .docx files.
 For old .doc files, delegates to DOCParser.
+
+Text is streamed straight from word/document.xml with iterparse; the
+python-docx object model is only used as a fallback (and for metadata).
 """
 
+import html
+import io
 import logging
+import os
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO, Union
 
 from app.services.file_processing.text_cleaner import TextCleaner
-from app.services.file_processing.doc_parser import DOCParser
-
-try:
-    from docx import Document
-except ImportError:
-    Document = None
+from app.services.file_processing.doc_parser import DOCParser, OLE_MAGIC
 
 logger = logging.getLogger(__name__)
 
+# Parsed documents kept for repeated extract_text/get_metadata calls
+DOCUMENT_CACHE_SIZE = 8
+
+# Clark names ("{namespace}local") of the WordprocessingML elements the
+# streaming parser reacts to, for both transitional and strict OOXML
+_WORD_NAMESPACES = (
+    "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
+    "http://purl.oclc.org/ooxml/wordprocessingml/main",
+)
+_WORD_TAGS = {
+    f"{{{namespace}}}{local}": local
+    for namespace in _WORD_NAMESPACES
+    for local in ("t", "r", "tab", "br", "cr", "p", "tr")
+}
+
+# Tag stripping for document.xml that no XML parser accepts
+SALVAGE_CHUNK_SIZE = 1024 * 1024  # chars of XML stripped per step
+_TAG_RE = re.compile(r"<[^>]+>")
+# One pass collapses both: a newline run (with its spaces) or a space run
+_WHITESPACE_RE = re.compile(r"[ \t\r]*\n[\s]*|[ \t\r]+")
+
+
+def _collapse_whitespace(match: re.Match) -> str:
+    return "\n" if "\n" in match.group(0) else " "
+
+
+@lru_cache(maxsize=None)
+def _docx_document():
+    """python-docx's Document class, imported on first use (None if missing).
+    
+    Only the fallback and metadata paths need python-docx; importing it
+    (with lxml) at module load would cost every process ~80 ms.
+    """
+    try:
+        from docx import Document
+    except ImportError:
+        return None
+    return Document
+
+
+@lru_cache(maxsize=DOCUMENT_CACHE_SIZE)
+def _load_document(path: str, mtime_ns: int, size: int):
+    """Parse a .docx once per (path, mtime, size); a changed file is re-parsed."""
+    return _docx_document()(path)
+
+
+def _load_cached(file_path: Path):
+    """Load a .docx from disk through the parsed-document cache."""
+    stat = file_path.stat()
+    return _load_document(str(file_path), stat.st_mtime_ns, stat.st_size)
+
 
 class DOCXParser:
     """Парсер для .docx файлов.
@@ -41,25 +98,204 @@ class DOCXParser:
             FileNotFoundError: If file doesn't exist
             ValueError: If file is not a valid DOCX
         """
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        # One open() for the existence check, the size log and the sniff
+        try:
+            with open(file_path, "rb") as f:
+                file_size = os.fstat(f.fileno()).st_size
+                head = f.read(len(OLE_MAGIC))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
         
-        suffix = file_path.suffix.lower()
+        # Route on the real format: .doc/.docx are often misnamed
+        kind = DOCParser._sniff(head)
+        if kind == "pdf":
+            raise ValueError(f"{file_path.name} is a PDF file, not a Word document")
         
-        # For .doc files, use existing DOCParser
-        if suffix == '.doc':
+        # OLE2 (old binary Word) and non-ZIP .doc files go to DOCParser
+        if kind == "ole" or (kind != "zip" and file_path.suffix.lower() == '.doc'):
             logger.info(f"Delegating .doc file to DOCParser: {file_path.name}")
             return self.doc_parser.extract_text(file_path)
         
-        # For .docx files, use python-docx
-        logger.info(f"Starting extraction from {file_path.name} ({file_path.stat().st_size} bytes)")
+        # ZIP content (.docx, or a .doc saved as OOXML)
+        logger.info(f"Starting extraction from {file_path.name} ({file_size} bytes)")
+        return self._extract_docx(file_path, file_path.name)
+    
+    def extract_text_from_stream(self, stream: BinaryIO, name: str) -> str:
+        """Extract text from in-memory .docx (e.g. ZIP archive member).
+        
+        Args:
+            stream: Binary file-like object with DOCX content
+            name: File name for logging
+            
+        Returns:
+            str: Extracted text
+            
+        Raises:
+            ValueError: If content is not a valid DOCX
+        """
+        return self._extract_docx(stream, name)
+    
+    def _extract_docx(self, source: Union[Path, BinaryIO], name: str) -> str:
+        """Extract text from path or stream: XML stream first, python-docx fallback.
+        
+        A source that is not a ZIP at all fails right away; python-docx is
+        only tried when the archive opened but its document.xml did not
+        (missing under the usual name, or malformed).
+        """
+        try:
+            return self._extract_docx_xml(source, name)
+        except zipfile.BadZipFile as e:
+            # python-docx opens the same ZIP: it would only fail again
+            logger.error(f"Error extracting text from {name}: not a ZIP-based DOCX ({e})")
+            raise ValueError(f"Cannot extract text from {name}") from e
+        except (KeyError, ET.ParseError) as e:
+            xml_error = e
+            logger.warning(f"Streaming DOCX parse failed for {name} ({e}), trying python-docx")
         
+        if not isinstance(source, Path):
+            source.seek(0)
+        try:
+            return self._extract_docx_python_docx(source, name)
+        except ValueError:
+            if not isinstance(xml_error, ET.ParseError):
+                raise
+        
+        # Malformed document.xml: salvage the text between the tags
+        if not isinstance(source, Path):
+            source.seek(0)
+        with zipfile.ZipFile(source) as zf, zf.open("word/document.xml") as raw:
+            reader = io.TextIOWrapper(raw, encoding="utf-8", errors="replace")
+            result = self._extract_plain_text_from_corrupted_stream(reader)
+        if not result:
+            raise ValueError(f"Cannot extract text from {name}")
+        logger.info(f"✓ Recovered {len(result)} chars from corrupted XML in {name}")
+        return result
+    
+    @staticmethod
+    def _extract_plain_text_from_corrupted_xml(xml_content: str) -> str:
+        """Strip tags from XML that cannot be parsed, keeping the text.
+        
+        Args:
+            xml_content: Raw (possibly truncated or malformed) XML
+            
+        Returns:
+            str: Text with tags removed and whitespace collapsed
+        """
+        text = _TAG_RE.sub(" ", xml_content)
+        text = _WHITESPACE_RE.sub(_collapse_whitespace, text)
+        return html.unescape(text).strip()
+    
+    @staticmethod
+    def _extract_plain_text_from_corrupted_stream(reader: io.TextIOBase) -> str:
+        """Same as _extract_plain_text_from_corrupted_xml, read in chunks.
+        
+        Only the stripped text is kept in memory, not the whole XML; a tag
+        cut at a chunk boundary is carried over to the next chunk.
+        
+        Args:
+            reader: Text stream of the malformed XML
+            
+        Returns:
+            str: Text with tags removed and whitespace collapsed
+        """
+        parts = []
+        tail = ""
+        while chunk := reader.read(SALVAGE_CHUNK_SIZE):
+            chunk = tail + chunk
+            # A "<" after the last ">" opens a tag not closed in this chunk
+            cut = chunk.find("<", chunk.rfind(">") + 1)
+            if cut != -1:
+                chunk, tail = chunk[:cut], chunk[cut:]
+            else:
+                tail = ""
+            parts.append(_TAG_RE.sub(" ", chunk))
+        parts.append(tail)
+        text = _WHITESPACE_RE.sub(_collapse_whitespace, "".join(parts))
+        return html.unescape(text).strip()
+    
+    @staticmethod
+    def _extract_docx_xml(source: Union[Path, BinaryIO], name: str) -> str:
+        """Stream text out of word/document.xml without building an object model.
+        
+        Paragraphs are emitted in document order; table rows become
+        "cell | cell" lines like in the python-docx path.
+        
+        Args:
+            source: Path or binary stream of the .docx
+            name: File name for logging
+            
+        Returns:
+            str: Extracted text ("" for a document without text)
+            
+        Raises:
+            zipfile.BadZipFile: If source is not a ZIP
+            KeyError: If word/document.xml is missing
+            ET.ParseError: If the XML is malformed
+        """
+        lines = []
+        rows = []  # open table rows (nested tables push more)
+        buf = []   # text of the current paragraph
+        in_run = 0
+        paragraph_count = row_count = 0
+        
+        with zipfile.ZipFile(source) as zf, zf.open("word/document.xml") as f:
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                # One dict lookup per element; anything else is skipped
+                tag = _WORD_TAGS.get(elem.tag)
+                if tag is None:
+                    continue
+                if event == "start":
+                    if tag == "r":
+                        in_run += 1
+                    elif tag == "tr":
+                        rows.append([])
+                    continue
+                
+                if tag == "t":
+                    buf.append(elem.text or "")
+                elif tag == "r":
+                    in_run -= 1
+                elif in_run and tag == "tab":
+                    # Only run-level tabs/breaks; w:tab also defines tab stops in pPr
+                    buf.append("\t")
+                elif in_run and tag in ("br", "cr"):
+                    buf.append("\n")
+                elif tag == "p":
+                    text = "".join(buf)
+                    buf.clear()
+                    # isspace() checks without building a stripped copy
+                    if text and not text.isspace():
+                        if rows:
+                            rows[-1].append(text)
+                        else:
+                            lines.append(text.strip())
+                            paragraph_count += 1
+                    elem.clear()
+                elif tag == "tr":
+                    row = rows.pop()
+                    if row:
+                        lines.append(" | ".join(row))
+                        row_count += 1
+                    elem.clear()
+        
+        # Every collected line has text: no need to strip the whole result
+        result = "\n".join(lines)
+        if lines:
+            logger.info(f"✓ Successfully extracted {len(result)} chars from {name} "
+                      f"({paragraph_count} paragraphs, {row_count} table rows)")
+        else:
+            logger.warning(f"No text found in {name}")
+        return result
+    
+    def _extract_docx_python_docx(self, source: Union[Path, BinaryIO], name: str) -> str:
+        """Extract paragraphs and tables with python-docx from path or stream."""
+        Document = _docx_document()
         if Document is None:
             raise ValueError("python-docx not installed")
         
         try:
-            logger.info(f"Using python-docx for {file_path.name}")
-            doc = Document(file_path)
+            logger.info(f"Using python-docx for {name}")
+            doc = _load_cached(source) if isinstance(source, Path) else Document(source)
             extracted_text = []
             
             # Extract paragraphs
@@ -74,26 +310,29 @@ class DOCXParser:
             table_count = 0
             for table in doc.tables:
                 for row in table.rows:
-                    row_text = []
-                    for cell in row.cells:
-                        for para in cell.paragraphs:
-                            if para.text.strip():
-                                row_text.append(para.text)
+                    # paragraph.text rebuilds the string from runs on every
+                    # access: read it once per paragraph
+                    row_text = [
+                        text
+                        for cell in row.cells
+                        for text in (para.text for para in cell.paragraphs)
+                        if text and not text.isspace()
+                    ]
                     if row_text:
                         extracted_text.append(" | ".join(row_text))
                         table_count += 1
             
             result = "\n".join(extracted_text)
-            if result.strip():
-                logger.info(f"✓ Successfully extracted {len(result)} chars from {file_path.name} "
+            if extracted_text:
+                logger.info(f"✓ Successfully extracted {len(result)} chars from {name} "
                           f"({paragraph_count} paragraphs, {table_count} tables)")
                 return result
             else:
-                raise ValueError(f"No text extracted from {file_path.name}")
+                raise ValueError(f"No text extracted from {name}")
         
         except Exception as e:
-            logger.error(f"Error extracting text from {file_path.name}: {type(e).__name__}: {str(e)[:100]}")
-            raise ValueError(f"Cannot extract text from {file_path.name}") from e
+            logger.error(f"Error extracting text from {name}: {type(e).__name__}: {str(e)[:100]}")
+            raise ValueError(f"Cannot extract text from {name}") from e
     
     def get_metadata(self, file_path: Path) -> dict:  # type: ignore
         """Extract DOCX metadata.
@@ -104,11 +343,11 @@ class DOCXParser:
         Returns:
             dict: Document metadata
         """
-        if file_path.suffix.lower() != '.docx':
+        if _docx_document() is None or file_path.suffix.lower() != '.docx':
             return {}
         
         try:
-            doc = Document(file_path)
+            doc = _load_cached(file_path)
             props = doc.core_properties
             return {
                 "title": props.title,
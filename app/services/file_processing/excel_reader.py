@@ -12,11 +12,12 @@ NO external dependencies:
 REQUIREMENTS for .xls conversion:
 - Windows + MS Excel: PowerShell COM (built-in)
 - Any OS: LibreOffice installed with soffice in PATH
+- Optional: a persistent LibreOffice listener driven by unoserver
+  (UNOSERVER_ADDRESS=host:port), which avoids soffice startup per file
 """
 
 import os
 import re
-import shutil
 import subprocess
 import tempfile
 import zipfile
@@ -40,6 +41,10 @@ _XL_NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
 _XL_NS_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
 _NS = {"main": _XL_NS_MAIN, "rel": _XL_NS_REL}
 
+# Address ("host:port") of a running unoserver; empty disables it.
+# Start once with: unoserver --interface 127.0.0.1 --port 2003
+_UNOSERVER_ADDRESS = os.environ.get("UNOSERVER_ADDRESS", "")
+
 # Cache for column letter conversions
 _COL_CACHE = {}
 
@@ -303,6 +308,15 @@ def read_xlsx(path: str):
         raise
 
 
+def _decode_output(output: bytes) -> str:
+    """Decode converter stderr for logging.
+    
+    Output is captured as bytes: text=True decodes with the locale encoding
+    and raises on bytes it cannot map (e.g. Cyrillic console output).
+    """
+    return output.decode("utf-8", errors="replace").strip()
+
+
 def _convert_xls_via_excel_com(xls_path: str, out_xlsx_path: str):
     """Convert .xls to .xlsx using Excel COM (Windows only)."""
     logger.info(f"[_convert_xls_via_excel_com] Attempting conversion via Excel COM")
@@ -326,12 +340,12 @@ try {{
     try:
         result = subprocess.run(
             ["powershell", "-NoProfile", "-NonInteractive", "-Command", ps],
+            stdin=subprocess.DEVNULL,
             capture_output=True,
-            text=True,
             timeout=120
         )
         if result.returncode != 0:
-            error_msg = result.stderr.strip()
+            error_msg = _decode_output(result.stderr)
             logger.error(f"[_convert_xls_via_excel_com] PowerShell failed (code {result.returncode}): {error_msg}")
             raise RuntimeError(f"PowerShell Excel COM failed: {error_msg}")
         logger.info("[_convert_xls_via_excel_com] Conversion successful")
@@ -351,12 +365,12 @@ def _convert_xls_via_libreoffice(xls_path: str, out_dir: str):
     try:
         result = subprocess.run(
             ["soffice", "--headless", "--convert-to", "xlsx", "--outdir", out_dir, xls_path],
+            stdin=subprocess.DEVNULL,
             capture_output=True,
-            text=True,
             timeout=120
         )
         if result.returncode != 0:
-            error_msg = result.stderr.strip()
+            error_msg = _decode_output(result.stderr)
             logger.error(f"[_convert_xls_via_libreoffice] soffice failed (code {result.returncode}): {error_msg}")
             raise RuntimeError(f"LibreOffice conversion failed: {error_msg}")
         logger.info("[_convert_xls_via_libreoffice] Conversion successful")
@@ -368,19 +382,47 @@ def _convert_xls_via_libreoffice(xls_path: str, out_dir: str):
         raise RuntimeError("LibreOffice conversion timeout")
 
 
-def convert_xls_to_xlsx(xls_path: str) -> str:
+def _convert_xls_via_unoserver(xls_path: str, out_xlsx_path: str):
+    """Convert .xls to .xlsx through a running unoserver (persistent soffice).
+    
+    unoconvert is a thin client: the LibreOffice process stays up between
+    calls, so each conversion skips the multi-second soffice startup.
+    """
+    logger.info(f"[_convert_xls_via_unoserver] Attempting conversion via unoserver at {_UNOSERVER_ADDRESS}")
+    host, _, port = _UNOSERVER_ADDRESS.rpartition(":")
+    try:
+        result = subprocess.run(
+            ["unoconvert", "--host", host or "127.0.0.1", "--port", port,
+             "--convert-to", "xlsx", xls_path, out_xlsx_path],
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            timeout=120
+        )
+        if result.returncode != 0:
+            error_msg = _decode_output(result.stderr)
+            logger.error(f"[_convert_xls_via_unoserver] unoconvert failed (code {result.returncode}): {error_msg}")
+            raise RuntimeError(f"unoserver conversion failed: {error_msg}")
+        logger.info("[_convert_xls_via_unoserver] Conversion successful")
+    except FileNotFoundError:
+        logger.warning("[_convert_xls_via_unoserver] unoconvert not found in PATH")
+        raise RuntimeError("unoconvert not available")
+    except subprocess.TimeoutExpired:
+        logger.error("[_convert_xls_via_unoserver] Conversion timed out (120s)")
+        raise RuntimeError("unoserver conversion timeout")
+
+
+def convert_xls_to_xlsx(xls_path: str, tmp_dir: str) -> str:
     """Convert .xls to .xlsx.
     
-    Tries Excel COM first (Windows+Excel), then LibreOffice (any platform).
-    Returns path to converted .xlsx file.
+    Tries Excel COM first (Windows+Excel), then a running unoserver (if
+    UNOSERVER_ADDRESS is set), then a one-off LibreOffice (any platform).
+    Returns path to converted .xlsx file inside tmp_dir.
     
-    IMPORTANT: Caller is responsible for cleanup of temp directory.
+    The caller owns tmp_dir (use tempfile.TemporaryDirectory for cleanup).
     
     Raises RuntimeError if neither available.
     """
     logger.info(f"[convert_xls_to_xlsx] Converting .xls to .xlsx: {Path(xls_path).name}")
-    tmp_dir = tempfile.mkdtemp(prefix="xls2xlsx_")
-    logger.debug(f"[convert_xls_to_xlsx] Created temp directory: {tmp_dir}")
     out_path = os.path.join(tmp_dir, Path(xls_path).stem + ".xlsx")
     
     # Try Excel COM first
@@ -394,6 +436,18 @@ def convert_xls_to_xlsx(xls_path: str) -> str:
     except Exception as e:
         logger.debug(f"[convert_xls_to_xlsx] Excel COM failed: {e}")
     
+    # Try persistent LibreOffice (unoserver), if configured
+    if _UNOSERVER_ADDRESS:
+        try:
+            _convert_xls_via_unoserver(xls_path, out_path)
+            if os.path.exists(out_path) and os.path.getsize(out_path) > 0:
+                logger.info(f"[convert_xls_to_xlsx] Conversion successful: {out_path}")
+                return out_path
+            else:
+                logger.warning(f"[convert_xls_to_xlsx] unoserver output file not created or empty: {out_path}")
+        except Exception as e:
+            logger.debug(f"[convert_xls_to_xlsx] unoserver failed: {e}")
+    
     # Try LibreOffice
     try:
         _convert_xls_via_libreoffice(xls_path, tmp_dir)
@@ -406,13 +460,7 @@ def convert_xls_to_xlsx(xls_path: str) -> str:
     except Exception as e:
         logger.debug(f"[convert_xls_to_xlsx] LibreOffice failed: {e}")
     
-    # Both failed - cleanup and raise
-    try:
-        shutil.rmtree(tmp_dir, ignore_errors=True)
-        logger.debug(f"[convert_xls_to_xlsx] Cleaned up temp directory: {tmp_dir}")
-    except Exception as e:
-        logger.warning(f"[convert_xls_to_xlsx] Could not cleanup temp dir {tmp_dir}: {e}")
-    
+    # All failed - raise (tmp_dir is cleaned up by the caller)
     error_msg = (
         "Cannot convert .xls to .xlsx.\n"
         "Options:\n"
@@ -446,22 +494,18 @@ def extract_spreadsheet(path: str):
     
     if ext == ".xls":
         logger.info(f"[extract_spreadsheet] Processing .xls file: {Path(path).name}")
-        xlsx_path = convert_xls_to_xlsx(path)
-        tmp_dir = Path(xlsx_path).parent
-        
-        try:
-            result = read_xlsx(xlsx_path)
-            logger.info(f"[extract_spreadsheet] Successfully extracted {len(result)} sheets from converted XLS")
-            return result
-        except Exception as e:
-            logger.error(f"[extract_spreadsheet] Failed to read converted XLSX: {e}", exc_info=True)
-            raise
-        finally:
-            # Clean up temp directory after successful or failed conversion
+        # Private temp dir per conversion (no clashes between same-named
+        # files), removed on exit whether conversion/reading succeeds or not.
+        # Cleanup errors are ignored: on Windows Excel/openpyxl may still hold
+        # the .xlsx open, which must not fail a successful conversion
+        with tempfile.TemporaryDirectory(prefix="xls2xlsx_", ignore_cleanup_errors=True) as tmp_dir:
+            xlsx_path = convert_xls_to_xlsx(path, tmp_dir)
             try:
-                shutil.rmtree(str(tmp_dir), ignore_errors=True)
-                logger.debug(f"[extract_spreadsheet] Cleaned up temp directory: {tmp_dir}")
+                result = read_xlsx(xlsx_path)
+                logger.info(f"[extract_spreadsheet] Successfully extracted {len(result)} sheets from converted XLS")
+                return result
             except Exception as e:
-                logger.warning(f"[extract_spreadsheet] Could not cleanup temp dir {tmp_dir}: {e}")
+                logger.error(f"[extract_spreadsheet] Failed to read converted XLSX: {e}", exc_info=True)
+                raise
     
     raise ValueError(f"Unsupported file format: {ext}. Expected .xls or .xlsx")
@@ -11,12 +11,51 @@ Fixes 2025-12-21 00:45:
 - Preserve actual content words
 """
 
+import codecs
 import logging
 import re
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Encoding detector, fastest available: cchardet (C) > charset-normalizer > chardet.
+# All three expose detect(bytes) -> {"encoding": ..., "confidence": ...}
+try:
+    import cchardet as charset_detector
+except ImportError:
+    try:
+        import charset_normalizer as charset_detector
+    except ImportError:
+        try:
+            import chardet as charset_detector
+        except ImportError:
+            charset_detector = None
+
+# Byte order marks, checked before running any detector
+_BOMS = (
+    (b"\xef\xbb\xbf", "utf-8-sig"),
+    (b"\xff\xfe", "utf-16"),
+    (b"\xfe\xff", "utf-16"),
+)
+
+# Encoding detection looks at growing samples, stopping once confident
+DETECT_SAMPLE_SIZES = (4096, 32768, 100_000)
+DETECT_MIN_CONFIDENCE = 0.7
+
+# Runs of blank lines, compiled once (run twice per clean_extracted_text call)
+_BLANK_LINES_RE = re.compile(r'\n\n+')
+
+# str.translate table deleting control characters (keeps tab, newline, CR)
+_CONTROL_CHARS_TABLE = dict.fromkeys(
+    [code for code in range(32) if code not in (9, 10, 13)] + list(range(127, 160))
+)
+
+# Characters outside the BMP (likely corruption)
+_NON_BMP_RE = re.compile('[\U00010000-\U0010FFFF]')
+
+# A letter in any script (word characters minus digits and underscore)
+_LETTER_RE = re.compile(r'[^\W\d_]')
+
 
 class TextCleaner:
     """Clean and normalize extracted text from documents.
@@ -96,23 +135,9 @@ class TextCleaner:
         - Control characters (00-1F, 7F-9F)
         - Invalid UTF-8 sequences
         """
-        result = []
-        for char in text:
-            code = ord(char)
-            
-            # Control characters
-            if code < 32 and code not in (9, 10, 13):  # Keep tab, newline, CR
-                continue
-            # DEL and control chars
-            if 127 <= code < 160:
-                continue
-            # Very high Unicode (likely corruption)
-            if code > 65535:
-                continue
-            
-            result.append(char)
-        
-        return ''.join(result)
+        # One C-level table pass instead of a per-character Python loop
+        text = text.translate(_CONTROL_CHARS_TABLE)
+        return _NON_BMP_RE.sub('', text)
     
     @staticmethod
     def _decode_escaped_chars(text: str) -> str:
@@ -141,19 +166,12 @@ class TextCleaner:
         - Multiple newlines → max 2 newlines (paragraph break)
         - Spaces around newlines → removed
         """
-        # Multiple spaces → single space
-        text = re.sub(r' +', ' ', text)
+        # Per line: collapse space runs and drop spaces around newlines
+        # (split/join in C instead of three regex passes)
+        lines = (' '.join(filter(None, line.split(' '))) for line in text.split('\n'))
         
         # Multiple newlines → max 2 (paragraph break)
-        text = re.sub(r'\n\n+', '\n\n', text)
-        
-        # Space before newline → remove
-        text = re.sub(r' +\n', '\n', text)
-        
-        # Newline then spaces → newline only
-        text = re.sub(r'\n +', '\n', text)
-        
-        return text
+        return _BLANK_LINES_RE.sub('\n\n', '\n'.join(lines))
     
     @staticmethod
     def _remove_garbage_lines(text: str) -> str:
@@ -169,27 +187,30 @@ class TextCleaner:
         clean_lines = []
         
         for line in lines:
+            stripped = line.strip()
+            
             # Keep empty lines (paragraph breaks)
-            if not line.strip():
+            if not stripped:
                 clean_lines.append('')
                 continue
             
             # Too short
-            if len(line.strip()) < TextCleaner.MIN_LINE_LENGTH:
+            if len(stripped) < TextCleaner.MIN_LINE_LENGTH:
+                continue
+            
+            # If all same character (like "========"): one string compare,
+            # checked before the more expensive letter count
+            if stripped == stripped[0] * len(stripped):
                 continue
             
             # Count letters vs non-letters
-            letters = sum(1 for c in line if c.isalpha())
+            letters = len(_LETTER_RE.findall(line))
             non_letters = len(line) - letters
             
             # If 80%+ non-letters, likely garbage
             if letters > 0 and non_letters / len(line) > 0.8:
                 continue
             
-            # If all same character (like "========")
-            if len(set(line.strip())) <= 1:
-                continue
-            
             clean_lines.append(line)
         
         return '\n'.join(clean_lines)
@@ -233,6 +254,63 @@ class TextCleaner:
         
         return '\n'.join(clean_lines)
     
+    @staticmethod
+    def detect_bom(data: bytes) -> Optional[str]:
+        """Return the encoding named by a byte order mark, if any.
+        
+        Args:
+            data: Raw text bytes
+            
+        Returns:
+            Optional[str]: "utf-8-sig" or "utf-16" (BOM-aware codecs), or None
+        """
+        for bom, encoding in _BOMS:
+            if data[:len(bom)] == bom:
+                return encoding
+        return None
+    
+    @staticmethod
+    def detect_encoding(data: bytes) -> Optional[str]:
+        """Detect the encoding of raw text bytes.
+        
+        A byte order mark answers directly. Otherwise starts with a small
+        sample and only feeds the detector a larger one while confidence
+        stays below DETECT_MIN_CONFIDENCE.
+        
+        Args:
+            data: Raw text bytes
+            
+        Returns:
+            Optional[str]: Canonical codec name of the most likely encoding
+                (e.g. "cp1251"), or None if unknown
+        """
+        bom_encoding = TextCleaner.detect_bom(data)
+        if bom_encoding:
+            return bom_encoding
+        if charset_detector is None or not data:
+            return None
+        
+        best_encoding, best_confidence = None, 0.0
+        for size in DETECT_SAMPLE_SIZES:
+            result = charset_detector.detect(bytes(data[:size]))
+            encoding = result.get("encoding")
+            confidence = result.get("confidence") or 0.0
+            if encoding and confidence >= best_confidence:
+                best_encoding, best_confidence = encoding, confidence
+            if best_confidence >= DETECT_MIN_CONFIDENCE or size >= len(data):
+                break
+        
+        logger.debug(f"Detected encoding: {best_encoding} (confidence {best_confidence:.2f})")
+        if best_encoding is None:
+            return None
+        # Detectors disagree on labels ("Windows-1251", "CP1251", "ISO-8859-1"):
+        # return Python's canonical codec name so callers can compare them
+        try:
+            return codecs.lookup(best_encoding).name
+        except LookupError:
+            logger.warning(f"Unknown encoding from detector: {best_encoding}")
+            return None
+    
     @classmethod
     def is_text_usable(cls, text: str, min_length: int = 50) -> bool:
         """Check if extracted text is usable quality.
@@ -271,11 +349,12 @@ class TextCleaner:
         Returns:
             str: Preview snippet
         """
-        lines = text.split('\n')
-        preview_lines = [l for l in lines[:max_lines] if l.strip()]
-        preview = '\n'.join(preview_lines[:max_lines])
+        # Split off only the head; the rest is counted, not copied
+        head = text.split('\n', max_lines)[:max_lines]
+        preview = '\n'.join(l for l in head if l.strip())
         
-        if len(lines) > max_lines:
-            preview += f"\n... ({len(lines) - max_lines} more lines)"
+        line_count = text.count('\n') + 1
+        if line_count > max_lines:
+            preview += f"\n... ({line_count - max_lines} more lines)"
         
         return preview
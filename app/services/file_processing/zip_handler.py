@@ -5,9 +5,10 @@ malicious archives (zip bombs, path traversal attacks).
 """
 
 import logging
+import posixpath
 import zipfile
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -169,6 +170,42 @@ class ZIPHandler:
         
         return extracted_files
     
+    def iter_supported_files(self, file_path: Path) -> Iterator[Tuple[str, bytes]]:
+        """Stream supported files from ZIP archive without writing to disk.
+        
+        Applies the same validation and filtering as extract_supported_files(),
+        but yields each member's content in memory one at a time.
+        
+        Args:
+            file_path: Path to ZIP file
+            
+        Yields:
+            Tuple[str, bytes]: Member base name and its content
+            
+        Raises:
+            ZipBombError: If malicious archive is detected
+            ValueError: If archive is corrupted
+        """
+        self.validate_archive(file_path)
+        
+        try:
+            with zipfile.ZipFile(file_path, 'r') as zf:
+                for info in zf.infolist():
+                    if info.is_dir():
+                        continue
+                    
+                    # Plain string ops: no PurePath parsing per member
+                    name = posixpath.basename(info.filename)
+                    if posixpath.splitext(name)[1].lower() not in SUPPORTED_FORMATS:
+                        logger.debug(f"Skipping unsupported format: {info.filename}")
+                        continue
+                    
+                    yield name, zf.read(info)
+        
+        except zipfile.BadZipFile as e:
+            logger.error(f"Invalid ZIP file: {file_path.name}")
+            raise ValueError(f"Invalid ZIP file: {e}") from e
+    
     def list_files(
         self,
         file_path: Path,
@@ -21,12 +21,13 @@ import logging
 from typing import Union, Optional, AsyncIterator
 
 try:
-    from app.services.llm.openai_client import OpenAIClient
+    from app.services.llm.openai_client import OpenAIClient, close_shared_http_client
     OPENAI_AVAILABLE = True
 except ImportError as e:
     logger_import = logging.getLogger(__name__)
     logger_import.warning(f"OpenAI client not available: {e}. Will use Replicate fallback.")
     OpenAIClient = None
+    close_shared_http_client = None
     OPENAI_AVAILABLE = False
 
 from app.services.llm.replicate_client import ReplicateClient
@@ -395,6 +396,15 @@ class LLMFactory:
         self.primary_provider = provider
         logger.info(f"Primary provider changed to {provider}")
     
+    @staticmethod
+    async def close_http_clients() -> None:
+        """Close HTTP connection pools shared by LLM clients.
+        
+        Call once on bot shutdown.
+        """
+        if close_shared_http_client is not None:
+            await close_shared_http_client()
+    
     def get_available_providers(self) -> list[str]:
         """Get list of available providers.
         
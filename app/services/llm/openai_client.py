@@ -7,10 +7,45 @@ Includes prompt management and response handling.
 import logging
 from typing import Optional, List, Dict, Any
 
+import httpx
 from openai import AsyncOpenAI, APIError, RateLimitError
 
 logger = logging.getLogger(__name__)
 
+# One keep-alive connection pool shared by every OpenAIClient in the process
+# (each handler module owns its own LLMFactory, so without this every module
+# would open its own TCP+TLS connections to the API).
+_shared_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """Get or create the process-wide HTTP client for OpenAI calls.
+    
+    Returns:
+        httpx.AsyncClient: Shared client with keep-alive connection pool
+    """
+    global _shared_http_client
+    if _shared_http_client is None or _shared_http_client.is_closed:
+        _shared_http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=32,
+                keepalive_expiry=60,
+            ),
+            timeout=httpx.Timeout(300, connect=10),
+        )
+        logger.info("Shared OpenAI HTTP client created")
+    return _shared_http_client
+
+
+async def close_shared_http_client() -> None:
+    """Close the shared HTTP client (call on bot shutdown)."""
+    global _shared_http_client
+    if _shared_http_client is not None and not _shared_http_client.is_closed:
+        await _shared_http_client.aclose()
+        logger.info("Shared OpenAI HTTP client closed")
+    _shared_http_client = None
+
 
 class OpenAIClient:
     """Client for OpenAI GPT models.
@@ -26,7 +61,10 @@ class OpenAIClient:
             api_key: OpenAI API key
             model: Model name (gpt-4o, gpt-4, gpt-3.5-turbo, etc.)
         """
-        self.client = AsyncOpenAI(api_key=api_key)
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=get_shared_http_client(),
+        )
         self.model = model
         self.max_tokens = 4000  # Slightly less than 4096 to be safe
     
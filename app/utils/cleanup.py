@@ -7,6 +7,7 @@ Ensures user data privacy.
 import asyncio
 import logging
 import shutil
+import tempfile
 from pathlib import Path
 from typing import Optional
 
@@ -68,6 +69,28 @@ class CleanupManager:
             logger.error(f"Failed to delete directory {dir_path}: {e}")
             return False
     
+    @staticmethod
+    def empty_directory(dir_path: Path) -> bool:
+        """Delete directory contents but keep the directory itself.
+        
+        Args:
+            dir_path: Path to directory to empty
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            for entry in dir_path.iterdir():
+                if entry.is_dir() and not entry.is_symlink():
+                    shutil.rmtree(entry)
+                else:
+                    entry.unlink()
+            logger.debug(f"Emptied directory: {dir_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to empty directory {dir_path}: {e}")
+            return False
+    
     @staticmethod
     async def cleanup_file_async(file_path: Path) -> bool:
         """Delete a file asynchronously.
@@ -168,3 +191,96 @@ class CleanupManager:
         temp_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"Created temp directory: {temp_dir}")
         return temp_dir
+
+
+class TempDirPool:
+    """Reusable pool of temporary slot directories.
+    
+    Slot directories are created once under ``base_dir`` and handed out
+    one per task. On release the slot is emptied in place and returned
+    to the pool, so steady-state uploads do no mkdir/rmdir. When all
+    slots are busy a fresh directory is created and removed on release.
+    
+    Example:
+        >>> pool = TempDirPool(Path("./temp/pool"), size=32)
+        >>> slot = await pool.acquire()
+        >>> try:
+        ...     ...  # write and process files in slot
+        ... finally:
+        ...     await pool.release(slot)
+    """
+    
+    def __init__(self, base_dir: Path, size: int = 32) -> None:
+        """Initialize pool (directories are created lazily).
+        
+        Args:
+            base_dir: Directory that holds the slot directories
+            size: Number of reusable slots
+        """
+        self.base_dir = base_dir
+        self.size = size
+        self._free: Optional[asyncio.Queue] = None
+        self._slots: set[Path] = set()
+        # Concurrent first acquire() calls must not initialize twice: a second
+        # init would empty slots the first caller already handed out
+        self._init_lock = asyncio.Lock()
+    
+    def _init_slots(self) -> asyncio.Queue:
+        """Create slot directories and fill a new free queue.
+        
+        Slots that cannot be emptied (leftovers from a previous run) are
+        left out of the pool.
+        """
+        free = asyncio.Queue(maxsize=self.size)
+        for index in range(self.size):
+            slot = self.base_dir / f"slot_{index:02d}"
+            if slot.exists() and not CleanupManager.empty_directory(slot):
+                continue
+            slot.mkdir(parents=True, exist_ok=True)
+            self._slots.add(slot)
+            free.put_nowait(slot)
+        logger.info(f"Temp dir pool ready: {free.qsize()} slots in {self.base_dir}")
+        return free
+    
+    async def _get_free(self) -> asyncio.Queue:
+        """Return the free-slot queue, creating the slots on first use."""
+        if self._free is None:
+            async with self._init_lock:
+                if self._free is None:
+                    self._free = await asyncio.to_thread(self._init_slots)
+        return self._free
+    
+    async def acquire(self) -> Path:
+        """Take a free slot directory (or a fresh one if pool is exhausted).
+        
+        Returns:
+            Path: Empty directory owned by the caller until release()
+        """
+        free = await self._get_free()
+        try:
+            return free.get_nowait()
+        except asyncio.QueueEmpty:
+            overflow_dir = Path(
+                await asyncio.to_thread(tempfile.mkdtemp, dir=self.base_dir)
+            )
+            logger.debug(f"Temp dir pool exhausted, using {overflow_dir}")
+            return overflow_dir
+    
+    async def release(self, slot: Path) -> None:
+        """Empty a directory taken with acquire() and return it to the pool.
+        
+        Args:
+            slot: Directory returned by acquire()
+        """
+        if slot not in self._slots:
+            await CleanupManager.cleanup_directory_async(slot)
+            return
+        
+        if await asyncio.to_thread(CleanupManager.empty_directory, slot):
+            self._free.put_nowait(slot)
+            return
+        
+        # Files of the previous task may remain: never hand the slot out again
+        logger.warning(f"Dropping temp dir pool slot {slot}: cannot empty it")
+        self._slots.discard(slot)
+        await CleanupManager.cleanup_directory_async(slot)
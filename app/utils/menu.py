@@ -29,6 +29,7 @@ class MenuManager:
         text: str = "",
         keyboard: Optional[InlineKeyboardMarkup] = None,
         screen_code: str = "main",
+        parse_mode: Optional[str] = "Markdown",
     ) -> bool:
         """Show or update menu.
         
@@ -41,6 +42,7 @@ class MenuManager:
             text: Menu text
             keyboard: Inline keyboard
             screen_code: Screen identifier for tracking
+            parse_mode: Telegram parse mode (None for plain text)
             
         Returns:
             bool: Success status
@@ -66,7 +68,7 @@ class MenuManager:
                             message_id=menu_message_id,
                             text=text,
                             reply_markup=keyboard,
-                            parse_mode="Markdown",
+                            parse_mode=parse_mode,
                         )
                         logger.debug(f"📝 Edited menu {screen_code}")
                         await callback.answer()
@@ -90,7 +92,7 @@ class MenuManager:
                 new_msg = await callback.message.answer(
                     text=text,
                     reply_markup=keyboard,
-                    parse_mode="Markdown",
+                    parse_mode=parse_mode,
                 )
                 menu_message_id = new_msg.message_id
                 
@@ -113,7 +115,7 @@ class MenuManager:
                             message_id=menu_message_id,
                             text=text,
                             reply_markup=keyboard,
-                            parse_mode="Markdown",
+                            parse_mode=parse_mode,
                         )
                         logger.debug(f"📝 Edited menu {screen_code}")
                         return True
@@ -134,7 +136,7 @@ class MenuManager:
                 new_msg = await message.answer(
                     text=text,
                     reply_markup=keyboard,
-                    parse_mode="Markdown",
+                    parse_mode=parse_mode,
                 )
                 menu_message_id = new_msg.message_id
                 
@@ -162,6 +164,7 @@ class MenuManager:
         new_state=None,
         screen_code: str = "menu",
         preserve_data: bool = True,
+        parse_mode: Optional[str] = "Markdown",
     ) -> bool:
         """Navigate to new menu screen.
         
@@ -175,6 +178,7 @@ class MenuManager:
             new_state: New FSM state (optional)
             screen_code: Screen identifier
             preserve_data: Whether to preserve FSM data
+            parse_mode: Telegram parse mode (None for plain text)
             
         Returns:
             bool: Success status
@@ -210,6 +214,7 @@ class MenuManager:
                 text=text,
                 keyboard=keyboard,
                 screen_code=screen_code,
+                parse_mode=parse_mode,
             )
             
             if success:
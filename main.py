@@ -18,6 +18,7 @@ from aiogram.fsm.storage.memory import MemoryStorage
 
 from app.bot import create_bot, setup_bot_commands
 from app.config import get_settings  # Fixed: use get_settings() function
+from app.services.llm.llm_factory import LLMFactory
 
 # Import all handlers
 from app.handlers import (
@@ -62,7 +63,7 @@ async def main() -> None:
     settings = get_settings()
     
     # Create bot instance
-    bot = create_bot(settings.TG_BOT_TOKEN)
+    bot = create_bot(settings.TG_BOT_TOKEN, api_server=settings.TELEGRAM_API_SERVER)
     
     # Create dispatcher with memory storage
     storage = MemoryStorage()
@@ -87,6 +88,9 @@ async def main() -> None:
     temp_dir.mkdir(exist_ok=True)
     logger.info(f"Temp directory: {temp_dir.absolute()}")
     
+    # Pre-load RAG manager (embedding model) before accepting updates
+    await rag.warmup_rag_manager()
+    
     # Start polling
     logger.info("Bot started. Press Ctrl+C to stop.")
     try:
@@ -99,6 +103,7 @@ async def main() -> None:
         logger.error(f"Error during polling: {e}", exc_info=True)
     finally:
         await bot.session.close()
+        await LLMFactory.close_http_clients()
         logger.info("Bot stopped")
 
 
@@ -27,15 +27,24 @@ class RAGConfig:
         temp_dir: Path for temporary files
         embedding_model: Sentence-Transformers model name
         embedding_device: Device for embeddings (cpu, cuda, mps)
+        embedding_backend: Embedding backend (sentence-transformers, model2vec)
+        static_embedding_model: model2vec model name for the model2vec backend
+        normalize_embeddings: L2-normalize embeddings at encode time
         chunk_size: Maximum chunk size in tokens/words
         chunk_overlap: Overlap between chunks
         top_k: Default number of results to return
         similarity_threshold: Minimum similarity score (0-1)
+        vector_store_backend: Vector store backend (chroma, memory)
+        vector_store_dtype: Embedding storage type for memory backend (float32, float16, int8)
         llm_max_tokens: Max tokens for LLM responses
         llm_temperature: Temperature for LLM (0-2)
         debug: Enable debug logging
         use_cache: Use caching for embeddings
         cache_size: Size of embedding cache
+        max_total_chunks: Chunk budget; least recently used documents are
+            evicted above it (0 = unlimited)
+        extraction_cache_max_mb: Size cap of the extracted text / embeddings
+            cache; oldest files are removed above it (0 = unlimited)
     """
     
     # Paths
@@ -54,6 +63,12 @@ class RAGConfig:
     embedding_device: str = getenv('EMBEDDING_DEVICE', 'cpu')
     embedding_batch_size: int = int(getenv('EMBEDDING_BATCH_SIZE', '32'))
     embedding_dimension: int = 384  # Fixed for paraphrase-MiniLM
+    embedding_backend: str = getenv('EMBEDDING_BACKEND', 'sentence-transformers')
+    static_embedding_model: str = getenv(
+        'STATIC_EMBEDDING_MODEL',
+        'minishlab/potion-multilingual-128M'
+    )
+    normalize_embeddings: bool = getenv('NORMALIZE_EMBEDDINGS', 'true').lower() == 'true'
     
     # Chunking
     chunk_size: int = int(getenv('CHUNK_SIZE', '500'))
@@ -62,6 +77,8 @@ class RAGConfig:
     # Retrieval
     top_k: int = int(getenv('TOP_K_RESULTS', '5'))
     similarity_threshold: float = float(getenv('SIMILARITY_THRESHOLD', '0.3'))
+    vector_store_backend: str = getenv('VECTOR_STORE_BACKEND', 'chroma')
+    vector_store_dtype: str = getenv('VECTOR_STORE_DTYPE', 'float32')
     
     # LLM Integration
     llm_max_tokens: int = int(getenv('LLM_MAX_TOKENS', '2000'))
@@ -71,6 +88,8 @@ class RAGConfig:
     debug: bool = getenv('DEBUG', 'false').lower() == 'true'
     use_cache: bool = getenv('USE_CACHE', 'true').lower() == 'true'
     cache_size: int = int(getenv('CACHE_SIZE', '1000'))
+    max_total_chunks: int = int(getenv('MAX_TOTAL_CHUNKS', '0'))
+    extraction_cache_max_mb: int = int(getenv('EXTRACTION_CACHE_MAX_MB', '512'))
     
     def __post_init__(self):
         """Validate configuration after initialization."""
@@ -101,6 +120,35 @@ class RAGConfig:
                 f"got {self.embedding_device}"
             )
         
+        if self.embedding_backend not in ['sentence-transformers', 'model2vec']:
+            raise ValueError(
+                f"embedding_backend must be one of [sentence-transformers, model2vec], "
+                f"got {self.embedding_backend}"
+            )
+        
+        if self.vector_store_backend not in ['chroma', 'memory']:
+            raise ValueError(
+                f"vector_store_backend must be one of [chroma, memory], "
+                f"got {self.vector_store_backend}"
+            )
+        
+        if self.vector_store_dtype not in ['float32', 'float16', 'int8']:
+            raise ValueError(
+                f"vector_store_dtype must be one of [float32, float16, int8], "
+                f"got {self.vector_store_dtype}"
+            )
+        
+        if self.max_total_chunks < 0:
+            raise ValueError(
+                f"max_total_chunks must be non-negative, got {self.max_total_chunks}"
+            )
+        
+        if self.extraction_cache_max_mb < 0:
+            raise ValueError(
+                f"extraction_cache_max_mb must be non-negative, "
+                f"got {self.extraction_cache_max_mb}"
+            )
+        
         if self.debug:
             logger.info("DEBUG mode enabled")
             logger.debug(f"Configuration: {self}")
@@ -110,6 +158,16 @@ class RAGConfig:
         """Path to ChromaDB data directory."""
         return self.vector_db_path / "chroma_db"
     
+    @property
+    def vector_db_memory_path(self) -> Path:
+        """Path to in-memory vector store snapshot directory."""
+        return self.vector_db_path / "memory_store"
+    
+    @property
+    def extraction_cache_path(self) -> Path:
+        """Path to extracted text / chunk embeddings cache (keyed by file hash)."""
+        return self.vector_db_path / "extraction_cache"
+    
     @property
     def metadata_path(self) -> Path:
         """Path to metadata file."""
@@ -131,10 +189,14 @@ class RAGConfig:
             'temp_dir': str(self.temp_dir),
             'embedding_model': self.embedding_model,
             'embedding_device': self.embedding_device,
+            'embedding_backend': self.embedding_backend,
+            'normalize_embeddings': self.normalize_embeddings,
             'chunk_size': self.chunk_size,
             'chunk_overlap': self.chunk_overlap,
             'top_k': self.top_k,
             'similarity_threshold': self.similarity_threshold,
+            'vector_store_backend': self.vector_store_backend,
+            'vector_store_dtype': self.vector_store_dtype,
             'llm_max_tokens': self.llm_max_tokens,
             'llm_temperature': self.llm_temperature,
             'debug': self.debug,
@@ -6,8 +6,13 @@ Handles file routing to appropriate parser.
 Standalone version for RAG module (imports fixed for rag_module namespace).
 """
 
+import asyncio
+import io
 import logging
+import os
 import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -19,6 +24,7 @@ from rag_module.file_processing.zip_handler import ZIPHandler
 logger = logging.getLogger(__name__)
 
 SUPPORTED_FORMATS = {".pdf", ".docx", ".txt", ".zip", ".doc", ".xlsx", ".xls"}
+MAX_ZIP_WORKERS = min(4, os.cpu_count() or 1)
 
 
 class FileConverter:
@@ -114,8 +120,6 @@ class FileConverter:
                 return self._extract_text_file(file_path)
             
             elif file_suffix == ".zip":
-                if not temp_dir:
-                    raise ValueError("temp_dir required for ZIP processing")
                 logger.info(f"Processing ZIP: {file_path.name}")
                 return self._extract_zip(file_path, temp_dir)
             
@@ -126,6 +130,22 @@ class FileConverter:
             logger.error(f"Error extracting text from {file_path.name}: {e}")
             raise
     
+    async def extract_text_async(
+        self,
+        file_path: Path,
+        temp_dir: Optional[Path] = None,
+    ) -> str:
+        """Extract text from file in a worker thread (non-blocking).
+        
+        Args:
+            file_path: Path to file
+            temp_dir: Directory for temporary files
+            
+        Returns:
+            str: Extracted text
+        """
+        return await asyncio.to_thread(self.extract_text, file_path, temp_dir)
+    
     def _extract_text_file(self, file_path: Path) -> str:
         """Extract text from plain text file.
         
@@ -135,42 +155,81 @@ class FileConverter:
         Returns:
             str: File content
         """
+        return self._decode_text(file_path.read_bytes(), file_path.name)
+    
+    @staticmethod
+    def _decode_text(data: bytes, name: str) -> str:
+        """Decode plain text bytes (UTF-8 with latin-1 fallback)."""
         try:
-            return file_path.read_text(encoding="utf-8")
+            return data.decode("utf-8")
         except UnicodeDecodeError:
-            logger.warning(f"UTF-8 decode failed for {file_path.name}, trying latin-1")
-            return file_path.read_text(encoding="latin-1")
+            logger.warning(f"UTF-8 decode failed for {name}, trying latin-1")
+            return data.decode("latin-1")
     
-    def _extract_zip(self, file_path: Path, temp_dir: Path) -> str:
+    def _extract_zip(self, file_path: Path, temp_dir: Optional[Path] = None) -> str:
         """Extract and process ZIP archive.
         
+        Members are streamed from the archive and parsed in memory;
+        nothing is written to disk except formats whose parsers
+        need a real file (.doc, Excel). Members are parsed in a thread
+        pool while the archive is still being read; output keeps
+        archive order.
+        
         Args:
             file_path: Path to ZIP file
-            temp_dir: Directory for temporary files
+            temp_dir: Directory for temporary files (optional)
             
         Returns:
-            str: Combined text from all extracted files
+            str: Combined text from all supported files
         """
-        extracted_files = self.zip_handler.extract_supported_files(
-            file_path,
-            temp_dir,
-        )
+        # Written piece by piece: no per-member "header + text" copy
+        combined_text = io.StringIO()
+        
+        with ThreadPoolExecutor(max_workers=MAX_ZIP_WORKERS) as executor:
+            futures = [
+                (name, executor.submit(self._extract_bytes, name, data, temp_dir))
+                for name, data in self.zip_handler.iter_supported_files(file_path)
+            ]
+            
+            for name, future in futures:
+                try:
+                    text = future.result()
+                    if text:
+                        combined_text.write("\n\n=== File: ")
+                        combined_text.write(name)
+                        combined_text.write(" ===\n")
+                        combined_text.write(text)
+                except Exception as e:
+                    logger.warning(f"Error processing {name}: {e}")
+                    continue
         
-        if not extracted_files:
+        if not futures:
             logger.warning(f"No supported files found in {file_path.name}")
-            return ""
-        
-        combined_text: list[str] = []
-        
-        for file_path_extracted in extracted_files:
-            try:
-                text = self.extract_text(file_path_extracted, temp_dir)
-                if text:
-                    combined_text.append(
-                        f"\n\n=== File: {file_path_extracted.name} ===\n{text}"
-                    )
-            except Exception as e:
-                logger.warning(f"Error processing {file_path_extracted.name}: {e}")
-                continue
-        
-        return "".join(combined_text)
+        
+        return combined_text.getvalue()
+    
+    def _extract_bytes(self, name: str, data: bytes, temp_dir: Optional[Path]) -> str:
+        """Extract text from in-memory file content (ZIP archive member).
+        
+        Args:
+            name: File name (used for format routing)
+            data: File content
+            temp_dir: Directory for temporary files (optional)
+            
+        Returns:
+            str: Extracted text
+        """
+        suffix = os.path.splitext(name)[1].lower()
+        
+        if suffix == ".pdf":
+            return self.pdf_parser.extract_text_from_stream(io.BytesIO(data), name)
+        if suffix == ".docx":
+            return self.docx_parser.extract_text_from_stream(io.BytesIO(data), name)
+        if suffix == ".txt":
+            return self._decode_text(data, name)
+        
+        # Parsers without in-memory API: spill to a private temp file
+        with tempfile.TemporaryDirectory(dir=temp_dir) as spill_dir:
+            spill_path = Path(spill_dir) / name
+            spill_path.write_bytes(data)
+            return self.extract_text(spill_path, Path(spill_dir))
@@ -6,6 +6,7 @@ For old .doc files, delegates to DOCParser.
 
 import logging
 from pathlib import Path
+from typing import BinaryIO, Union
 
 from rag_module.file_processing.text_cleaner import TextCleaner
 from rag_module.file_processing.doc_parser import DOCParser
@@ -53,13 +54,31 @@ class DOCXParser:
         
         # For .docx files, use python-docx
         logger.info(f"Starting extraction from {file_path.name} ({file_path.stat().st_size} bytes)")
+        return self._extract_docx(file_path, file_path.name)
+    
+    def extract_text_from_stream(self, stream: BinaryIO, name: str) -> str:
+        """Extract text from in-memory .docx (e.g. ZIP archive member).
         
+        Args:
+            stream: Binary file-like object with DOCX content
+            name: File name for logging
+            
+        Returns:
+            str: Extracted text
+            
+        Raises:
+            ValueError: If content is not a valid DOCX
+        """
+        return self._extract_docx(stream, name)
+    
+    def _extract_docx(self, source: Union[Path, BinaryIO], name: str) -> str:
+        """Extract paragraphs and tables from DOCX path or stream."""
         if Document is None:
             raise ValueError("python-docx not installed")
         
         try:
-            logger.info(f"Using python-docx for {file_path.name}")
-            doc = Document(file_path)
+            logger.info(f"Using python-docx for {name}")
+            doc = Document(source)
             extracted_text = []
             
             # Extract paragraphs
@@ -74,26 +93,29 @@ class DOCXParser:
             table_count = 0
             for table in doc.tables:
                 for row in table.rows:
-                    row_text = []
-                    for cell in row.cells:
-                        for para in cell.paragraphs:
-                            if para.text.strip():
-                                row_text.append(para.text)
+                    # paragraph.text rebuilds the string from runs on every
+                    # access: read it once per paragraph
+                    row_text = [
+                        text
+                        for cell in row.cells
+                        for text in (para.text for para in cell.paragraphs)
+                        if text and not text.isspace()
+                    ]
                     if row_text:
                         extracted_text.append(" | ".join(row_text))
                         table_count += 1
             
             result = "\n".join(extracted_text)
-            if result.strip():
-                logger.info(f"✓ Successfully extracted {len(result)} chars from {file_path.name} "
+            if extracted_text:
+                logger.info(f"✓ Successfully extracted {len(result)} chars from {name} "
                           f"({paragraph_count} paragraphs, {table_count} tables)")
                 return result
             else:
-                raise ValueError(f"No text extracted from {file_path.name}")
+                raise ValueError(f"No text extracted from {name}")
         
         except Exception as e:
-            logger.error(f"Error extracting text from {file_path.name}: {type(e).__name__}: {str(e)[:100]}")
-            raise ValueError(f"Cannot extract text from {file_path.name}") from e
+            logger.error(f"Error extracting text from {name}: {type(e).__name__}: {str(e)[:100]}")
+            raise ValueError(f"Cannot extract text from {name}") from e
     
     def get_metadata(self, file_path: Path) -> dict:  # type: ignore
         """Extract DOCX metadata.
@@ -104,7 +126,7 @@ class DOCXParser:
         Returns:
             dict: Document metadata
         """
-        if file_path.suffix.lower() != '.docx':
+        if Document is None or file_path.suffix.lower() != '.docx':
             return {}
         
         try:
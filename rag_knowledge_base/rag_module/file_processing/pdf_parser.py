@@ -6,7 +6,7 @@ Includes error handling for corrupted or malformed PDFs.
 
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 
 from pypdf import PdfReader
 
@@ -47,14 +47,33 @@ class PDFParser:
         if not file_path.exists():
             raise FileNotFoundError(f"PDF file not found: {file_path}")
         
+        return self._extract(file_path, file_path.name)
+    
+    def extract_text_from_stream(self, stream: BinaryIO, name: str) -> str:
+        """Extract text from in-memory PDF (e.g. ZIP archive member).
+        
+        Args:
+            stream: Binary file-like object with PDF content
+            name: File name for logging
+            
+        Returns:
+            str: Extracted text with page separators
+            
+        Raises:
+            ValueError: If content is not a valid PDF
+        """
+        return self._extract(stream, name)
+    
+    def _extract(self, source: Union[Path, BinaryIO], name: str) -> str:
+        """Extract text from PDF path or stream."""
         try:
-            reader = PdfReader(file_path)
+            reader = PdfReader(source)
         except Exception as e:
-            logger.error(f"Failed to read PDF {file_path}: {e}")
+            logger.error(f"Failed to read PDF {name}: {e}")
             raise ValueError(f"Invalid PDF file: {e}") from e
         
         if not reader.pages:
-            logger.warning(f"PDF {file_path} has no pages")
+            logger.warning(f"PDF {name} has no pages")
             return ""
         
         extracted_text: list[str] = []
@@ -70,7 +89,7 @@ class PDFParser:
                 continue
         
         result = "\n\n".join(extracted_text)
-        logger.info(f"Extracted {len(extracted_text)} pages from {file_path.name}")
+        logger.info(f"Extracted {len(extracted_text)} pages from {name}")
         return result
     
     def get_metadata(self, file_path: Path) -> dict:
@@ -10,6 +10,20 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Runs of blank lines, compiled once (run twice per clean_extracted_text call)
+_BLANK_LINES_RE = re.compile(r'\n\n+')
+
+# str.translate table deleting control characters (keeps tab, newline, CR)
+_CONTROL_CHARS_TABLE = dict.fromkeys(
+    [code for code in range(32) if code not in (9, 10, 13)] + list(range(127, 160))
+)
+
+# Characters outside the BMP (likely corruption)
+_NON_BMP_RE = re.compile('[\U00010000-\U0010FFFF]')
+
+# A letter in any script (word characters minus digits and underscore)
+_LETTER_RE = re.compile(r'[^\W\d_]')
+
 
 class TextCleaner:
     """Clean and normalize extracted text from documents.
@@ -62,17 +76,8 @@ class TextCleaner:
     @staticmethod
     def _remove_control_chars(text: str) -> str:
         """Remove control characters and invalid UTF-8."""
-        result = []
-        for char in text:
-            code = ord(char)
-            if code < 32 and code not in (9, 10, 13):
-                continue
-            if 127 <= code < 160:
-                continue
-            if code > 65535:
-                continue
-            result.append(char)
-        return ''.join(result)
+        text = text.translate(_CONTROL_CHARS_TABLE)
+        return _NON_BMP_RE.sub('', text)
     
     @staticmethod
     def _decode_escaped_chars(text: str) -> str:
@@ -90,11 +95,8 @@ class TextCleaner:
     @staticmethod
     def _normalize_whitespace(text: str) -> str:
         """Normalize whitespace while preserving paragraphs."""
-        text = re.sub(r' +', ' ', text)
-        text = re.sub(r'\n\n+', '\n\n', text)
-        text = re.sub(r' +\n', '\n', text)
-        text = re.sub(r'\n +', '\n', text)
-        return text
+        lines = (' '.join(filter(None, line.split(' '))) for line in text.split('\n'))
+        return _BLANK_LINES_RE.sub('\n\n', '\n'.join(lines))
     
     @staticmethod
     def _remove_garbage_lines(text: str) -> str:
@@ -103,22 +105,23 @@ class TextCleaner:
         clean_lines = []
         
         for line in lines:
-            if not line.strip():
+            stripped = line.strip()
+            if not stripped:
                 clean_lines.append('')
                 continue
             
-            if len(line.strip()) < TextCleaner.MIN_LINE_LENGTH:
+            if len(stripped) < TextCleaner.MIN_LINE_LENGTH:
                 continue
             
-            letters = sum(1 for c in line if c.isalpha())
+            if stripped == stripped[0] * len(stripped):
+                continue
+            
+            letters = len(_LETTER_RE.findall(line))
             non_letters = len(line) - letters
             
             if letters > 0 and non_letters / len(line) > 0.8:
                 continue
             
-            if len(set(line.strip())) <= 1:
-                continue
-            
             clean_lines.append(line)
         
         return '\n'.join(clean_lines)
@@ -168,11 +171,12 @@ class TextCleaner:
     @classmethod
     def get_preview(cls, text: str, max_lines: int = 5) -> str:
         """Get preview of cleaned text for debugging."""
-        lines = text.split('\n')
-        preview_lines = [l for l in lines[:max_lines] if l.strip()]
-        preview = '\n'.join(preview_lines[:max_lines])
+        # Split off only the head; the rest is counted, not copied
+        head = text.split('\n', max_lines)[:max_lines]
+        preview = '\n'.join(l for l in head if l.strip())
         
-        if len(lines) > max_lines:
-            preview += f"\n... ({len(lines) - max_lines} more lines)"
+        line_count = text.count('\n') + 1
+        if line_count > max_lines:
+            preview += f"\n... ({line_count - max_lines} more lines)"
         
         return preview
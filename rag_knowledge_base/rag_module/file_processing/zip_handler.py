@@ -7,9 +7,10 @@ Extracts and processes ZIP archives safely with:
 """
 
 import logging
+import posixpath
 import zipfile
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -130,3 +131,47 @@ class ZIPHandler:
         except Exception as e:
             logger.error(f"Error extracting ZIP: {e}")
             raise ValueError(f"Failed to extract archive: {e}") from e
+    
+    def iter_supported_files(self, file_path: Path) -> Iterator[Tuple[str, bytes]]:
+        """Stream supported files from ZIP archive without writing to disk.
+        
+        Applies the same validation and path filtering as
+        extract_supported_files(), but yields each member's content
+        in memory one at a time.
+        
+        Args:
+            file_path: Path to ZIP file
+            
+        Yields:
+            Tuple[str, bytes]: Member base name and its content
+            
+        Raises:
+            ValueError: If archive validation fails
+        """
+        self.validate_archive(file_path)
+        
+        try:
+            with zipfile.ZipFile(file_path, 'r') as zip_ref:
+                for member in zip_ref.infolist():
+                    if member.is_dir():
+                        continue
+                    
+                    if '..' in member.filename or member.filename.startswith('/'):
+                        logger.warning(f"Skipping suspicious path: {member.filename}")
+                        continue
+                    
+                    # Plain string ops: no PurePath parsing per member
+                    name = posixpath.basename(member.filename)
+                    if posixpath.splitext(name)[1].lower() not in SUPPORTED_FILE_TYPES:
+                        continue
+                    
+                    try:
+                        data = zip_ref.read(member)
+                    except Exception as e:
+                        logger.warning(f"Failed to read {member.filename}: {e}")
+                        continue
+                    
+                    yield name, data
+        
+        except zipfile.BadZipFile as e:
+            raise ValueError(f"Failed to read archive: {e}") from e
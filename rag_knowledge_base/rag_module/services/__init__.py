@@ -4,6 +4,7 @@ Core services for RAG pipeline:
   - chunker: Split documents into chunks
   - embeddings: Generate vector embeddings  
   - vector_store: ChromaDB wrapper
+  - memory_store: In-process NumPy vector store
   - retriever: Semantic search
   - manager: Main RAG orchestrator (USE THIS!)
 
@@ -15,7 +16,13 @@ Quick Start:
 """
 
 from rag_module.services.chunker import Chunker, ChunkingError
-from rag_module.services.embeddings import EmbeddingService, EmbeddingError
+from rag_module.services.embeddings import (
+    EmbeddingService,
+    EmbeddingError,
+    StaticEmbeddingService,
+    create_embedding_service,
+)
+from rag_module.services.memory_store import InMemoryVectorStore, MemoryStoreError
 
 # Lazy imports for ChromaDB-dependent modules to avoid DLL issues on import
 def __getattr__(name):
@@ -52,8 +59,12 @@ __all__ = [
     "ChunkingError",
     "EmbeddingService",
     "EmbeddingError",
+    "StaticEmbeddingService",
+    "create_embedding_service",
     "ChromaVectorStore",
     "VectorStoreError",
+    "InMemoryVectorStore",
+    "MemoryStoreError",
     "Retriever",
     "RetrieverError",
 ]
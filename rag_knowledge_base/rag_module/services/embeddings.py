@@ -13,7 +13,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import numpy as np
 
@@ -22,6 +22,11 @@ try:
 except ImportError:
     SentenceTransformer = None
 
+try:
+    from model2vec import StaticModel
+except ImportError:
+    StaticModel = None
+
 from rag_module.config import get_config
 from rag_module.exceptions import RAGException
 
@@ -77,6 +82,8 @@ class EmbeddingService:
         try:
             self.model = SentenceTransformer(self.model_name, device=self.device)
             self.embedding_dim = self.model.get_sentence_embedding_dimension()
+            # Прогрев: первый encode инициализирует токенизатор и ядра
+            self.model.encode(["warmup"], show_progress_bar=False)
             logger.info(
                 f"✓ Model loaded successfully. Embedding dimension: {self.embedding_dim}"
             )
@@ -102,12 +109,7 @@ class EmbeddingService:
             return np.zeros(self.embedding_dim, dtype=np.float32)
 
         try:
-            embedding = self.model.encode(
-                text,
-                convert_to_numpy=True,
-                show_progress_bar=False,
-            )
-            return embedding
+            return self._encode([text])[0]
         except Exception as e:
             logger.error(f"Error encoding text: {e}")
             raise EmbeddingError(f"Failed to embed text: {e}") from e
@@ -142,12 +144,7 @@ class EmbeddingService:
 
         if non_empty_texts:
             try:
-                embeddings = self.model.encode(
-                    non_empty_texts,
-                    batch_size=self.batch_size,
-                    convert_to_numpy=True,
-                    show_progress_bar=False,
-                )
+                embeddings = self._encode(non_empty_texts)
                 # Заполняем результат только для непустых текстов
                 for i, idx in enumerate(non_empty_indices):
                     result[idx] = embeddings[i]
@@ -213,6 +210,23 @@ class EmbeddingService:
 
     # ---------- Утилиты ----------
 
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Закодировать непустые тексты моделью.
+
+        Args:
+            texts: Список непустых текстов
+
+        Returns:
+            Матрица embeddings размером (len(texts), embedding_dim)
+        """
+        return self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=get_config().normalize_embeddings,
+            show_progress_bar=False,
+        )
+
     def get_embedding_dimension(self) -> int:
         """Получить размерность выходных embeddings.
 
@@ -220,3 +234,171 @@ class EmbeddingService:
             Размерность embedding вектора
         """
         return self.embedding_dim
+
+
+class StaticEmbeddingService(EmbeddingService):
+    """Сервис embeddings на статических векторах model2vec.
+
+    Вместо прохода трансформера — поиск векторов токенов и усреднение,
+    что на CPU на порядки быстрее при небольшой потере качества.
+    Размерность зависит от модели (у моделей potion — 256), поэтому
+    хранилище нужно создавать с embedding_dim этого сервиса.
+    """
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        batch_size: Optional[int] = None,
+    ) -> None:
+        """Инициализация static embedding сервиса.
+
+        Args:
+            model_name: Название модели model2vec (по умолчанию из config)
+            batch_size: Размер батча (по умолчанию из config)
+
+        Raises:
+            EmbeddingError: Если model2vec не установлен
+        """
+        if StaticModel is None:
+            raise EmbeddingError(
+                "model2vec not installed. Run: pip install model2vec"
+            )
+
+        config = get_config()
+        self.model_name = model_name or config.static_embedding_model
+        self.device = "cpu"
+        self.batch_size = batch_size or config.embedding_batch_size
+
+        logger.info(f"Loading static embedding model: {self.model_name}")
+        try:
+            self.model = StaticModel.from_pretrained(self.model_name)
+            self.embedding_dim = int(self.model.embedding.shape[1])
+            logger.info(
+                f"✓ Static model loaded successfully. Embedding dimension: {self.embedding_dim}"
+            )
+        except Exception as e:
+            logger.error(f"Failed to load static embedding model: {e}")
+            raise EmbeddingError(f"Cannot load model {self.model_name}: {e}") from e
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Закодировать непустые тексты статической моделью."""
+        embeddings = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+        )
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if get_config().normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            embeddings /= norms
+        return embeddings
+
+
+def create_embedding_service() -> EmbeddingService:
+    """Создать сервис embeddings согласно config.embedding_backend.
+
+    Returns:
+        EmbeddingService (sentence-transformers) или StaticEmbeddingService (model2vec)
+    """
+    if get_config().embedding_backend == "model2vec":
+        return StaticEmbeddingService()
+    return EmbeddingService()
+
+
+
+class EmbedBatcher:
+    """Объединяет одиночные запросы на embedding в батчи.
+
+    Конкурентные вызовы submit() из разных обработчиков копятся в очереди
+    до max_batch элементов или max_wait секунд, после чего кодируются
+    одним вызовом embed_batch в thread pool. Внутри батча тексты
+    сортируются по длине, чтобы уменьшить padding.
+
+    Attributes:
+        embedding_service: Сервис, выполняющий кодирование
+        max_batch: Максимальный размер батча
+        max_wait: Максимальное ожидание добора батча (секунды)
+    """
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingService,
+        max_batch: int = 32,
+        max_wait: float = 0.02,
+    ) -> None:
+        """Инициализация батчера.
+
+        Args:
+            embedding_service: Сервис embeddings
+            max_batch: Максимальный размер батча
+            max_wait: Максимальное ожидание добора батча (секунды)
+        """
+        self.embedding_service = embedding_service
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, text: str) -> np.ndarray:
+        """Получить embedding текста через общий батч.
+
+        Args:
+            text: Исходный текст
+
+        Returns:
+            Вектор embeddings (numpy array)
+
+        Raises:
+            EmbeddingError: Если не удалось создать embedding
+        """
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def close(self) -> None:
+        """Остановить фоновую задачу батчера."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def _run(self) -> None:
+        """Фоновый цикл: собрать батч, закодировать, раздать результаты."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[Tuple[str, asyncio.Future]] = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            batch.sort(key=lambda item: len(item[0]))
+            try:
+                embeddings = await asyncio.to_thread(
+                    self.embedding_service.embed_batch,
+                    [text for text, _ in batch],
+                )
+            except Exception as e:
+                logger.error(f"Error encoding coalesced batch: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(EmbeddingError(f"Failed to embed batch: {e}"))
+                continue
+
+            logger.debug(f"Encoded coalesced batch of {len(batch)} texts")
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
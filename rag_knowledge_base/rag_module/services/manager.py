@@ -18,20 +18,32 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import logging
+import os
+import shutil
+import threading
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
 
+import numpy as np
+
 from rag_module.config import get_config
 from rag_module.models import Document, Chunk, SearchResult
 from rag_module.file_processing import FileConverter
 from rag_module.services.chunker import Chunker
-from rag_module.services.embeddings import EmbeddingService
+from rag_module.services.embeddings import (
+    EmbeddingService,
+    EmbedBatcher,
+    create_embedding_service,
+)
 from rag_module.services.vector_store import ChromaVectorStore
+from rag_module.services.memory_store import InMemoryVectorStore
 from rag_module.services.retriever import Retriever
 from rag_module.exceptions import RAGException
+from rag_module.utils.cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
@@ -62,17 +74,19 @@ class RAGManager:
         embedding_service: Сервис генерации embeddings
         vector_store: Векторное хранилище
         retriever: Сервис поиска
+        embed_batcher: Батчер embeddings поисковых запросов
         documents_registry_path: Путь к реестру документов
     """
 
     REGISTRY_FILENAME = "documents_registry.json"
+    HASH_BLOCK_SIZE = 1024 * 1024
 
     def __init__(
         self,
         file_converter: Optional[FileConverter] = None,
         chunker: Optional[Chunker] = None,
         embedding_service: Optional[EmbeddingService] = None,
-        vector_store: Optional[ChromaVectorStore] = None,
+        vector_store: Optional[Union[ChromaVectorStore, InMemoryVectorStore]] = None,
         retriever: Optional[Retriever] = None,
     ) -> None:
         """Инициализация RAG Manager.
@@ -96,16 +110,44 @@ class RAGManager:
             # Инициализация компонентов
             self.file_converter = file_converter or FileConverter()
             self.chunker = chunker or Chunker()
-            self.embedding_service = embedding_service or EmbeddingService()
-            self.vector_store = vector_store or ChromaVectorStore()
+            self.embedding_service = embedding_service or create_embedding_service()
+            if vector_store is not None:
+                self.vector_store = vector_store
+            elif config.vector_store_backend == "memory":
+                self.vector_store = InMemoryVectorStore(
+                    embedding_dim=self.embedding_service.get_embedding_dimension(),
+                    persist_directory=config.vector_db_memory_path,
+                    assume_normalized=config.normalize_embeddings,
+                )
+            else:
+                self.vector_store = ChromaVectorStore()
             self.retriever = retriever or Retriever(
                 embedding_service=self.embedding_service,
                 vector_store=self.vector_store,
             )
+            self.embed_batcher = EmbedBatcher(self.embedding_service)
+
+            # Кэши повторных запросов. Версия хранилища входит в ключ
+            # результатов и растёт при каждом изменении базы знаний
+            cache_size = config.cache_size if config.use_cache else 0
+            self._embedding_cache = LRUCache(cache_size)
+            self._results_cache = LRUCache(cache_size)
+            self._storage_version = 0
+
+            # Дисковый кэш "sha256 файла -> текст / embeddings чанков"
+            self.extraction_cache_path = (
+                config.extraction_cache_path if config.use_cache else None
+            )
+            if self.extraction_cache_path is not None:
+                self.extraction_cache_path.mkdir(parents=True, exist_ok=True)
 
             # Сохраняем config для использования в асинхронных методах
             self.config = config
 
+            # Реестр читают и меняют поиск (порядок LRU), загрузка и удаление
+            # из разных потоков to_thread: все обращения под этим локом
+            self._registry_lock = threading.RLock()
+
             # Создаём директорию для реестра если нужно
             self.documents_registry_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -151,10 +193,15 @@ class RAGManager:
 
         logger.info(f"Processing document: {file_path.name} (id={doc_id})")
 
+        file_digest = None
         try:
             # 1. Парсинг документа
             logger.debug("Step 1: Extracting text...")
-            text = self.file_converter.extract_text(file_path)
+            file_digest = self._file_digest(file_path) if self.extraction_cache_path else None
+            text = self._load_cached_text(file_digest)
+            if text is None:
+                text = self.file_converter.extract_text(file_path)
+                self._store_cached_text(file_digest, text)
             if not text or not text.strip():
                 raise RAGManagerError(f"No text extracted from {file_path.name}")
 
@@ -178,7 +225,11 @@ class RAGManager:
             # 3. Генерация embeddings
             logger.debug("Step 3: Generating embeddings...")
             texts = [chunk.text for chunk in chunks]
-            embeddings = self.embedding_service.embed_batch(texts)
+            embeddings = self._load_cached_embeddings(file_digest, len(texts))
+            if embeddings is None:
+                embeddings = self.embedding_service.embed_batch(texts)
+                self._store_cached_embeddings(file_digest, embeddings)
+            self._prune_extraction_cache()
 
             # Присваиваем embeddings чанкам
             for i, chunk in enumerate(chunks):
@@ -198,15 +249,13 @@ class RAGManager:
                 created_at=datetime.now().isoformat(),
                 metadata=base_metadata,
             )
+            if file_digest is not None:
+                # Чтобы удалить кэш файла вместе с документом
+                document.metadata = {**base_metadata, "file_digest": file_digest}
 
             # 6. Обновление реестра
             self._add_to_registry(document)
-
-            logger.info(
-                f"✓ Document added successfully: {doc_id} "
-                f"({len(chunks)} chunks, {len(text)} chars)"
-            )
-            return document
+            self._invalidate_search_cache()
 
         except Exception as e:
             logger.error(f"Error adding document: {e}")
@@ -215,8 +264,18 @@ class RAGManager:
                 self.vector_store.delete_by_doc_id(doc_id)
             except Exception:
                 pass
+            self._remove_cached_files(file_digest)
             raise RAGManagerError(f"Failed to add document: {e}") from e
 
+        # Вне try: документ уже в реестре, сбой вытеснения не должен его откатывать
+        self._enforce_chunk_budget(keep_doc_id=doc_id)
+
+        logger.info(
+            f"✓ Document added successfully: {doc_id} "
+            f"({len(chunks)} chunks, {len(text)} chars)"
+        )
+        return document
+
     async def add_document_async(
         self,
         file_path: Path,
@@ -258,6 +317,7 @@ class RAGManager:
         top_k: int = 5,
         filter_metadata: Optional[Dict[str, Any]] = None,
         min_similarity: Optional[float] = None,
+        query_embedding: Optional[np.ndarray] = None,
     ) -> List[SearchResult]:
         """Поиск по базе знаний (синхронно).
 
@@ -266,6 +326,7 @@ class RAGManager:
             top_k: Максимальное количество результатов
             filter_metadata: Фильтр по метаданным
             min_similarity: Минимальная схожесть (0-1)
+            query_embedding: Готовый embedding запроса (пропускает кодирование)
 
         Returns:
             Список SearchResult отсортированный по relevance
@@ -277,14 +338,26 @@ class RAGManager:
             logger.warning("Empty query provided")
             return []
 
+        cache_key = self._results_cache_key(query, top_k, filter_metadata, min_similarity)
+        cached = self._results_cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Search cache hit: '{query[:50]}'")
+            self._touch_documents(cached)
+            return list(cached)
+
         try:
             logger.info(f"Searching: '{query[:50]}...' (top_k={top_k})")
+            if query_embedding is None:
+                query_embedding = self._get_query_embedding(query)
             results = self.retriever.retrieve(
                 query=query,
                 top_k=top_k,
                 filter_metadata=filter_metadata,
                 min_similarity=min_similarity,
+                query_embedding=query_embedding,
             )
+            self._results_cache.put(cache_key, list(results))
+            self._touch_documents(results)
             logger.info(f"Found {len(results)} results")
             return results
 
@@ -301,7 +374,10 @@ class RAGManager:
     ) -> List[SearchResult]:
         """Поиск по базе знаний (асинхронно, неблокирующе).
 
-        Запускает синхронный search в thread pool.
+        Повторный запрос отдаётся из кэша без перехода в thread pool.
+        Иначе embedding запроса берётся из кэша или считается через общий
+        EmbedBatcher (одновременные запросы разных пользователей кодируются
+        одним батчем), затем синхронный search запускается в thread pool.
 
         Args:
             query: Текстовый запрос
@@ -315,7 +391,23 @@ class RAGManager:
         Raises:
             RAGManagerError: Если поиск не удался
         """
+        if not query or not query.strip():
+            logger.warning("Empty query provided")
+            return []
+
+        cached = self._results_cache.get(
+            self._results_cache_key(query, top_k, filter_metadata, min_similarity)
+        )
+        if cached is not None:
+            logger.debug(f"Search cache hit: '{query[:50]}'")
+            self._touch_documents(cached)
+            return list(cached)
+
         try:
+            query_embedding = self._embedding_cache.get(query)
+            if query_embedding is None:
+                query_embedding = await self.embed_batcher.submit(query)
+                self._embedding_cache.put(query, query_embedding)
             # Запускаем в thread pool, не блокируем event loop
             results = await asyncio.to_thread(
                 self.search,
@@ -323,6 +415,7 @@ class RAGManager:
                 top_k,
                 filter_metadata,
                 min_similarity,
+                query_embedding,
             )
             return results
         except Exception as e:
@@ -335,7 +428,8 @@ class RAGManager:
         Returns:
             Список Document объектов
         """
-        return list(self._registry.values())
+        with self._registry_lock:
+            return list(self._registry.values())
 
     def get_document(self, doc_id: str) -> Document:
         """Получить информацию о документе.
@@ -349,9 +443,11 @@ class RAGManager:
         Raises:
             DocumentNotFoundError: Если документ не найден
         """
-        if doc_id not in self._registry:
+        with self._registry_lock:
+            document = self._registry.get(doc_id)
+        if document is None:
             raise DocumentNotFoundError(f"Document not found: {doc_id}")
-        return self._registry[doc_id]
+        return document
 
     def delete_document(self, doc_id: str) -> None:
         """Удалить документ из базы знаний.
@@ -363,29 +459,35 @@ class RAGManager:
             DocumentNotFoundError: Если документ не найден
             RAGManagerError: Если удаление не удалось
         """
-        if doc_id not in self._registry:
-            raise DocumentNotFoundError(f"Document not found: {doc_id}")
+        with self._registry_lock:
+            if doc_id not in self._registry:
+                raise DocumentNotFoundError(f"Document not found: {doc_id}")
 
-        try:
-            logger.info(f"Deleting document: {doc_id}")
+            try:
+                logger.info(f"Deleting document: {doc_id}")
 
-            # Удаляем из vector store
-            self.vector_store.delete_by_doc_id(doc_id)
+                # Удаляем из vector store
+                self.vector_store.delete_by_doc_id(doc_id)
 
-            # Удаляем из реестра
-            del self._registry[doc_id]
-            self._save_registry()
+                # Удаляем из реестра
+                document = self._registry.pop(doc_id)
+                self._chunk_total -= document.chunk_count
+                self._save_registry()
+                self._invalidate_search_cache()
 
-            logger.info(f"✓ Document deleted: {doc_id}")
+                # Извлечённый текст и embeddings пользователя не переживают документ
+                self._remove_cached_files(document.metadata.get("file_digest"))
 
-        except Exception as e:
-            logger.error(f"Error deleting document: {e}")
-            raise RAGManagerError(f"Failed to delete document: {e}") from e
+                logger.info(f"✓ Document deleted: {doc_id}")
+
+            except Exception as e:
+                logger.error(f"Error deleting document: {e}")
+                raise RAGManagerError(f"Failed to delete document: {e}") from e
 
     def clear_all(self) -> None:
         """Очистить всю базу знаний.
 
-        Удаляет все документы и чанки.
+        Удаляет все документы, чанки и кэш извлечённого текста.
 
         Raises:
             RAGManagerError: Если очистка не удалась
@@ -397,8 +499,16 @@ class RAGManager:
             self.vector_store.clear_all()
 
             # Очищаем реестр
-            self._registry = {}
-            self._save_registry()
+            with self._registry_lock:
+                self._registry = {}
+                self._chunk_total = 0
+                self._save_registry()
+            self._invalidate_search_cache()
+
+            # Очищаем кэш извлечённого текста и embeddings
+            if self.extraction_cache_path is not None:
+                shutil.rmtree(self.extraction_cache_path, ignore_errors=True)
+                self.extraction_cache_path.mkdir(parents=True, exist_ok=True)
 
             logger.info("✓ All data cleared")
 
@@ -406,6 +516,20 @@ class RAGManager:
             logger.error(f"Error clearing data: {e}")
             raise RAGManagerError(f"Failed to clear data: {e}") from e
 
+    def get_counts(self) -> Dict[str, int]:
+        """Получить число документов и чанков за O(1).
+
+        Для частых экранов (меню), где не нужен полный get_stats():
+        счётчики ведутся при изменении реестра.
+
+        Returns:
+            Словарь с total_documents и total_chunks
+        """
+        return {
+            "total_documents": len(self._registry),
+            "total_chunks": self._chunk_total,
+        }
+
     def get_stats(self) -> Dict[str, Any]:
         """Получить статистику RAG системы.
 
@@ -413,8 +537,10 @@ class RAGManager:
             Словарь со статистикой
         """
         retriever_stats = self.retriever.get_stats()
+        with self._registry_lock:
+            documents = list(self._registry.values())
         return {
-            "total_documents": len(self._registry),
+            "total_documents": len(documents),
             "total_chunks": self.vector_store.count(),
             "embedding_dimension": retriever_stats["embedding_dimension"],
             "similarity_threshold": retriever_stats["similarity_threshold"],
@@ -425,12 +551,154 @@ class RAGManager:
                     "chunks": doc.chunk_count,
                     "size": doc.file_size,
                 }
-                for doc in self._registry.values()
+                for doc in documents
             ],
         }
 
     # ---------- Внутренние методы ----------
 
+    def _file_digest(self, file_path: Path) -> str:
+        """SHA-256 содержимого файла (читается блоками)."""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(self.HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _embeddings_cache_file(self, file_digest: str) -> Path:
+        """Файл кэша embeddings: зависит от модели и параметров чанкинга."""
+        settings = (
+            f"{self.embedding_service.model_name}|"
+            f"{self.chunker.chunk_size}|{self.chunker.chunk_overlap}"
+        )
+        settings_key = hashlib.sha256(settings.encode("utf-8")).hexdigest()[:12]
+        return self.extraction_cache_path / f"{file_digest}_{settings_key}.npy"
+
+    def _load_cached_text(self, file_digest: Optional[str]) -> Optional[str]:
+        """Прочитать ранее извлечённый текст файла из кэша."""
+        if file_digest is None:
+            return None
+        cache_file = self.extraction_cache_path / f"{file_digest}.txt"
+        if not cache_file.exists():
+            return None
+        logger.info(f"Extraction cache hit: {file_digest[:12]}")
+        return cache_file.read_text(encoding="utf-8")
+
+    def _store_cached_text(self, file_digest: Optional[str], text: str) -> None:
+        """Сохранить извлечённый текст в кэш (ошибки кэша не критичны)."""
+        if file_digest is None or not text or not text.strip():
+            return
+        try:
+            (self.extraction_cache_path / f"{file_digest}.txt").write_text(
+                text, encoding="utf-8"
+            )
+        except OSError as e:
+            logger.warning(f"Failed to write extraction cache: {e}")
+
+    def _load_cached_embeddings(
+        self, file_digest: Optional[str], chunk_count: int
+    ) -> Optional[np.ndarray]:
+        """Прочитать embeddings чанков файла из кэша."""
+        if file_digest is None:
+            return None
+        cache_file = self._embeddings_cache_file(file_digest)
+        if not cache_file.exists():
+            return None
+        embeddings = np.load(cache_file)
+        if embeddings.shape[0] != chunk_count:
+            return None
+        logger.info(f"Embeddings cache hit: {file_digest[:12]} ({chunk_count} chunks)")
+        return embeddings
+
+    def _store_cached_embeddings(
+        self, file_digest: Optional[str], embeddings: np.ndarray
+    ) -> None:
+        """Сохранить embeddings чанков в кэш (ошибки кэша не критичны)."""
+        if file_digest is None:
+            return
+        try:
+            np.save(self._embeddings_cache_file(file_digest), embeddings)
+        except OSError as e:
+            logger.warning(f"Failed to write embeddings cache: {e}")
+
+    def _remove_cached_files(self, file_digest: Optional[str]) -> None:
+        """Удалить кэш текста и embeddings файла, если он больше не нужен.
+
+        Файл остаётся, пока его использует другой документ реестра
+        (тот же файл, загруженный под другим id).
+        """
+        if file_digest is None or self.extraction_cache_path is None:
+            return
+        with self._registry_lock:
+            if any(
+                doc.metadata.get("file_digest") == file_digest
+                for doc in self._registry.values()
+            ):
+                return
+        for cache_file in self.extraction_cache_path.glob(f"{file_digest}*"):
+            try:
+                cache_file.unlink()
+            except OSError as e:
+                logger.warning(f"Failed to remove cache file {cache_file.name}: {e}")
+
+    def _prune_extraction_cache(self) -> None:
+        """Удалить самые старые файлы кэша сверх config.extraction_cache_max_mb."""
+        limit = self.config.extraction_cache_max_mb * 1024 * 1024
+        if self.extraction_cache_path is None or not limit:
+            return
+        try:
+            entries = [
+                (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                for entry in os.scandir(self.extraction_cache_path)
+                if entry.is_file()
+            ]
+        except OSError as e:
+            logger.warning(f"Failed to scan extraction cache: {e}")
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError as e:
+                logger.warning(f"Failed to prune cache file {path}: {e}")
+
+    def _results_cache_key(
+        self,
+        query: str,
+        top_k: int,
+        filter_metadata: Optional[Dict[str, Any]],
+        min_similarity: Optional[float],
+    ) -> tuple:
+        """Ключ кэша результатов поиска (включает версию хранилища).
+
+        Запрос берётся как есть: модель embeddings различает регистр и
+        пробелы, "Apple" и "apple" могут дать разные результаты.
+        """
+        filter_key = sorted(filter_metadata.items()) if filter_metadata else None
+        return (
+            query,
+            top_k,
+            repr(filter_key),
+            min_similarity,
+            self._storage_version,
+        )
+
+    def _get_query_embedding(self, query: str) -> np.ndarray:
+        """Получить embedding запроса из кэша или посчитать его."""
+        embedding = self._embedding_cache.get(query)
+        if embedding is None:
+            embedding = self.embedding_service.embed(query)
+            self._embedding_cache.put(query, embedding)
+        return embedding
+
+    def _invalidate_search_cache(self) -> None:
+        """Сбросить кэш результатов после изменения базы знаний."""
+        self._storage_version += 1
+        self._results_cache.clear()
+
     def _load_or_create_registry(self) -> None:
         """Загружить существующий реестр или создать новый."""
         if self.documents_registry_path.exists():
@@ -449,23 +717,26 @@ class RAGManager:
             self._registry = {}
             logger.info("Created new documents registry")
 
+        self._chunk_total = sum(doc.chunk_count for doc in self._registry.values())
+
     def _save_registry(self) -> None:
         """Сохранить реестр на диск."""
         try:
-            data = {
-                doc_id: {
-                    "id": doc.id,
-                    "filename": doc.filename,
-                    "file_path": doc.file_path,
-                    "file_size": doc.file_size,
-                    "chunk_count": doc.chunk_count,
-                    "created_at": doc.created_at,
-                    "metadata": doc.metadata,
+            with self._registry_lock:
+                data = {
+                    doc_id: {
+                        "id": doc.id,
+                        "filename": doc.filename,
+                        "file_path": doc.file_path,
+                        "file_size": doc.file_size,
+                        "chunk_count": doc.chunk_count,
+                        "created_at": doc.created_at,
+                        "metadata": doc.metadata,
+                    }
+                    for doc_id, doc in self._registry.items()
                 }
-                for doc_id, doc in self._registry.items()
-            }
-            with open(self.documents_registry_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+                with open(self.documents_registry_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
             logger.debug("Registry saved")
         except Exception as e:
             logger.error(f"Failed to save registry: {e}")
@@ -473,5 +744,51 @@ class RAGManager:
 
     def _add_to_registry(self, document: Document) -> None:
         """Добавить документ в реестр."""
-        self._registry[document.id] = document
-        self._save_registry()
+        with self._registry_lock:
+            previous = self._registry.pop(document.id, None)
+            if previous is not None:
+                self._chunk_total -= previous.chunk_count
+            # Реестр упорядочен от давно использованных к недавним (для LRU)
+            self._registry[document.id] = document
+            self._chunk_total += document.chunk_count
+            self._save_registry()
+
+    def _touch_documents(self, results: List[SearchResult]) -> None:
+        """Отметить документы из результатов поиска как недавно использованные.
+
+        Порядок меняется только в памяти; на диск он попадает при
+        следующем сохранении реестра.
+        """
+        doc_ids = dict.fromkeys(result.doc_id for result in results)
+        with self._registry_lock:
+            for doc_id in doc_ids:
+                document = self._registry.pop(doc_id, None)
+                if document is not None:
+                    self._registry[doc_id] = document
+
+    def _enforce_chunk_budget(self, keep_doc_id: str) -> None:
+        """Вытеснить давно не использованные документы сверх config.max_total_chunks.
+
+        Args:
+            keep_doc_id: Только что добавленный документ (не вытесняется)
+        """
+        budget = self.config.max_total_chunks
+        if not budget:
+            return
+        # Выбор и удаление под одной блокировкой: параллельные add_document
+        # не вытесняют один и тот же документ дважды
+        with self._registry_lock:
+            while self._chunk_total > budget:
+                oldest = next(iter(self._registry), None)
+                if oldest is None or oldest == keep_doc_id:
+                    break
+                logger.info(
+                    f"Chunk budget {budget} exceeded ({self._chunk_total}), "
+                    f"evicting least recently used document {oldest}"
+                )
+                try:
+                    self.delete_document(oldest)
+                except RAGException as e:
+                    # Загрузка уже прошла; бюджет догоним при следующей
+                    logger.warning(f"Eviction of {oldest} failed: {e}")
+                    break
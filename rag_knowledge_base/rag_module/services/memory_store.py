@@ -0,0 +1,487 @@
+"""In-process vector store on NumPy.
+
+Векторное хранилище в памяти процесса без внешних зависимостей.
+Все embeddings лежат в одной матрице float32 с L2-нормализованными
+строками, поэтому cosine similarity для всех чанков считается одним
+умножением матрицы на вектор запроса (BLAS), без цикла по чанкам.
+
+Интерфейс совпадает с ChromaVectorStore:
+- add_chunks / search / delete_by_doc_id / clear_all / count
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence, Union
+
+import numpy as np
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+from rag_module.config import get_config
+from rag_module.models import Chunk, SearchResult
+from rag_module.exceptions import RAGException
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryStoreError(RAGException):
+    """Ошибка при работе с in-memory хранилищем."""
+
+
+class InMemoryVectorStore:
+    """Векторное хранилище в памяти на основе NumPy.
+
+    Embeddings хранятся построчно в матрице (capacity, dim), из которой
+    заняты первые size строк; метаданные чанков — в параллельных списках.
+    При нехватке места матрица растёт геометрически (x2), поэтому
+    добавление чанков не копирует весь индекс на каждой загрузке.
+    Поиск: scores = matrix[:size] @ query.
+
+    В режиме int8 нормализованные строки хранятся как round(x * 127):
+    в 4 раза меньше памяти, погрешность cosine ~1e-2. В режиме float16 —
+    вдвое меньше памяти при погрешности ~1e-3. В обоих режимах строки
+    приводятся к float32 блоками по SCORE_BLOCK_ROWS прямо перед умножением
+    (BLAS есть только для float), так что экономится память, а не время поиска.
+
+    Если задан persist_directory, матрица сохраняется в embeddings.npy,
+    а тексты и метаданные — в chunks.json после каждого изменения.
+    При старте матрица открывается через np.load(mmap_mode="r"): данные
+    подтягиваются с диска страницами ОС по мере поиска и копируются
+    в память процесса только при первом изменении.
+
+    Если установлен faiss и матрица хранится в float32, поиск без фильтра
+    выполняет faiss.IndexFlatIP (точный inner product на SIMD-ядрах),
+    который ведётся параллельно матрице.
+
+    Attributes:
+        embedding_dim: Размерность векторов
+        storage_dtype: Тип хранения матрицы (float32, float16, int8)
+        persist_directory: Директория для сохранения (None — только в памяти)
+        use_faiss: Используется ли faiss-индекс для поиска
+    """
+
+    INITIAL_CAPACITY = 256
+    MATRIX_FILENAME = "embeddings.npy"
+    CHUNKS_FILENAME = "chunks.json"
+    STORAGE_DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+    INT8_SCALE = 127.0
+    SCORE_BLOCK_ROWS = 8192
+
+    def __init__(
+        self,
+        embedding_dim: Optional[int] = None,
+        initial_capacity: Optional[int] = None,
+        storage_dtype: Optional[str] = None,
+        persist_directory: Optional[Path] = None,
+        use_faiss: Optional[bool] = None,
+        assume_normalized: bool = False,
+    ) -> None:
+        """Инициализация хранилища.
+
+        Args:
+            embedding_dim: Размерность векторов (по умолчанию из config)
+            initial_capacity: Начальное число строк матрицы
+            storage_dtype: Тип хранения матрицы (по умолчанию из config)
+            persist_directory: Директория для сохранения на диск
+            use_faiss: Использовать faiss (по умолчанию — если установлен
+                и тип хранения float32)
+            assume_normalized: Векторы чанков и запросов уже L2-нормированы
+                (например, EmbeddingService с normalize_embeddings) — тогда
+                повторная нормализация при добавлении и поиске пропускается
+
+        Raises:
+            MemoryStoreError: Если тип хранения не поддерживается,
+                faiss недоступен при use_faiss=True
+                или сохранённые данные не совпадают по формату
+        """
+        config = get_config()
+        self.embedding_dim = embedding_dim or config.embedding_dimension
+        self.initial_capacity = initial_capacity or self.INITIAL_CAPACITY
+        self.storage_dtype = storage_dtype or config.vector_store_dtype
+        if self.storage_dtype not in self.STORAGE_DTYPES:
+            raise MemoryStoreError(
+                f"Unsupported storage dtype: {self.storage_dtype} "
+                f"(expected one of {sorted(self.STORAGE_DTYPES)})"
+            )
+        self._dtype = self.STORAGE_DTYPES[self.storage_dtype]
+
+        if use_faiss is None:
+            use_faiss = faiss is not None and self._dtype is np.float32
+        elif use_faiss and (faiss is None or self._dtype is not np.float32):
+            raise MemoryStoreError(
+                "faiss search requires faiss-cpu installed and float32 storage"
+            )
+        self.use_faiss = use_faiss
+        self.assume_normalized = assume_normalized
+        self._index = faiss.IndexFlatIP(self.embedding_dim) if use_faiss else None
+
+        self._matrix = np.empty((self.initial_capacity, self.embedding_dim), dtype=self._dtype)
+        self._size = 0
+        self._ids: List[str] = []
+        self._doc_ids: List[str] = []
+        self._texts: List[str] = []
+        self._positions: List[int] = []
+        self._pages: List[Optional[int]] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        # add/search/delete идут из разных потоков to_thread: изменения
+        # и чтение матрицы с метаданными не должны перемежаться
+        self._lock = threading.RLock()
+
+        self.persist_directory = persist_directory
+        if self.persist_directory is not None:
+            self.persist_directory.mkdir(parents=True, exist_ok=True)
+            self._load()
+            self._rebuild_index()
+
+        logger.info(
+            f"✓ In-memory vector store ready "
+            f"(dim={self.embedding_dim}, dtype={self.storage_dtype})"
+        )
+
+    # ---------- Публичный API ----------
+
+    def add_chunks(self, chunks: List[Chunk]) -> None:
+        """Добавить чанки с embeddings в хранилище.
+
+        Args:
+            chunks: Список чанков с заполненными embeddings
+
+        Raises:
+            MemoryStoreError: Если размерность embeddings не совпадает
+        """
+        valid = [
+            chunk for chunk in chunks
+            if chunk.embedding is not None and len(chunk.embedding) > 0
+        ]
+        if len(valid) < len(chunks):
+            logger.warning(f"Skipped {len(chunks) - len(valid)} chunks without embedding")
+        if not valid:
+            return
+
+        vectors = np.asarray([chunk.embedding for chunk in valid], dtype=np.float32)
+        if vectors.shape[1] != self.embedding_dim:
+            raise MemoryStoreError(
+                f"Embedding dimension mismatch: expected {self.embedding_dim}, "
+                f"got {vectors.shape[1]}"
+            )
+
+        if not self.assume_normalized:
+            self._normalize_rows(vectors)
+        rows = self._encode_rows(vectors)
+
+        with self._lock:
+            start = self._size
+            end = start + len(valid)
+            self._ensure_capacity(end)
+            self._matrix[start:end] = rows
+
+            for chunk in valid:
+                self._ids.append(chunk.chunk_id)
+                self._doc_ids.append(chunk.doc_id)
+                self._texts.append(chunk.text)
+                self._positions.append(chunk.position)
+                self._pages.append(chunk.page_number)
+                self._metadatas.append(dict(chunk.metadata or {}))
+
+            # Строки видны поиску только после того, как готовы метаданные
+            if self._index is not None:
+                self._index.add(self._matrix[start:end])
+            self._size = end
+            self._save()
+        logger.info(f"Added {len(valid)} chunks to in-memory store")
+
+    def search(
+        self,
+        query_embedding: Union[Sequence[float], np.ndarray],
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        min_similarity: Optional[float] = None,
+    ) -> List[SearchResult]:
+        """Поиск по сходству embeddings.
+
+        Порог min_similarity применяется булевой маской к массиву оценок
+        до выбора top-k, поэтому SearchResult создаются только для
+        прошедших порог строк.
+
+        Args:
+            query_embedding: Вектор запроса
+            top_k: Количество результатов
+            filter_metadata: Фильтр по метаданным (точное совпадение значений)
+            min_similarity: Минимальная схожесть (0-1), None — без порога
+
+        Returns:
+            Список SearchResult отсортированный по similarity_score
+        """
+        if top_k <= 0 or len(query_embedding) == 0:
+            return []
+
+        query = np.array(query_embedding, dtype=np.float32)
+        if not self.assume_normalized:
+            self._normalize_rows(query)
+
+        with self._lock:
+            return self._search_locked(query, top_k, filter_metadata, min_similarity)
+
+    def _search_locked(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        filter_metadata: Optional[Dict[str, Any]],
+        min_similarity: Optional[float],
+    ) -> List[SearchResult]:
+        """Поиск по нормализованному запросу (вызывается под self._lock)."""
+        if not self._size:
+            return []
+        matrix = self._matrix[:self._size]
+        # similarity = (cos + 1) / 2  ->  порог в пространстве cosine
+        min_cosine = 2.0 * min_similarity - 1.0 if min_similarity is not None else None
+
+        if self._index is not None and not filter_metadata:
+            found_scores, found_ids = self._index.search(
+                query.reshape(1, -1), min(top_k, self._size)
+            )
+            hits = found_ids[0] >= 0
+            if min_cosine is not None:
+                hits &= found_scores[0] >= min_cosine
+            return self._build_results(found_ids[0][hits], found_scores[0][hits])
+
+        if filter_metadata:
+            candidates = np.fromiter(
+                (
+                    i for i, meta in enumerate(self._metadatas)
+                    if self._matches(i, meta, filter_metadata)
+                ),
+                dtype=np.intp,
+            )
+            if candidates.size == 0:
+                return []
+            scores = self._scores(matrix[candidates], query)
+        else:
+            candidates = None
+            scores = self._scores(matrix, query)
+
+        if min_cosine is not None:
+            passed = np.flatnonzero(scores >= min_cosine)
+            if passed.size == 0:
+                return []
+            candidates = candidates[passed] if candidates is not None else passed
+            scores = scores[passed]
+
+        order = self._top_k(scores, top_k)
+        indices = candidates[order] if candidates is not None else order
+        return self._build_results(indices, scores[order])
+
+    def delete_by_doc_id(self, doc_id: str) -> None:
+        """Удалить все чанки документа.
+
+        Args:
+            doc_id: ID документа
+        """
+        with self._lock:
+            keep = [i for i, value in enumerate(self._doc_ids) if value != doc_id]
+            if len(keep) == len(self._doc_ids):
+                return
+
+            # Уплотняем строки на месте, ёмкость матрицы сохраняется
+            # (read-only memmap с диска просто заменяется копией в памяти)
+            new_size = len(keep)
+            if self._matrix.flags.writeable:
+                self._matrix[:new_size] = self._matrix[keep]
+            else:
+                self._matrix = self._matrix[keep]
+            self._size = new_size
+            self._ids = [self._ids[i] for i in keep]
+            self._doc_ids = [self._doc_ids[i] for i in keep]
+            self._texts = [self._texts[i] for i in keep]
+            self._positions = [self._positions[i] for i in keep]
+            self._pages = [self._pages[i] for i in keep]
+            self._metadatas = [self._metadatas[i] for i in keep]
+            self._rebuild_index()
+            self._save()
+            logger.info(f"Deleted all chunks for doc_id: {doc_id}")
+
+    def clear_all(self) -> None:
+        """Очистить все данные из хранилища."""
+        with self._lock:
+            self._matrix = np.empty((self.initial_capacity, self.embedding_dim), dtype=self._dtype)
+            self._size = 0
+            self._ids = []
+            self._doc_ids = []
+            self._texts = []
+            self._positions = []
+            self._pages = []
+            self._metadatas = []
+            self._rebuild_index()
+            self._save()
+            logger.info("Cleared all data from in-memory store")
+
+    def count(self) -> int:
+        """Получить количество чанков в хранилище.
+
+        Returns:
+            Количество чанков
+        """
+        return self._size
+
+    # ---------- Внутренние методы ----------
+
+    def _ensure_capacity(self, required: int) -> None:
+        """Расширить матрицу (x2), если в ней меньше required строк."""
+        capacity = self._matrix.shape[0]
+        if required <= capacity and self._matrix.flags.writeable:
+            return
+
+        new_capacity = max(2 * capacity, required)
+        grown = np.empty((new_capacity, self.embedding_dim), dtype=self._dtype)
+        grown[:self._size] = self._matrix[:self._size]
+        self._matrix = grown
+        logger.debug(f"Grew in-memory store capacity {capacity} -> {new_capacity}")
+
+    def _load(self) -> None:
+        """Загрузить сохранённые данные (матрица — через memmap)."""
+        matrix_path = self.persist_directory / self.MATRIX_FILENAME
+        chunks_path = self.persist_directory / self.CHUNKS_FILENAME
+        if not matrix_path.exists() or not chunks_path.exists():
+            return
+
+        matrix = np.load(matrix_path, mmap_mode="r")
+        with open(chunks_path, "r", encoding="utf-8") as f:
+            chunks = json.load(f)
+
+        if matrix.dtype != self._dtype or matrix.shape[1:] != (self.embedding_dim,):
+            raise MemoryStoreError(
+                f"Stored matrix {matrix.dtype}{matrix.shape} does not match "
+                f"store settings ({self.storage_dtype}, dim={self.embedding_dim})"
+            )
+        if len(chunks["ids"]) != matrix.shape[0]:
+            raise MemoryStoreError(
+                f"Stored chunks ({len(chunks['ids'])}) and matrix rows "
+                f"({matrix.shape[0]}) are out of sync"
+            )
+
+        self._matrix = matrix
+        self._size = matrix.shape[0]
+        self._ids = chunks["ids"]
+        self._doc_ids = chunks["doc_ids"]
+        self._texts = chunks["texts"]
+        self._positions = chunks["positions"]
+        self._pages = chunks["pages"]
+        self._metadatas = chunks["metadatas"]
+        logger.info(f"Loaded {self._size} chunks from {self.persist_directory}")
+
+    def _save(self) -> None:
+        """Сохранить матрицу и метаданные на диск (атомарная замена файлов)."""
+        if self.persist_directory is None:
+            return
+
+        matrix_path = self.persist_directory / self.MATRIX_FILENAME
+        chunks_path = self.persist_directory / self.CHUNKS_FILENAME
+        matrix_tmp = matrix_path.with_name(matrix_path.name + ".tmp")
+        chunks_tmp = chunks_path.with_name(chunks_path.name + ".tmp")
+
+        with open(matrix_tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(self._matrix[:self._size]))
+        with open(chunks_tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "ids": self._ids,
+                    "doc_ids": self._doc_ids,
+                    "texts": self._texts,
+                    "positions": self._positions,
+                    "pages": self._pages,
+                    "metadatas": self._metadatas,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(matrix_tmp, matrix_path)
+        os.replace(chunks_tmp, chunks_path)
+
+    def _encode_rows(self, vectors: np.ndarray) -> np.ndarray:
+        """Перевести нормализованные float32 строки в тип хранения."""
+        if self._dtype is np.int8:
+            return np.rint(vectors * self.INT8_SCALE).astype(np.int8)
+        if self._dtype is np.float16:
+            return vectors.astype(np.float16)
+        return vectors
+
+    def _scores(self, matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Cosine similarity строк матрицы с нормализованным запросом."""
+        if self._dtype is np.float32:
+            return matrix @ query
+        # В NumPy нет BLAS для float16/int8: приводим блоками, чтобы не
+        # держать float32-копию всей матрицы
+        if self._dtype is np.int8:
+            query = query / self.INT8_SCALE
+        scores = np.empty(len(matrix), dtype=np.float32)
+        for start in range(0, len(matrix), self.SCORE_BLOCK_ROWS):
+            block = matrix[start:start + self.SCORE_BLOCK_ROWS]
+            scores[start:start + len(block)] = block.astype(np.float32) @ query
+        return scores
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """Индексы k лучших оценок по убыванию.
+
+        np.argpartition выделяет k лучших за O(N), сортируются только они.
+        """
+        if k >= len(scores):
+            return np.argsort(-scores)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top])]
+
+    @staticmethod
+    def _normalize_rows(vectors: np.ndarray) -> None:
+        """L2-нормализация вектора или строк матрицы на месте (нулевые остаются нулевыми)."""
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors /= norms
+
+    def _matches(self, idx: int, meta: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+        """Проверить чанк на совпадение с фильтром метаданных."""
+        for key, expected in filters.items():
+            value = self._doc_ids[idx] if key == "doc_id" else meta.get(key)
+            if value != expected:
+                return False
+        return True
+
+    def _rebuild_index(self) -> None:
+        """Пересобрать faiss-индекс по текущей матрице."""
+        if self._index is None:
+            return
+        self._index.reset()
+        if self._size:
+            self._index.add(np.ascontiguousarray(self._matrix[:self._size]))
+
+    def _build_results(self, indices: np.ndarray, scores: np.ndarray) -> List[SearchResult]:
+        """Собрать SearchResult по индексам строк и их cosine-оценкам."""
+        results = []
+        for idx, score in zip(indices.tolist(), scores.tolist()):
+            # cosine в [-1, 1] -> similarity в [0, 1], как в ChromaVectorStore
+            similarity_score = min(max((score + 1.0) / 2.0, 0.0), 1.0)
+            results.append(self._build_result(idx, similarity_score))
+
+        logger.info(f"Found {len(results)} results")
+        return results
+
+    def _build_result(self, idx: int, similarity_score: float) -> SearchResult:
+        """Собрать SearchResult для строки матрицы."""
+        metadata = self._metadatas[idx]
+        return SearchResult(
+            chunk_id=self._ids[idx],
+            doc_id=self._doc_ids[idx],
+            text=self._texts[idx],
+            similarity_score=similarity_score,
+            source_doc=metadata.get("source_file", self._doc_ids[idx]),
+            page_number=self._pages[idx],
+            position=self._positions[idx],
+            metadata=metadata,
+        )
@@ -7,18 +7,21 @@
 1. Получаем текстовый запрос
 2. Генерируем embedding запроса (EmbeddingService)
 3. Ищем похожие чанки (VectorStore)
-4. Фильтруем по threshold, сортируем, возвращаем SearchResult
+4. VectorStore отсекает по threshold и возвращает отсортированные SearchResult
 """
 
 from __future__ import annotations
 
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
+
+import numpy as np
 
 from rag_module.config import get_config
 from rag_module.models import SearchResult
-from rag_module.services.embeddings import EmbeddingService
+from rag_module.services.embeddings import EmbeddingService, create_embedding_service
 from rag_module.services.vector_store import ChromaVectorStore
+from rag_module.services.memory_store import InMemoryVectorStore
 from rag_module.exceptions import RAGException
 
 logger = logging.getLogger(__name__)
@@ -43,7 +46,7 @@ class Retriever:
     def __init__(
         self,
         embedding_service: Optional[EmbeddingService] = None,
-        vector_store: Optional[ChromaVectorStore] = None,
+        vector_store: Optional[Union[ChromaVectorStore, InMemoryVectorStore]] = None,
         similarity_threshold: Optional[float] = None,
     ) -> None:
         """Инициализация retriever.
@@ -60,7 +63,7 @@ class Retriever:
         self.similarity_threshold = similarity_threshold or config.similarity_threshold
 
         try:
-            self.embedding_service = embedding_service or EmbeddingService()
+            self.embedding_service = embedding_service or create_embedding_service()
             self.vector_store = vector_store or ChromaVectorStore()
             logger.info(
                 f"✓ Retriever initialized with threshold={self.similarity_threshold}"
@@ -77,6 +80,7 @@ class Retriever:
         top_k: int = 5,
         filter_metadata: Optional[Dict[str, Any]] = None,
         min_similarity: Optional[float] = None,
+        query_embedding: Optional[np.ndarray] = None,
     ) -> List[SearchResult]:
         """Поиск по текстовому запросу.
 
@@ -85,6 +89,7 @@ class Retriever:
             top_k: Максимальное количество результатов
             filter_metadata: Фильтр по метаданным
             min_similarity: Минимальная схожесть (переопределяет threshold)
+            query_embedding: Готовый embedding запроса (пропускает кодирование)
 
         Returns:
             Список SearchResult, отсортированный по similarity_score (от большего к меньшему)
@@ -99,9 +104,10 @@ class Retriever:
         threshold = min_similarity if min_similarity is not None else self.similarity_threshold
 
         try:
-            # 1. Генерируем embedding запроса
-            logger.debug(f"Embedding query: {query[:50]}...")
-            query_embedding = self.embedding_service.embed(query)
+            # 1. Генерируем embedding запроса (если не передан готовый)
+            if query_embedding is None:
+                logger.debug(f"Embedding query: {query[:50]}...")
+                query_embedding = self.embedding_service.embed(query)
 
             # 2. Поиск в vector store
             logger.debug(f"Searching vector store (top_k={top_k})")
@@ -109,21 +115,12 @@ class Retriever:
                 query_embedding=query_embedding.tolist(),
                 top_k=top_k,
                 filter_metadata=filter_metadata,
+                # 3. Порог отсекается в самом хранилище, до сборки SearchResult
+                min_similarity=threshold,
             )
 
-            # 3. Фильтруем по threshold
-            filtered_results = [
-                result for result in results if result.similarity_score >= threshold
-            ]
-
-            # 4. Сортируем по similarity_score (от большего к меньшему)
-            filtered_results.sort(key=lambda x: x.similarity_score, reverse=True)
-
-            logger.info(
-                f"Found {len(filtered_results)} results above threshold {threshold:.2f} "
-                f"(out of {len(results)} total)"
-            )
-            return filtered_results
+            logger.info(f"Found {len(results)} results above threshold {threshold:.2f}")
+            return results
 
         except Exception as e:
             logger.error(f"Error during retrieval: {e}")
@@ -151,6 +151,7 @@ class ChromaVectorStore:
         query_embedding: List[float],
         top_k: int = 5,
         filter_metadata: Optional[Dict[str, Any]] = None,
+        min_similarity: Optional[float] = None,
     ) -> List[SearchResult]:
         """Поиск по сходству embeddings.
 
@@ -158,6 +159,7 @@ class ChromaVectorStore:
             query_embedding: Вектор запроса
             top_k: Количество результатов
             filter_metadata: Фильтр по метаданным
+            min_similarity: Минимальная схожесть (0-1), None — без порога
 
         Returns:
             Список SearchResult отсортированный по similarity_score
@@ -188,6 +190,10 @@ class ChromaVectorStore:
                     # Конвертируем в similarity (1=идентичные, 0=противоположные)
                     similarity_score = 1.0 - (distance / 2.0)
 
+                    # Результаты идут по убыванию similarity: дальше только хуже
+                    if min_similarity is not None and similarity_score < min_similarity:
+                        break
+
                     # Восстанавливаем Chunk из результата
                     chunk = Chunk(
                         id=chunk_id,
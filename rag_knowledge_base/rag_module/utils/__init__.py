@@ -4,6 +4,7 @@ Utility modules for validation, formatting, and logging:
   - validators: Input validation and sanitization
   - formatters: Output formatting and presentation
   - logger: Structured logging configuration
+  - cache: Thread-safe LRU cache
 """
 
 from rag_module.utils.validators import (
@@ -19,6 +20,7 @@ from rag_module.utils.formatters import (
     format_stats,
 )
 from rag_module.utils.logger import setup_logger, get_logger
+from rag_module.utils.cache import LRUCache
 
 __all__ = [
     # Validators
@@ -34,4 +36,6 @@ __all__ = [
     # Logger
     "setup_logger",
     "get_logger",
+    # Cache
+    "LRUCache",
 ]
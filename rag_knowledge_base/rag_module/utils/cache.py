@@ -0,0 +1,67 @@
+"""In-process LRU cache for RAG module.
+
+Потокобезопасный LRU-кэш фиксированного размера. Используется для
+кэширования embeddings запросов и результатов поиска: методы
+RAGManager вызываются и из event loop, и из thread pool.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """LRU-кэш с ограничением по количеству элементов.
+    
+    Attributes:
+        maxsize: Максимальное количество элементов
+    """
+    
+    def __init__(self, maxsize: int = 1000) -> None:
+        """Инициализация кэша.
+        
+        Args:
+            maxsize: Максимальное количество элементов
+        """
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Получить значение и отметить его как недавно использованное.
+        
+        Args:
+            key: Ключ
+            
+        Returns:
+            Значение или None, если ключа нет
+        """
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            return self._data[key]
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """Сохранить значение, вытеснив самое старое при переполнении.
+        
+        Args:
+            key: Ключ
+            value: Значение
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Очистить кэш."""
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
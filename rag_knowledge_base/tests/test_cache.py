@@ -0,0 +1,46 @@
+"""Tests for LRUCache.
+
+Тесты для LRU-кэша embeddings и результатов поиска.
+"""
+
+from rag_module.utils.cache import LRUCache
+
+
+class TestLRUCache:
+    """Тесты для LRUCache."""
+
+    def test_get_put(self):
+        """Тест сохранения и получения значения."""
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+
+    def test_evicts_least_recently_used(self):
+        """Тест вытеснения самого старого элемента."""
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")  # "a" становится самым свежим
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_zero_size_disables_cache(self):
+        """Тест отключённого кэша (maxsize=0)."""
+        cache = LRUCache(maxsize=0)
+        cache.put("a", 1)
+
+        assert cache.get("a") is None
+
+    def test_clear(self):
+        """Тест очистки."""
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.clear()
+
+        assert len(cache) == 0
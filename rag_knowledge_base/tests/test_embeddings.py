@@ -3,11 +3,13 @@
 Тесты для сервиса генерации embeddings через Sentence-Transformers.
 """
 
+import asyncio
+
 import pytest
 import numpy as np
 from pathlib import Path
 
-from rag_module.services.embeddings import EmbeddingService, EmbeddingError
+from rag_module.services.embeddings import EmbeddingService, EmbeddingError, EmbedBatcher
 
 
 class TestEmbeddingService:
@@ -232,3 +234,49 @@ class TestEmbeddingServicePerformance:
         # Batch должен быть быстрее (обычно в 2-3 раза)
         print(f"Sequential: {sequential_time:.3f}s, Batch: {batch_time:.3f}s")
         # Не делаем строгую проверку т.к. зависит от железа
+
+
+class _FakeEmbeddingService:
+    """Заглушка: embedding = [длина текста], запоминает батчи."""
+
+    def __init__(self):
+        self.batches = []
+
+    def embed_batch(self, texts):
+        self.batches.append(list(texts))
+        return np.array([[len(t)] for t in texts], dtype=np.float32)
+
+
+class TestEmbedBatcher:
+    """Тесты для EmbedBatcher."""
+
+    def test_concurrent_submits_share_one_batch(self):
+        """Одновременные запросы кодируются одним батчем, результаты по адресу."""
+        service = _FakeEmbeddingService()
+
+        async def run():
+            batcher = EmbedBatcher(service, max_batch=8, max_wait=0.05)
+            results = await asyncio.gather(
+                *(batcher.submit("x" * n) for n in (5, 1, 3))
+            )
+            await batcher.close()
+            return results
+
+        results = asyncio.run(run())
+
+        assert [float(r[0]) for r in results] == [5.0, 1.0, 3.0]
+        assert service.batches == [["x", "xxx", "xxxxx"]]  # отсортировано по длине
+
+    def test_max_batch_splits(self):
+        """Батч не превышает max_batch."""
+        service = _FakeEmbeddingService()
+
+        async def run():
+            batcher = EmbedBatcher(service, max_batch=2, max_wait=0.05)
+            await asyncio.gather(*(batcher.submit("t" * n) for n in range(1, 6)))
+            await batcher.close()
+
+        asyncio.run(run())
+
+        assert all(len(batch) <= 2 for batch in service.batches)
+        assert sum(len(batch) for batch in service.batches) == 5
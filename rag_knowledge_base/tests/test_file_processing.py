@@ -1,5 +1,7 @@
 """Tests for file processing components."""
 
+import zipfile
+
 import pytest
 from pathlib import Path
 
@@ -31,6 +33,12 @@ class TestTextCleaner:
         assert "\x01" not in cleaned
         assert "Hello" in cleaned
     
+    def test_normalize_whitespace(self):
+        """Test space runs collapse and paragraph breaks are kept."""
+        text = "a   b \n  c\n\n\n\n d  \n \n \ne"
+        
+        assert TextCleaner._normalize_whitespace(text) == "a b\nc\n\nd\n\ne"
+    
     def test_is_text_usable(self):
         """Test text quality check."""
         good_text = "This is a good quality text with enough content."
@@ -61,3 +69,24 @@ class TestParsers:
     def test_docx_parser(self, temp_dir):
         """Test DOCX parser."""
         pytest.skip("Requires test DOCX file")
+
+
+class TestZIPExtraction:
+    """Tests for in-memory ZIP extraction."""
+    
+    def test_zip_members_streamed_without_temp_dir(self, temp_dir):
+        """ZIP members are parsed in memory; temp_dir is not required."""
+        from rag_module.file_processing.converter import FileConverter
+        
+        archive = temp_dir / "bundle.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("docs/first.txt", "first file")
+            zf.writestr("second.txt", "второй файл".encode("utf-8"))
+            zf.writestr("image.png", b"not supported")
+        
+        text = FileConverter().extract_text(archive)
+        
+        assert "=== File: first.txt ===\nfirst file" in text
+        assert "=== File: second.txt ===\nвторой файл" in text
+        assert "image.png" not in text
+        assert sorted(p.name for p in temp_dir.iterdir()) == ["bundle.zip"]
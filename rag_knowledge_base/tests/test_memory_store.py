@@ -0,0 +1,271 @@
+"""Tests for InMemoryVectorStore.
+
+Тесты для векторного хранилища в памяти на NumPy.
+"""
+
+import numpy as np
+import pytest
+
+from rag_module.services.memory_store import InMemoryVectorStore, MemoryStoreError
+from rag_module.models import Chunk
+
+
+def _unit(index: int, dim: int = 384) -> list:
+    """Базисный вектор с единицей в позиции index."""
+    vector = [0.0] * dim
+    vector[index] = 1.0
+    return vector
+
+
+@pytest.fixture
+def memory_store():
+    """Создать пустое хранилище для тестов."""
+    return InMemoryVectorStore(embedding_dim=384)
+
+
+@pytest.fixture
+def sample_chunks():
+    """Создать тестовые чанки с ортогональными embeddings."""
+    return [
+        Chunk(
+            chunk_id="doc1_chunk_0",
+            doc_id="doc1",
+            text="Artificial intelligence is transforming industries.",
+            position=0,
+            embedding=_unit(0),
+            metadata={"source_file": "ai.pdf"},
+        ),
+        Chunk(
+            chunk_id="doc1_chunk_1",
+            doc_id="doc1",
+            text="Machine learning is a subset of AI.",
+            position=1,
+            embedding=_unit(1),
+            metadata={"source_file": "ai.pdf"},
+        ),
+        Chunk(
+            chunk_id="doc2_chunk_0",
+            doc_id="doc2",
+            text="Python is a programming language.",
+            position=0,
+            embedding=_unit(2),
+            metadata={"source_file": "code.pdf"},
+        ),
+    ]
+
+
+class TestInMemoryVectorStore:
+    """Тесты для InMemoryVectorStore."""
+
+    def test_add_chunks(self, memory_store, sample_chunks):
+        """Тест добавления чанков."""
+        memory_store.add_chunks(sample_chunks)
+
+        assert memory_store.count() == 3
+
+    def test_add_empty_chunks(self, memory_store):
+        """Тест добавления пустого списка."""
+        memory_store.add_chunks([])
+
+        assert memory_store.count() == 0
+
+    def test_add_wrong_dimension(self):
+        """Тест добавления embeddings неверной размерности."""
+        store = InMemoryVectorStore(embedding_dim=8)
+        chunk = Chunk(
+            chunk_id="c0", doc_id="d", text="text", position=0, embedding=_unit(0)
+        )
+
+        with pytest.raises(MemoryStoreError):
+            store.add_chunks([chunk])
+
+    def test_search_ranks_by_cosine(self, memory_store, sample_chunks):
+        """Тест ранжирования по cosine similarity."""
+        memory_store.add_chunks(sample_chunks)
+
+        query = np.array(_unit(1)) * 5 + np.array(_unit(0))  # ненормализованный
+        results = memory_store.search(query, top_k=2)
+
+        assert [r.chunk_id for r in results] == ["doc1_chunk_1", "doc1_chunk_0"]
+        assert results[0].similarity_score > results[1].similarity_score
+        assert results[0].source_doc == "ai.pdf"
+
+    def test_search_with_filter(self, memory_store, sample_chunks):
+        """Тест поиска с фильтром по doc_id."""
+        memory_store.add_chunks(sample_chunks)
+
+        results = memory_store.search(_unit(2), top_k=10, filter_metadata={"doc_id": "doc1"})
+
+        assert len(results) == 2
+        assert all(r.doc_id == "doc1" for r in results)
+
+    def test_search_empty(self, memory_store, sample_chunks):
+        """Тест поиска в пустом хранилище и с пустым запросом."""
+        assert memory_store.search(_unit(0), top_k=5) == []
+
+        memory_store.add_chunks(sample_chunks)
+        assert memory_store.search([], top_k=5) == []
+
+    def test_similarity_scores(self, memory_store, sample_chunks):
+        """Тест диапазона и порядка оценок сходства."""
+        memory_store.add_chunks(sample_chunks)
+
+        results = memory_store.search([0.3] * 384, top_k=3)
+
+        scores = [r.similarity_score for r in results]
+        assert all(0 <= score <= 1 for score in scores)
+        assert scores == sorted(scores, reverse=True)
+
+    def test_assume_normalized_skips_normalization(self, sample_chunks):
+        """Тест: при assume_normalized векторы сохраняются без перенормировки."""
+        store = InMemoryVectorStore(embedding_dim=384, assume_normalized=True)
+        store.add_chunks(sample_chunks)
+
+        results = store.search(_unit(1), top_k=1)
+
+        assert results[0].chunk_id == "doc1_chunk_1"
+        assert results[0].similarity_score == pytest.approx(1.0)
+
+    def test_top_k_matches_full_sort(self):
+        """Тест: argpartition-выборка совпадает с полной сортировкой."""
+        rng = np.random.default_rng(0)
+        store = InMemoryVectorStore(embedding_dim=384, use_faiss=False)
+        store.add_chunks([
+            Chunk(
+                chunk_id=f"c{i}",
+                doc_id="doc",
+                text=f"chunk {i}",
+                position=i,
+                embedding=rng.standard_normal(384).tolist(),
+            )
+            for i in range(200)
+        ])
+        query = rng.standard_normal(384)
+
+        results = store.search(query, top_k=7, filter_metadata={"doc_id": "doc"})
+
+        scores = store._scores(store._matrix[:store.count()], query / np.linalg.norm(query))
+        expected = [f"c{i}" for i in np.argsort(-scores)[:7]]
+        assert [r.chunk_id for r in results] == expected
+
+    @pytest.mark.parametrize("use_faiss", [False, None])
+    def test_min_similarity_mask(self, sample_chunks, use_faiss):
+        """Тест порога min_similarity: ниже порога результаты не создаются."""
+        store = InMemoryVectorStore(embedding_dim=384, use_faiss=use_faiss)
+        store.add_chunks(sample_chunks)
+
+        results = store.search(_unit(0), top_k=3, min_similarity=0.9)
+        assert [r.chunk_id for r in results] == ["doc1_chunk_0"]
+
+        none_pass = store.search(_unit(3), top_k=3, min_similarity=0.9)
+        assert none_pass == []
+
+    def test_delete_by_doc_id(self, memory_store, sample_chunks):
+        """Тест удаления по doc_id."""
+        memory_store.add_chunks(sample_chunks)
+
+        memory_store.delete_by_doc_id("doc1")
+
+        assert memory_store.count() == 1
+        results = memory_store.search(_unit(0), top_k=5)
+        assert [r.chunk_id for r in results] == ["doc2_chunk_0"]
+
+    def test_capacity_grows(self):
+        """Тест геометрического роста матрицы."""
+        store = InMemoryVectorStore(embedding_dim=384, initial_capacity=2)
+        chunks = [
+            Chunk(chunk_id=f"c{i}", doc_id="d", text=f"text {i}", position=i, embedding=_unit(i))
+            for i in range(5)
+        ]
+
+        store.add_chunks(chunks[:3])
+        store.add_chunks(chunks[3:])
+
+        assert store.count() == 5
+        assert store._matrix.shape[0] == 8
+        assert store.search(_unit(4), top_k=1)[0].chunk_id == "c4"
+
+    def test_int8_storage(self, sample_chunks):
+        """Тест int8-квантования: порядок и оценки близки к float32."""
+        exact = InMemoryVectorStore(embedding_dim=384, storage_dtype="float32")
+        quantized = InMemoryVectorStore(embedding_dim=384, storage_dtype="int8")
+        exact.add_chunks(sample_chunks)
+        quantized.add_chunks(sample_chunks)
+
+        query = [0.1] * 384
+        query[1] = 3.0
+        exact_results = exact.search(query, top_k=3)
+        quantized_results = quantized.search(query, top_k=3)
+
+        assert quantized._matrix.dtype == np.int8
+        assert [r.chunk_id for r in quantized_results][0] == "doc1_chunk_1"
+        for a, b in zip(exact_results, quantized_results):
+            assert abs(a.similarity_score - b.similarity_score) < 0.02
+
+    def test_float16_storage(self, sample_chunks):
+        """Тест float16-хранения: оценки совпадают с float32 до ~1e-3."""
+        exact = InMemoryVectorStore(embedding_dim=384, storage_dtype="float32")
+        half = InMemoryVectorStore(embedding_dim=384, storage_dtype="float16")
+        exact.add_chunks(sample_chunks)
+        half.add_chunks(sample_chunks)
+
+        query = [0.1] * 384
+        query[2] = 3.0
+        exact_results = exact.search(query, top_k=3)
+        half_results = half.search(query, top_k=3)
+
+        assert half._matrix.dtype == np.float16
+        assert half_results[0].chunk_id == "doc2_chunk_0"
+        for a, b in zip(exact_results, half_results):
+            assert abs(a.similarity_score - b.similarity_score) < 1e-3
+
+    def test_unsupported_dtype(self):
+        """Тест неподдерживаемого типа хранения."""
+        with pytest.raises(MemoryStoreError):
+            InMemoryVectorStore(embedding_dim=384, storage_dtype="float64")
+
+    def test_persistence_roundtrip(self, temp_dir, sample_chunks):
+        """Тест сохранения на диск и загрузки через memmap."""
+        store = InMemoryVectorStore(embedding_dim=384, persist_directory=temp_dir)
+        store.add_chunks(sample_chunks)
+        store.delete_by_doc_id("doc2")
+
+        reloaded = InMemoryVectorStore(embedding_dim=384, persist_directory=temp_dir)
+
+        assert reloaded.count() == 2
+        assert isinstance(reloaded._matrix, np.memmap)
+        assert reloaded.search(_unit(1), top_k=1)[0].chunk_id == "doc1_chunk_1"
+
+        # Первое изменение копирует матрицу в память и сохраняет снова
+        reloaded.add_chunks(sample_chunks[2:])
+        reloaded.delete_by_doc_id("doc1")
+        assert InMemoryVectorStore(embedding_dim=384, persist_directory=temp_dir).count() == 1
+
+    def test_faiss_matches_numpy(self, sample_chunks):
+        """Тест: faiss-поиск даёт те же результаты, что и NumPy."""
+        pytest.importorskip("faiss")
+        numpy_store = InMemoryVectorStore(embedding_dim=384, use_faiss=False)
+        faiss_store = InMemoryVectorStore(embedding_dim=384, use_faiss=True)
+        for store in (numpy_store, faiss_store):
+            store.add_chunks(sample_chunks)
+            store.delete_by_doc_id("doc2")
+            store.add_chunks(sample_chunks[2:])
+
+        query = [0.1] * 384
+        query[0] = 0.5
+        query[2] = 2.0
+        expected = numpy_store.search(query, top_k=3)
+        actual = faiss_store.search(query, top_k=3)
+
+        assert [r.chunk_id for r in actual] == [r.chunk_id for r in expected]
+        for a, b in zip(actual, expected):
+            assert abs(a.similarity_score - b.similarity_score) < 1e-5
+
+    def test_clear_all(self, memory_store, sample_chunks):
+        """Тест полной очистки."""
+        memory_store.add_chunks(sample_chunks)
+
+        memory_store.clear_all()
+
+        assert memory_store.count() == 0
+        assert memory_store.search(_unit(0), top_k=5) == []
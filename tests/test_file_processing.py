@@ -7,12 +7,17 @@ Added: 2025-12-20 23:57
 
 import pytest
 from pathlib import Path
-from io import BytesIO
+from io import BytesIO, StringIO
+import struct
 import zipfile
 from unittest.mock import Mock, patch, MagicMock
 
+from app.services.file_processing.doc_parser import DOCParser
+from app.services.file_processing import converter as converter_module
+from app.services.file_processing import docx_parser
 from app.services.file_processing.docx_parser import DOCXParser
 from app.services.file_processing.converter import FileConverter
+from app.services.file_processing.text_cleaner import TextCleaner
 
 
 class TestDOCXParser:
@@ -52,6 +57,50 @@ class TestDOCXParser:
         assert len(text) > 0
         assert "Test paragraph content" in text or "Another paragraph" in text
     
+    def test_extract_text_routes_on_content_not_suffix(self, parser, temp_docx_file, tmp_path):
+        """Test misnamed files are routed by their magic bytes."""
+        zip_doc = tmp_path / "saved_as_ooxml.doc"
+        zip_doc.write_bytes(temp_docx_file.read_bytes())
+        assert "Test paragraph content" in parser.extract_text(zip_doc)
+        
+        ole_docx = tmp_path / "old_word.docx"
+        ole_docx.write_bytes(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\x00" * 504)
+        with patch.object(parser.doc_parser, "extract_text", return_value="binary doc") as doc_extract:
+            assert parser.extract_text(ole_docx) == "binary doc"
+        doc_extract.assert_called_once_with(ole_docx)
+        
+        pdf_docx = tmp_path / "report.docx"
+        pdf_docx.write_bytes(b"%PDF-1.4")
+        with pytest.raises(ValueError, match="PDF"):
+            parser.extract_text(pdf_docx)
+    
+    def test_extract_text_tables_in_document_order(self, parser, tmp_path):
+        """Test table rows are streamed in place as "cell | cell" lines."""
+        docx_path = tmp_path / "table.docx"
+        
+        with zipfile.ZipFile(docx_path, 'w') as zf:
+            doc_xml = '''<?xml version="1.0"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    <w:body>
+        <w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr>
+            <w:r><w:t>Before</w:t><w:tab/><w:t>table</w:t></w:r></w:p>
+        <w:tbl>
+            <w:tr>
+                <w:tc><w:p><w:r><w:t>A1</w:t></w:r></w:p></w:tc>
+                <w:tc><w:p><w:r><w:t>B1</w:t></w:r></w:p></w:tc>
+            </w:tr>
+            <w:tr><w:tc><w:p/></w:tc></w:tr>
+        </w:tbl>
+        <w:p><w:r><w:t>After table</w:t></w:r></w:p>
+    </w:body>
+</w:document>
+'''
+            zf.writestr('word/document.xml', doc_xml)
+        
+        text = parser.extract_text(docx_path)
+        
+        assert text == "Before\ttable\nA1 | B1\nAfter table"
+    
     def test_extract_text_file_not_found(self, parser, tmp_path):
         """Test extraction from non-existent file."""
         fake_file = tmp_path / "nonexistent.docx"
@@ -92,6 +141,28 @@ class TestDOCXParser:
         # Empty document should return empty or near-empty string
         assert text == "" or len(text.strip()) == 0
     
+    def test_extract_text_strict_ooxml_namespace(self, parser, tmp_path):
+        """Test documents saved as Strict Open XML are streamed too."""
+        strict_docx = tmp_path / "strict.docx"
+        with zipfile.ZipFile(strict_docx, 'w') as zf:
+            zf.writestr('word/document.xml', '''<?xml version="1.0"?>
+<w:document xmlns:w="http://purl.oclc.org/ooxml/wordprocessingml/main">
+    <w:body><w:p><w:r><w:t>Strict content</w:t></w:r></w:p></w:body>
+</w:document>
+''')
+        
+        assert parser.extract_text(strict_docx) == "Strict content"
+    
+    def test_extract_text_not_zip_skips_python_docx(self, parser, tmp_path):
+        """Test a non-ZIP .docx fails without a second open by python-docx."""
+        invalid_file = tmp_path / "plain.docx"
+        invalid_file.write_text("This is not a valid DOCX file")
+        
+        with patch.object(parser, "_extract_docx_python_docx") as fallback:
+            with pytest.raises(ValueError, match="Cannot extract text"):
+                parser.extract_text(invalid_file)
+        fallback.assert_not_called()
+    
     def test_extract_plain_text_from_corrupted_xml(self):
         """Test extraction from corrupted XML."""
         corrupted = "<tag>Hello</tag> <tag>World</tag> <corrupted>Incomplete"
@@ -102,6 +173,43 @@ class TestDOCXParser:
         assert "World" in result
         assert result.strip()  # Should have some content
     
+    def test_extract_text_recovers_corrupted_document_xml(self, parser, tmp_path):
+        """Test text is salvaged when document.xml is truncated."""
+        broken_docx = tmp_path / "broken.docx"
+        with zipfile.ZipFile(broken_docx, 'w') as zf:
+            zf.writestr('word/document.xml', '<w:document><w:body><w:p><w:t>Salvaged text</w:t>')
+            zf.writestr('[Content_Types].xml', '<?xml version="1.0"?><Types/>')
+        
+        assert parser.extract_text(broken_docx) == "Salvaged text"
+    
+    def test_corrupted_xml_stream_matches_whole_string(self, monkeypatch):
+        """Test chunked tag stripping gives the same text as the one-shot version."""
+        corrupted = '<w:p><w:t>Hello</w:t></w:p>\n<w:p><w:t>A &amp; B</w:t></w:p><broken' * 20 + " end"
+        monkeypatch.setattr(docx_parser, "SALVAGE_CHUNK_SIZE", 7)
+        
+        streamed = DOCXParser._extract_plain_text_from_corrupted_stream(StringIO(corrupted))
+        
+        assert streamed == DOCXParser._extract_plain_text_from_corrupted_xml(corrupted)
+        assert "A & B" in streamed
+    
+    def test_parsed_document_is_cached(self, parser, tmp_path):
+        """Test a .docx is parsed once until the file changes."""
+        docx_file = tmp_path / "cached.docx"
+        docx_file.write_bytes(b"PK first version")
+        docx_parser._load_document.cache_clear()
+        
+        document = MagicMock()
+        with patch.object(docx_parser, "_docx_document", return_value=document):
+            parser.get_metadata(docx_file)
+            parser.get_metadata(docx_file)
+            assert document.call_count == 1
+            
+            docx_file.write_bytes(b"PK second, longer version")
+            parser.get_metadata(docx_file)
+            assert document.call_count == 2
+        
+        docx_parser._load_document.cache_clear()
+    
     def test_get_metadata(self, parser, temp_docx_file):
         """Test metadata extraction."""
         metadata = parser.get_metadata(temp_docx_file)
@@ -111,12 +219,237 @@ class TestDOCXParser:
         # (python-docx returns None for missing metadata)
 
 
+class TestDOCParser:
+    """Tests for the built-in binary .doc scanner."""
+    
+    OLE_HEADER = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+    
+    @pytest.fixture
+    def parser(self):
+        """Create DOC parser instance."""
+        return DOCParser()
+    
+    def test_extract_unicode_strings(self, parser):
+        """Test UTF-16 LE text (Russian) is recovered from binary noise."""
+        content = (
+            self.OLE_HEADER
+            + b"\x00" * 64
+            + "Договор поставки №15\rУсловия оплаты".encode("utf-16-le")
+            + b"\x00\x01\x02" * 20
+        )
+        
+        result = parser._extract_unicode_strings(content)
+        
+        assert "Договор поставки №15" in result
+        assert "Условия оплаты" in result
+    
+    def test_extract_unicode_strings_windowed(self, parser, monkeypatch):
+        """Test runs crossing decode window boundaries are not split."""
+        content = (
+            b"\x00\x01" * 37
+            + "Первый абзац текста документа\r".encode("utf-16-le")
+            + b"\x00\x07" * 13
+        ) * 20
+        expected = parser._extract_unicode_strings(content)
+        
+        monkeypatch.setattr(
+            "app.services.file_processing.doc_parser.UNICODE_WINDOW", 64
+        )
+        
+        assert parser._extract_unicode_strings(content) == expected
+    
+    def test_extract_null_blocks(self, parser):
+        """Test 8-bit text runs are split out of null-separated blocks."""
+        content = b"\x00\x00Hello\x00\x01World text\x00\x02##\x00\x00"
+        
+        result = parser._extract_null_blocks(content)
+        
+        assert result == "Hello World text"
+    
+    def test_extract_null_blocks_cp1251(self, parser):
+        """Test Cyrillic 8-bit runs are decoded as cp1251, not latin-1."""
+        content = b"\x00\x01" + "Текст в однобайтовой кодировке".encode("cp1251") + b"\x00\x00"
+        
+        result = parser._extract_null_blocks(content)
+        
+        assert result == "Текст в однобайтовой кодировке"
+    
+    def test_extract_ascii_strings(self, parser):
+        """Test strings(1)-like pass keeps only runs with letters."""
+        content = b"\x00abc\x00Plain ascii line\x001234567\x00zzzzzz\x00"
+        
+        result = parser._extract_ascii_strings(content)
+        
+        assert result == "Plain ascii line"
+    
+    def test_extract_ascii_strings_deduplicates(self, parser):
+        """Test repeated runs (headers, style names) are kept once, in order."""
+        content = b"\x00Normal\x00Header\x00Normal\x00Body text\x00Header\x00"
+        
+        result = parser._extract_ascii_strings(content)
+        
+        assert result == "Normal\nHeader\nBody text"
+    
+    def test_binary_text_stops_at_good_enough(self, parser):
+        """Test later strategies are skipped once UTF-16 text is good enough."""
+        content = ("Достаточно длинный русский текст. " * 30).encode("utf-16-le")
+        
+        with patch.object(parser, "_extract_null_blocks") as null_blocks, \
+                patch.object(parser, "_extract_ascii_strings") as ascii_strings:
+            result = parser._extract_binary_text(content)
+        
+        assert "Достаточно длинный русский текст." in result
+        null_blocks.assert_not_called()
+        ascii_strings.assert_not_called()
+    
+    def test_binary_text_skips_unicode_without_utf16(self, parser):
+        """Test the UTF-16 pass is skipped for purely 8-bit content."""
+        content = b"\x00".join(
+            f"Однобайтовый текст, строка {i}".encode("cp1251") for i in range(40)
+        )
+        
+        with patch.object(parser, "_extract_unicode_strings") as unicode_strings:
+            result = parser._extract_binary_text(content)
+        
+        unicode_strings.assert_not_called()
+        assert "Однобайтовый текст" in result
+    
+    def test_binary_scan_is_bounded(self, parser, monkeypatch):
+        """Test huge content is cut to head + tail and word output is capped."""
+        module = "app.services.file_processing.doc_parser"
+        monkeypatch.setattr(f"{module}.MAX_SCAN_SIZE", 64)
+        monkeypatch.setattr(f"{module}.SCAN_EDGE_SIZE", 32)
+        monkeypatch.setattr(f"{module}.MAX_WORDS", 2)
+        content = b"Head" + b"\x01" * 200 + b"Tail"
+        
+        bounded = DOCParser._bounded(content)
+        assert len(bounded) == 66
+        assert bounded.startswith(b"Head") and bounded.endswith(b"Tail")
+        assert parser._extract_ascii_strings(b"alpha\x00beta\x00gamma") == "alpha\nbeta"
+    
+    def test_is_likely_word(self):
+        """Test word filter rejects noise."""
+        assert DOCParser._is_likely_word("word")
+        assert not DOCParser._is_likely_word("a")
+        assert not DOCParser._is_likely_word("1234")
+        assert not DOCParser._is_likely_word("aaaa")
+    
+    def test_extract_text_binary_fallback(self, parser, tmp_path):
+        """Test .doc extraction without Aspose uses the binary scanner."""
+        doc_file = tmp_path / "old.doc"
+        doc_file.write_bytes(
+            self.OLE_HEADER
+            + b"\x00" * 128
+            + "Текст старого документа Word".encode("utf-16-le")
+            + b"\x00" * 128
+        )
+        
+        with patch("app.services.file_processing.doc_parser.aw", None):
+            result = parser.extract_text(doc_file)
+        
+        assert "Текст старого документа Word" in result
+    
+    def test_sniff(self):
+        """Test real format detection for files named .doc."""
+        assert DOCParser._sniff(self.OLE_HEADER + b"\x00" * 8) == "ole"
+        assert DOCParser._sniff(b"PK\x03\x04rest") == "zip"
+        assert DOCParser._sniff(b"%PDF-1.4") == "pdf"
+        assert DOCParser._sniff("Обычный текст".encode("utf-8")[:-1]) == "text"
+        assert DOCParser._sniff(b"\x01\x00\xff\xfe") == "unknown"
+    
+    def test_extract_text_plain_text_doc(self, parser, tmp_path):
+        """Test a plain text file named .doc is decoded without binary scanning."""
+        doc_file = tmp_path / "notes.doc"
+        doc_file.write_text("Заметки в текстовом файле", encoding="utf-8")
+        
+        with patch("app.services.file_processing.doc_parser.aw", None), \
+                patch.object(parser, "_extract_binary_text") as binary_text:
+            result = parser.extract_text(doc_file)
+        
+        binary_text.assert_not_called()
+        assert "Заметки в текстовом файле" in result
+    
+    def test_extract_text_rejects_pdf_doc(self, parser, tmp_path):
+        """Test a PDF named .doc is rejected instead of scanned."""
+        doc_file = tmp_path / "scan.doc"
+        doc_file.write_bytes(b"%PDF-1.4\n" + b"\x00" * 64)
+        
+        with patch("app.services.file_processing.doc_parser.aw", None):
+            with pytest.raises(ValueError, match="PDF"):
+                parser.extract_text(doc_file)
+    
+    def test_extract_text_reads_word_stream(self, parser, tmp_path):
+        """Test the binary scanner reads only the WordDocument stream via olefile."""
+        doc_file = tmp_path / "old.doc"
+        doc_file.write_bytes(self.OLE_HEADER + "Мусор контейнера OLE".encode("utf-16-le"))
+        stream = b"\x00" * 64 + "Текст из потока WordDocument".encode("utf-16-le")
+        
+        ole_module = MagicMock()
+        ole = ole_module.OleFileIO.return_value.__enter__.return_value
+        ole.openstream.return_value.read.return_value = stream
+        ole.get_size.return_value = len(stream)
+        
+        with patch("app.services.file_processing.doc_parser.aw", None), \
+                patch("app.services.file_processing.doc_parser.olefile", ole_module):
+            result = parser.extract_text(doc_file)
+        
+        ole.openstream.assert_called_once_with("WordDocument")
+        assert "Текст из потока WordDocument" in result
+        assert "Мусор" not in result
+    
+    def test_decode_pieces_rejects_malformed_clx(self):
+        """Test a negative Prc size or decreasing positions cannot loop or rewind."""
+        negative_prc = b"\x01" + struct.pack("<h", -3) + b"\x00" * 10
+        assert DOCParser._decode_pieces(negative_prc, b"", 10) == ""
+        
+        backwards = b"\x02" + struct.pack("<I", 16) + struct.pack("<2I", 5, 0)
+        backwards += struct.pack("<HIH", 0, 0, 0)
+        assert DOCParser._decode_pieces(backwards, b"\x00" * 32, 10) == ""
+    
+    def test_extract_text_reads_piece_table(self, parser, tmp_path):
+        """Test text is read exactly through the FIB piece table when present."""
+        doc_file = tmp_path / "word97.doc"
+        doc_file.write_bytes(self.OLE_HEADER + b"\x00" * 64)
+        
+        # WordDocument: FIB (1Table, ccpText) + a UTF-16 piece and a cp1252 piece
+        unicode_text = 'Отчёт \x13 HYPERLINK "x" \x14за год\x15\rA\x07B\x07\x07'
+        ansi_text = b"Summary line\r"
+        word = bytearray(0x800)
+        word[0x400:0x400 + 2 * len(unicode_text)] = unicode_text.encode("utf-16-le")
+        word[0x600:0x600 + len(ansi_text)] = ansi_text
+        cps = (0, len(unicode_text), len(unicode_text) + len(ansi_text))
+        plc = struct.pack("<3I", *cps)
+        plc += struct.pack("<HIH", 0, 0x400, 0)
+        plc += struct.pack("<HIH", 0, 0x40000000 | (0x600 * 2), 0)
+        clx = b"\x02" + struct.pack("<I", len(plc)) + plc
+        struct.pack_into("<H", word, 0x0A, 0x0200)
+        struct.pack_into("<i", word, 0x4C, cps[-1])
+        struct.pack_into("<II", word, 0x01A2, 0, len(clx))
+        streams = {"WordDocument": bytes(word), "1Table": clx}
+        
+        ole_module = MagicMock()
+        ole = ole_module.OleFileIO.return_value.__enter__.return_value
+        ole.get_size.return_value = len(word)
+        ole.exists.side_effect = lambda name: name in streams
+        ole.openstream.side_effect = lambda name: BytesIO(streams[name])
+        
+        with patch("app.services.file_processing.doc_parser.aw", None), \
+                patch("app.services.file_processing.doc_parser.olefile", ole_module):
+            result = parser.extract_text(doc_file)
+        
+        assert "Отчёт за год" in result
+        assert "HYPERLINK" not in result
+        assert "A | B" in result
+        assert "Summary line" in result
+
+
 class TestFileConverter:
     """Tests for file converter."""
     
     @pytest.fixture
     def converter(self):
         """Create file converter instance."""
+        converter_module._text_cache.clear()
         return FileConverter()
     
     def test_is_supported_pdf(self, converter):
@@ -177,7 +510,46 @@ class TestFileConverter:
         
         assert result == content
     
-    @patch('app.services.file_processing.converter.PDFParser')
+    def test_extract_text_bom_txt_file(self, converter, tmp_path):
+        """Test a BOM decides the encoding without running the detector."""
+        txt_file = tmp_path / "bom.txt"
+        txt_file.write_bytes("Текст с BOM".encode("utf-16"))
+        
+        with patch(
+            "app.services.file_processing.text_cleaner.charset_detector"
+        ) as detector:
+            result = converter.extract_text(txt_file)
+        
+        assert result == "Текст с BOM"
+        detector.detect.assert_not_called()
+    
+    def test_extract_text_cp1251_txt_file(self, converter, tmp_path):
+        """Test non-UTF-8 Cyrillic text is decoded with the detected encoding."""
+        content = "Привет, мир! Это тестовый текст на русском языке.\n" * 20
+        txt_file = tmp_path / "cp1251.txt"
+        txt_file.write_bytes(content.encode("cp1251"))
+        
+        with patch(
+            "app.services.file_processing.text_cleaner.charset_detector"
+        ) as detector:
+            detector.detect.return_value = {"encoding": "windows-1251", "confidence": 0.9}
+            result = converter.extract_text(txt_file)
+        
+        assert result == content
+        detector.detect.assert_called_once()
+    
+    def test_detected_encoding_is_canonical(self):
+        """Test detector labels are normalized to Python codec names."""
+        with patch(
+            "app.services.file_processing.text_cleaner.charset_detector"
+        ) as detector:
+            detector.detect.return_value = {"encoding": "Windows-1251", "confidence": 0.9}
+            assert TextCleaner.detect_encoding(b"\xcf\xf0\xe8") == "cp1251"
+            
+            detector.detect.return_value = {"encoding": "x-unknown", "confidence": 0.9}
+            assert TextCleaner.detect_encoding(b"\xcf\xf0\xe8") is None
+    
+    @patch('app.services.file_processing.pdf_parser.PDFParser')
     def test_extract_text_pdf_delegated_to_parser(self, mock_pdf_parser_class, converter, tmp_path):
         """Test that PDF extraction is delegated to PDFParser."""
         # Setup mock
@@ -199,6 +571,43 @@ class TestFileConverter:
         mock_parser.extract_text.assert_called_once()
         assert result == "PDF content"
     
+    def test_extract_text_cached_by_content(self, converter, tmp_path):
+        """Test re-uploaded identical content is served from the text cache."""
+        mock_parser = MagicMock()
+        mock_parser.extract_text.return_value = "PDF content"
+        converter.pdf_parser = mock_parser
+        
+        first = tmp_path / "first.pdf"
+        first.write_bytes(b"%PDF-1.4 same bytes")
+        second = tmp_path / "second.pdf"
+        second.write_bytes(b"%PDF-1.4 same bytes")
+        other = tmp_path / "other.pdf"
+        other.write_bytes(b"%PDF-1.4 diff bytes")
+        
+        assert converter.extract_text(first) == "PDF content"
+        assert converter.extract_text(second) == "PDF content"
+        assert mock_parser.extract_text.call_count == 1
+        
+        converter.extract_text(other)
+        assert mock_parser.extract_text.call_count == 2
+    
+    def test_extract_zip_keeps_member_order(self, converter, tmp_path):
+        """Test ZIP members parsed in parallel are combined in archive order."""
+        archive = tmp_path / "bundle.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            for i in range(6):
+                zf.writestr(f"part{i}.txt", f"content {i}")
+            zf.writestr("image.jpg", "skipped")
+        extract_dir = tmp_path / "out"
+        extract_dir.mkdir()
+        
+        result = converter.extract_text(archive, extract_dir)
+        
+        positions = [result.index(f"=== File: part{i}.txt ===") for i in range(6)]
+        assert positions == sorted(positions)
+        assert "content 5" in result
+        assert "image.jpg" not in result
+    
     def test_supported_formats_complete(self, converter):
         """Test that all expected formats are in supported list."""
         from app.services.file_processing.converter import SUPPORTED_FORMATS
@@ -219,29 +628,22 @@ class TestDOCToDocxConversion:
         """Test that .doc files are recognized."""
         assert converter.is_supported(Path("document.doc"))
     
-    def test_rename_doc_to_docx_success(self, converter, tmp_path):
-        """Test successful .doc to .docx rename."""
-        # Create a minimal valid Office file (ZIP)
-        doc_file = tmp_path / "test.doc"
+    def test_zip_based_doc_parsed_in_place(self, converter, tmp_path):
+        """Test a ZIP-based .doc is parsed as .docx without temp copies."""
+        doc_file = tmp_path / "hybrid.doc"
         with zipfile.ZipFile(doc_file, 'w') as zf:
-            zf.writestr('word/document.xml', '<?xml version="1.0"?><document/>')
-        
-        # Rename should work
-        docx_path = converter._rename_doc_to_docx(doc_file, tmp_path)
+            zf.writestr(
+                'word/document.xml',
+                '<?xml version="1.0"?><document xmlns="http://schemas.openxmlformats.org/'
+                'wordprocessingml/2006/main"><body><p><r><t>Hybrid text</t></r></p></body></document>',
+            )
+        temp_dir = tmp_path / "work"
+        temp_dir.mkdir()
         
-        assert docx_path is not None
-        assert docx_path.suffix == ".docx"
-        assert docx_path.exists()
-    
-    def test_rename_doc_permissions_error(self, converter, tmp_path):
-        """Test .doc rename when permissions denied."""
-        doc_file = tmp_path / "test.doc"
-        doc_file.write_text("test")
+        result = converter.extract_text(doc_file, temp_dir)
         
-        # Mock shutil.copy2 to raise permission error
-        with patch('shutil.copy2', side_effect=PermissionError):
-            result = converter._rename_doc_to_docx(doc_file, tmp_path)
-            assert result is None  # Should return None on error
+        assert result == "Hybrid text"
+        assert not any(temp_dir.iterdir())
 
 
 if __name__ == "__main__":